@@ -7,42 +7,9 @@ except ImportError:
     SKLEARN_AVAILABLE = False
 
 from models import Student, StudentSkill, Resume, Job, JobSkill, Application
+from utils.taxonomy import get_taxonomy
 import json
 
-# Learning path suggestions (static mapping)
-LEARNING_PATHS = {
-    'react': 'Learn React - 2 weeks roadmap: React docs → Components → State → Hooks → Projects',
-    'python': 'Learn Python - 3 weeks roadmap: Syntax → Data Structures → OOP → Django/Flask → Projects',
-    'java': 'Learn Java - 3 weeks roadmap: OOP → Collections → Spring Boot → REST APIs → Projects',
-    'javascript': 'Learn JavaScript - 3 weeks roadmap: ES6 → DOM → Async → Node.js → Projects',
-    'machine learning': 'Learn ML - 4 weeks roadmap: Python → NumPy/Pandas → Scikit-learn → Projects',
-    'data science': 'Learn Data Science - 4 weeks roadmap: Statistics → Python → Pandas → Visualization → ML',
-    'aws': 'Learn AWS - 2 weeks roadmap: EC2 → S3 → Lambda → DynamoDB → Solutions Architect',
-    'docker': 'Learn Docker - 1 week roadmap: Images → Containers → Docker Compose → Kubernetes basics',
-    'sql': 'Learn SQL - 2 weeks roadmap: Queries → Joins → Subqueries → Indexes → Database Design',
-    'mongodb': 'Learn MongoDB - 1 week roadmap: CRUD → Aggregation → Indexing → Atlas → MERN Stack',
-    'django': 'Learn Django - 2 weeks roadmap: Models → Views → Forms → REST → Deployment',
-    'flask': 'Learn Flask - 1 week roadmap: Routes → Templates → SQLAlchemy → REST APIs → Deployment',
-    'node.js': 'Learn Node.js - 2 weeks roadmap: Express → MongoDB → REST → Authentication → Projects',
-    'angular': 'Learn Angular - 2 weeks roadmap: TypeScript → Components → Services → RxJS → Projects',
-    'vue': 'Learn Vue.js - 2 weeks roadmap: Vue 3 → Composition API → Vuex → Router → Projects',
-    'typescript': 'Learn TypeScript - 1 week roadmap: Types → Interfaces → Generics → OOP → React+TS',
-    'kubernetes': 'Learn Kubernetes - 2 weeks roadmap: Pods → Services → Deployments → Helm → Cloud',
-    'flutter': 'Learn Flutter - 3 weeks roadmap: Dart → Widgets → State → Firebase → App Store',
-    'ios': 'Learn iOS - 3 weeks roadmap: Swift → UIKit → SwiftUI → Firebase → App Store',
-    'android': 'Learn Android - 3 weeks roadmap: Kotlin → XML → Jetpack → Firebase → Play Store',
-    'tensorflow': 'Learn TensorFlow - 3 weeks roadmap: Tensors → Models → CNN/RNN → Deployment → Projects',
-    'pytorch': 'Learn PyTorch - 3 weeks roadmap: Tensors → Autograd → Networks → CNN/RNN → Projects',
-    'nlp': 'Learn NLP - 3 weeks roadmap: Text Processing → NLTK → Transformers → BERT → Projects',
-    'blockchain': 'Learn Blockchain - 3 weeks roadmap: Solidity → Smart Contracts → Web3 → DApps → Projects',
-    'devops': 'Learn DevOps - 4 weeks roadmap: Git → Docker → CI/CD → Kubernetes → Cloud → Monitoring',
-    'data analysis': 'Learn Data Analysis - 2 weeks roadmap: Excel → SQL → Python → Pandas → Tableau',
-    'tableau': 'Learn Tableau - 1 week roadmap: Visualizations → Dashboards → Calculations → Stories',
-    'power bi': 'Learn Power BI - 1 week roadmap: Power Query → DAX → Visualizations → Dashboards',
-    'excel': 'Learn Excel - 1 week roadmap: Formulas → VLOOKUP → Pivot Tables → Macros → VBA',
-    'git': 'Learn Git - 1 week roadmap: Init → Add → Commit → Branch → Merge → GitHub → CI/CD'
-}
-
 def calculate_skill_match(student_skills, job_skills):
     """
     Calculate skill match percentage between student and job
@@ -146,6 +113,24 @@ def get_recommended_jobs(student_id, limit=10):
     
     return recommendations[:limit]
 
+def count_recommended_jobs(student_id, limit=None):
+    """
+    Number of jobs get_recommended_jobs would return, without scoring them
+    Every active job the student hasn't applied to is recommended, so this
+    is one COUNT query; limit caps it the same way
+    Returns: int
+    """
+    applied = Application.query.filter(
+        Application.student_id == student_id,
+        Application.job_id == Job.id
+    ).exists()
+    
+    query = Job.query.filter(Job.is_active == True, ~applied)
+    if limit is not None:
+        # Stop counting once the cap is reached
+        return query.with_entities(Job.id).limit(limit).count()
+    return query.count()
+
 def get_recommended_students(job_id, limit=10):
     """
     Get recommended students for a job (AI feature for HR)
@@ -213,51 +198,6 @@ def check_duplicate_resume(text, student_id):
     
     return [], []
 
-def detect_duplicate_resume(new_text, exclude_student_id=None):
-    """
-    Detect potential duplicate resumes using text similarity
-    Returns: list of potential duplicates with similarity scores
-    """
-    try:
-        # Get all resumes with extracted text
-        resumes = Resume.query.all()
-        
-        if not resumes:
-            return []
-        
-        # For simplicity, compare by resume score and skills
-        # In production, store extracted text in DB
-        duplicates = []
-        
-        new_resume_skills = set(new_text.lower().split()) if new_text else set()
-        
-        for resume in resumes:
-            if exclude_student_id and resume.student_id == exclude_student_id:
-                continue
-            
-            # Compare skills if available
-            if resume.skills:
-                try:
-                    resume_skills = set(json.loads(resume.skills.lower()))
-                    # Calculate Jaccard similarity
-                    if resume_skills and new_resume_skills:
-                        intersection = len(new_resume_skills.intersection(resume_skills))
-                        union = len(new_resume_skills.union(resume_skills))
-                        similarity = intersection / union if union > 0 else 0
-                        
-                        if similarity > 0.7:  # 70% similarity threshold
-                            duplicates.append({
-                                'student_id': resume.student_id,
-                                'similarity': round(similarity * 100, 2)
-                            })
-                except:
-                    pass
-        
-        return duplicates
-    except Exception as e:
-        print(f"Duplicate detection error: {e}")
-        return []
-
 def get_missing_skills(student_skills, job_skills):
     """
     Get missing skills for a student to match a job
@@ -277,7 +217,7 @@ def get_learning_path(skill):
     Get learning path suggestion for a missing skill
     """
     skill_lower = skill.lower()
-    return LEARNING_PATHS.get(skill_lower, f"Learn {skill.title()} - Check online courses and documentation")
+    return get_taxonomy().learning_paths.get(skill_lower, f"Learn {skill.title()} - Check online courses and documentation")
 
 def get_learning_paths_for_missing_skills(missing_skills):
     """
@@ -1,137 +1,211 @@
-from models import db, HR, Student, Job, Application, Resume, StudentSkill, JobSkill
-from collections import Counter
+from models import db, HR, Student, Job, Application, Resume, StudentSkill, JobSkill, InternshipApplication, ApplicationStatusCount
+from sqlalchemy import func, case
+from sqlalchemy.orm import selectinload
+import csv
+import io
 from datetime import datetime, timedelta
 
+# Counter scope -> (application model, owner column)
+STATUS_COUNT_SCOPES = {
+    'job': (Application, Application.job_id),
+    'student': (Application, Application.student_id),
+    'internship': (InternshipApplication, InternshipApplication.internship_id),
+    'intern_student': (InternshipApplication, InternshipApplication.student_id)
+}
+
+def status_counts_seeded():
+    """
+    Whether application_status_counts holds data
+    Empty on databases created before the rollup, until seed_status_counts()
+    (run by flask init-db / upgrade-db) fills it; readers count live meanwhile
+    """
+    return db.session.query(ApplicationStatusCount.id).first() is not None
+
+def _live_status_counts(scope, owner_ids=None):
+    """Grouped COUNT over the application table, same shape as get_status_counts"""
+    model, owner = STATUS_COUNT_SCOPES[scope]
+    status = func.coalesce(model.status, 'Applied')
+    query = db.session.query(owner, status, func.count(model.id)).group_by(owner, status)
+    if owner_ids is not None:
+        query = query.filter(owner.in_(owner_ids))
+    return query
+
+def get_status_counts(scope, owner_ids=None):
+    """
+    Read the application_status_counts rollup
+    Falls back to a grouped COUNT while the rollup hasn't been seeded
+    Returns: dict of owner_id -> {status: count}
+    """
+    if owner_ids is not None and not owner_ids:
+        return {}
+    if status_counts_seeded():
+        query = db.session.query(
+            ApplicationStatusCount.owner_id, ApplicationStatusCount.status, ApplicationStatusCount.count
+        ).filter(ApplicationStatusCount.scope == scope)
+        if owner_ids is not None:
+            query = query.filter(ApplicationStatusCount.owner_id.in_(owner_ids))
+    else:
+        query = _live_status_counts(scope, owner_ids)
+    
+    counts = {}
+    for owner_id, status, count in query:
+        counts.setdefault(owner_id, {})[status] = count
+    return counts
+
+def rebuild_status_counts():
+    """
+    Recompute application_status_counts from the application tables
+    For repairs, and for databases created before the rollup existed
+    Returns: number of counter rows written
+    """
+    ApplicationStatusCount.query.delete()
+    
+    rows = 0
+    for scope in STATUS_COUNT_SCOPES:
+        for owner_id, status, count in _live_status_counts(scope):
+            db.session.add(ApplicationStatusCount(scope=scope, owner_id=owner_id, status=status, count=count))
+            rows += 1
+    
+    db.session.commit()
+    return rows
+
+def seed_status_counts():
+    """
+    Fill application_status_counts if it is empty (first run after upgrading)
+    Returns: number of counter rows written (0 if it was already seeded)
+    """
+    if status_counts_seeded():
+        return 0
+    return rebuild_status_counts()
+
+HR_ANALYTICS_STATUSES = ('Shortlisted', 'Rejected', 'Interview', 'Selected')
+
+def _hr_job_rows(hr_id):
+    """
+    One row per job of hr_id, by job id:
+    (id, title, is_active, applicants, shortlisted, rejected, interview, selected)
+    """
+    if not status_counts_seeded():
+        # No rollup yet: one grouped query (LEFT JOIN keeps jobs without applicants)
+        def status_count(status):
+            return func.coalesce(func.sum(case((Application.status == status, 1), else_=0)), 0)
+        
+        return db.session.query(
+            Job.id,
+            Job.title,
+            Job.is_active,
+            func.count(Application.id),
+            *[status_count(status) for status in HR_ANALYTICS_STATUSES]
+        ).outerjoin(Application, Application.job_id == Job.id
+        ).filter(Job.hr_id == hr_id
+        ).group_by(Job.id, Job.title, Job.is_active
+        ).order_by(Job.id).all()
+    
+    # Per-job status rollup: O(jobs) rows, no scan of applications
+    hr_jobs = db.session.query(Job.id, Job.title, Job.is_active).filter(Job.hr_id == hr_id).order_by(Job.id).all()
+    counts = get_status_counts('job', [job_id for job_id, _, _ in hr_jobs])
+    return [
+        (job_id, title, is_active, sum(counts.get(job_id, {}).values()),
+         *[counts.get(job_id, {}).get(status, 0) for status in HR_ANALYTICS_STATUSES])
+        for job_id, title, is_active in hr_jobs
+    ]
+
 def get_hr_analytics(hr_id):
     """
     Get analytics data for HR dashboard
+    Counters come from the status rollup, or from one grouped query over
+    applications while the rollup hasn't been seeded
     """
-    # Total jobs posted by this HR
-    total_jobs = Job.query.filter_by(hr_id=hr_id).count()
-    
-    # Active jobs
-    active_jobs = Job.query.filter_by(hr_id=hr_id, is_active=True).count()
-    
-    # Total applicants across all jobs
-    hr_jobs = Job.query.filter_by(hr_id=hr_id).all()
-    job_ids = [job.id for job in hr_jobs]
-    total_applicants = Application.query.filter(Application.job_id.in_(job_ids)).count() if job_ids else 0
-    
-    # Shortlisted candidates
-    shortlisted = Application.query.filter(
-        Application.job_id.in_(job_ids),
-        Application.status == 'Shortlisted'
-    ).count() if job_ids else 0
-    
-    # Rejected candidates
-    rejected = Application.query.filter(
-        Application.job_id.in_(job_ids),
-        Application.status == 'Rejected'
-    ).count() if job_ids else 0
-    
-    # Interview candidates
-    interview = Application.query.filter(
-        Application.job_id.in_(job_ids),
-        Application.status == 'Interview'
-    ).count() if job_ids else 0
-    
-    # Selected candidates
-    selected = Application.query.filter(
-        Application.job_id.in_(job_ids),
-        Application.status == 'Selected'
-    ).count() if job_ids else 0
+    rows = _hr_job_rows(hr_id)
     
     # Get top skills from applicants
-    top_skills = get_top_applicant_skills(job_ids)
+    top_skills = get_top_applicant_skills(hr_id)
     
     # Applicants per job
-    applicants_per_job = []
-    for job in hr_jobs:
-        app_count = Application.query.filter_by(job_id=job.id).count()
-        applicants_per_job.append({
-            'job_title': job.title,
-            'applicants': app_count,
-            'shortlisted': Application.query.filter_by(job_id=job.id, status='Shortlisted').count()
-        })
+    applicants_per_job = [
+        {'job_title': title, 'applicants': applicants, 'shortlisted': int(shortlisted)}
+        for _, title, _, applicants, shortlisted, _, _, _ in rows
+    ]
     
     return {
-        'total_jobs': total_jobs,
-        'active_jobs': active_jobs,
-        'total_applicants': total_applicants,
-        'shortlisted': shortlisted,
-        'rejected': rejected,
-        'interview': interview,
-        'selected': selected,
+        'total_jobs': len(rows),
+        'active_jobs': sum(1 for row in rows if row[2]),
+        'total_applicants': sum(row[3] for row in rows),
+        'shortlisted': sum(int(row[4]) for row in rows),
+        'rejected': sum(int(row[5]) for row in rows),
+        'interview': sum(int(row[6]) for row in rows),
+        'selected': sum(int(row[7]) for row in rows),
         'top_skills': top_skills,
         'applicants_per_job': applicants_per_job
     }
 
-def get_top_applicant_skills(job_ids):
+def get_top_applicant_skills(hr_id, limit=10):
     """
-    Get top skills demanded from applicants
+    Get top skills among applicants to an HR's jobs
+    Each applicant counts once per skill, however many jobs they applied to.
+    One JOIN/GROUP BY query: applicants come from a subquery, not an id list,
+    so there is no bound-parameter limit to hit
     """
-    if not job_ids:
-        return []
-    
-    # Get all applications for these jobs
-    applications = Application.query.filter(Application.job_id.in_(job_ids)).all()
-    student_ids = [app.student_id for app in applications]
+    applicants = db.session.query(Application.student_id).join(
+        Job, Job.id == Application.job_id
+    ).filter(Job.hr_id == hr_id).distinct().subquery()
     
-    # Get skills of these students
-    skills = StudentSkill.query.filter(StudentSkill.student_id.in_(student_ids)).all() if student_ids else []
+    skill = func.lower(StudentSkill.skill_name)
+    applicant_count = func.count(func.distinct(StudentSkill.student_id))
+    rows = db.session.query(skill, applicant_count).join(
+        applicants, applicants.c.student_id == StudentSkill.student_id
+    ).group_by(skill).order_by(applicant_count.desc(), skill).limit(limit).all()
     
-    # Count skill occurrences
-    skill_counts = Counter([s.skill_name.lower() for s in skills])
-    
-    # Return top 10
-    return [{'skill': s[0].title(), 'count': s[1]} for s in skill_counts.most_common(10)]
+    return [{'skill': name.title(), 'count': count} for name, count in rows]
+
+# Same cap as the dashboard's recommendation list
+RECOMMENDED_LIMIT = 5
 
 def get_student_analytics(student_id):
     """
     Get analytics for student dashboard
+    Every field is one indexed query or a rollup read
+    Returns: dict, or None if the student doesn't exist
     """
-    # Get student
     student = Student.query.get(student_id)
     if not student:
         return None
     
-    # Get student's resume
-    resume = Resume.query.filter_by(student_id=student_id).first()
-    
-    # Get applications
-    applications = Application.query.filter_by(student_id=student_id).all()
+    # Score of the student's first resume
+    resume_score = db.session.query(Resume.score).filter_by(student_id=student_id).order_by(Resume.id).limit(1).scalar()
     
-    # Count by status
-    applied = len([a for a in applications if a.status == 'Applied'])
-    shortlisted = len([a for a in applications if a.status == 'Shortlisted'])
-    rejected = len([a for a in applications if a.status == 'Rejected'])
-    interview = len([a for a in applications if a.status == 'Interview'])
-    selected = len([a for a in applications if a.status == 'Selected'])
+    # Count by status (from the per-student rollup)
+    counts = get_status_counts('student', [student_id]).get(student_id, {})
     
-    # Get matched jobs
-    from utils.ai_engine import get_recommended_jobs
-    recommended = get_recommended_jobs(student_id, limit=5)
+    # Recommendable jobs, counted in SQL up to the dashboard's cap
+    from utils.ai_engine import count_recommended_jobs
     
     return {
         'profile': student.to_dict(include_skills=True),
-        'resume_score': resume.score if resume else 0,
-        'total_applications': len(applications),
-        'applied': applied,
-        'shortlisted': shortlisted,
-        'rejected': rejected,
-        'interview': interview,
-        'selected': selected,
-        'recommended_jobs_count': len(recommended)
+        'resume_score': resume_score or 0,
+        'total_applications': sum(counts.values()),
+        'applied': counts.get('Applied', 0),
+        'shortlisted': counts.get('Shortlisted', 0),
+        'rejected': counts.get('Rejected', 0),
+        'interview': counts.get('Interview', 0),
+        'selected': counts.get('Selected', 0),
+        'recommended_jobs_count': count_recommended_jobs(student_id, limit=RECOMMENDED_LIMIT)
     }
 
 def get_admin_analytics():
     """
     Get platform-wide analytics (for potential admin panel)
+    Call inside analytics_snapshot.analytics_reads() to read the snapshot
     """
     total_hr = HR.query.count()
     total_students = Student.query.count()
     total_jobs = Job.query.count()
-    total_applications = Application.query.count()
+    if status_counts_seeded():
+        total_applications = db.session.query(func.coalesce(func.sum(ApplicationStatusCount.count), 0)).filter(
+            ApplicationStatusCount.scope == 'job'
+        ).scalar()
+    else:
+        total_applications = Application.query.count()
     
     # Active jobs
     active_jobs = Job.query.filter_by(is_active=True).count()
@@ -153,49 +227,71 @@ def get_admin_analytics():
         'expiring_soon': expiring_soon
     }
 
-def export_applicants_csv(job_id):
+EXPORT_COLUMNS = [
+    'Student Name', 'Email', 'Branch', 'Graduation Year', 'CGPA', 'Skills',
+    'Resume Score', 'Match Percentage', 'Status', 'Applied Date'
+]
+
+# Applicants fetched (and skills eager-loaded) per round trip
+EXPORT_BATCH_SIZE = 500
+
+def iter_applicant_rows(job_id):
     """
-    Generate CSV data for applicants of a job
-    Returns: list of dicts representing CSV rows
+    Applicants of a job as CSV rows, in EXPORT_COLUMNS order
+    One joined query, read in batches; each batch's skills come from a
+    single selectin query, so memory stays flat for any applicant count
     """
-    applications = Application.query.filter_by(job_id=job_id).all()
-    job = Job.query.get(job_id)
+    # The student's first resume, as the old per-applicant lookup picked
+    first_resume = db.session.query(
+        Resume.student_id, func.min(Resume.id).label('resume_id')
+    ).group_by(Resume.student_id).subquery()
     
-    rows = []
-    for app in applications:
-        student = app.student
-        resume = Resume.query.filter_by(student_id=student.id).first()
-        
-        rows.append({
-            'Student Name': student.name,
-            'Email': student.email,
-            'Branch': student.branch,
-            'Graduation Year': student.grad_year,
-            'CGPA': student.cgpa,
-            'Skills': ', '.join([s.skill_name for s in student.skills]),
-            'Resume Score': resume.score if resume else 0,
-            'Match Percentage': round(app.match_percentage, 2),
-            'Status': app.status,
-            'Applied Date': app.applied_at.strftime('%Y-%m-%d') if app.applied_at else ''
-        })
-    
-    return rows, job.title if job else 'Unknown Job'
+    query = db.session.query(
+        Student, Application.match_percentage, Application.status, Application.applied_at, Resume.score
+    ).join(Application, Application.student_id == Student.id
+    ).outerjoin(first_resume, first_resume.c.student_id == Student.id
+    ).outerjoin(Resume, Resume.id == first_resume.c.resume_id
+    ).filter(Application.job_id == job_id
+    ).order_by(Application.id
+    ).options(selectinload(Student.skills)
+    ).yield_per(EXPORT_BATCH_SIZE)
+    
+    for student, match, status, applied_at, resume_score in query:
+        yield [
+            student.name,
+            student.email,
+            student.branch,
+            student.grad_year,
+            student.cgpa,
+            ', '.join(s.skill_name for s in student.skills),
+            resume_score or 0,
+            round(match or 0, 2),
+            status,
+            applied_at.strftime('%Y-%m-%d') if applied_at else ''
+        ]
 
-def update_job_expiry_status():
+def stream_applicants_csv(job_id):
     """
-    Update job expiry status - mark expired jobs as inactive
-    Called periodically or on application load
+    Generate the applicant export as CSV text, a batch of rows at a time
     """
-    now = datetime.utcnow()
-    expired_jobs = Job.query.filter(
-        Job.is_active == True,
-        Job.expiry_date < now
-    ).all()
-    
-    for job in expired_jobs:
-        job.is_active = False
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
     
-    if expired_jobs:
-        db.session.commit()
+    for count, row in enumerate(iter_applicant_rows(job_id), 1):
+        writer.writerow(row)
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
     
-    return len(expired_jobs)
+    yield buffer.getvalue()
+
+def update_job_expiry_status():
+    """
+    Update job expiry status - mark expired jobs as inactive
+    Internships and business jobs are expired in the same pass (see expiry.py)
+    Returns: number of jobs expired
+    """
+    from utils.expiry import expire_postings
+    return expire_postings()[Job.__tablename__]
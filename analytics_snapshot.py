@@ -0,0 +1,157 @@
+"""
+Analytics Snapshot - periodically refreshed read-only copy of the database
+Heavy reports and exports read the copy, so their long scans never hold
+locks that students applying at peak hours have to wait behind
+Team Arena: Skill-Link Platform
+"""
+
+from models import db
+from flask import current_app
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from contextlib import contextmanager
+from datetime import datetime
+import os
+import sqlite3
+import threading
+import time
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+def _source_path():
+    """File of the live database, or None when it isn't an on-disk SQLite database"""
+    url = db.engine.url
+    if url.get_backend_name() != 'sqlite' or not url.database or url.database == ':memory:':
+        return None
+    return url.database
+
+def snapshot_path():
+    """Configured snapshot file, or None when snapshots are disabled"""
+    return current_app.config.get('ANALYTICS_SNAPSHOT_PATH') or None
+
+def _ensure_wal(connection):
+    """
+    Put the live database in WAL mode (persistent in the file), so the
+    backup's read transaction never blocks writers and sees one consistent state
+    """
+    mode = connection.execute('PRAGMA journal_mode').fetchone()[0]
+    if mode.lower() != 'wal':
+        connection.execute('PRAGMA journal_mode=WAL')
+
+def refresh_snapshot():
+    """
+    Copy the live database to the snapshot file with the SQLite backup API
+    The copy is made in one step inside a single WAL read transaction (an
+    incremental backup restarts whenever another connection writes), built
+    next to the snapshot and swapped in atomically. It records when the
+    copy started in snapshot_meta, i.e. how old its data is
+    Returns: datetime the snapshot reflects, or None if snapshots are off
+    """
+    source, target = _source_path(), snapshot_path()
+    if not source or not target:
+        return None
+
+    staging = f"{target}.{os.getpid()}.tmp"
+    src = sqlite3.connect(source, timeout=30)
+    dst = sqlite3.connect(staging)
+    try:
+        _ensure_wal(src)
+        started = time.time()
+        src.backup(dst, pages=-1)
+        dst.execute('DROP TABLE IF EXISTS snapshot_meta')
+        dst.execute('CREATE TABLE snapshot_meta (taken_at REAL NOT NULL)')
+        dst.execute('INSERT INTO snapshot_meta (taken_at) VALUES (?)', (started,))
+        dst.commit()
+    except Exception:
+        dst.close()
+        os.remove(staging)
+        raise
+    finally:
+        src.close()
+    dst.close()
+
+    os.replace(staging, target)
+    return datetime.utcfromtimestamp(started)
+
+def _snapshot_engine(path):
+    # NullPool: every session opens the file afresh, so a swapped-in
+    # snapshot is picked up without restarting the process
+    with _engines_lock:
+        engine = _engines.get(path)
+        if engine is None:
+            engine = create_engine(f"sqlite:///file:{path}?mode=ro&uri=true", poolclass=NullPool)
+            _engines[path] = engine
+    return engine
+
+def _open_snapshot():
+    """
+    Session on the current snapshot and when that snapshot was taken
+    The time is read through the session's own connection, so it describes
+    exactly the file the session reads even if a refresh swaps it meanwhile
+    Returns: (session, as_of) or (None, None)
+    """
+    path = snapshot_path()
+    if not path or not os.path.exists(path):
+        return None, None
+    session = Session(bind=_snapshot_engine(path))
+    try:
+        taken_at = session.connection().exec_driver_sql('SELECT taken_at FROM snapshot_meta').scalar()
+    except Exception as e:
+        print(f"Analytics snapshot error: {e}")
+        session.close()
+        return None, None
+    return session, datetime.utcfromtimestamp(taken_at)
+
+def _freshness(source, as_of, now, max_staleness):
+    return {
+        'source': source,
+        'as_of': as_of.isoformat(),
+        'staleness_seconds': round((now - as_of).total_seconds()),
+        'max_staleness_seconds': max_staleness
+    }
+
+@contextmanager
+def analytics_reads():
+    """
+    Route db.session (and Model.query) to the snapshot for the enclosed reads
+    Falls back to the live database when the snapshot is missing or older
+    than ANALYTICS_MAX_STALENESS. Nothing inside may write.
+    Yields: dict with source ('snapshot' or 'live'), as_of, staleness_seconds
+    and max_staleness_seconds, describing the data actually read
+    """
+    max_staleness = current_app.config.get('ANALYTICS_MAX_STALENESS', 300)
+    now = datetime.utcnow()
+    session, as_of = _open_snapshot()
+
+    if session is not None and (now - as_of).total_seconds() > max_staleness:
+        session.close()
+        session = None
+    if session is None:
+        # No snapshot, or it fell too far behind: read live data instead
+        yield _freshness('live', now, now, max_staleness)
+        return
+
+    registry = db.session.registry
+    previous = registry() if registry.has() else None
+    registry.set(session)
+    try:
+        yield _freshness('snapshot', as_of, now, max_staleness)
+    finally:
+        session.close()
+        if previous is not None:
+            registry.set(previous)
+        else:
+            registry.clear()
+
+def stream_from_snapshot(generate, *args, **kwargs):
+    """
+    Run a streaming generator inside analytics_reads()
+    The first item yielded is the freshness dict, before any data, so the
+    caller can put it in the response headers:
+        chunks = stream_from_snapshot(...); freshness = next(chunks)
+    """
+    with analytics_reads() as freshness:
+        yield freshness
+        yield from generate(*args, **kwargs)
@@ -8,6 +8,7 @@ from flask import Flask, jsonify, request, render_template
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager, jwt_required, get_jwt_identity, get_jwt
 from dotenv import load_dotenv
+import click
 import os
 
 # Load environment variables
@@ -23,6 +24,15 @@ from routes.student_routes import student_bp
 from routes.resume_routes import resume_bp
 from routes.feature_routes import feature_bp
 from routes.internship_routes import internship_bp
+from utils.resume_parser import configure_extractors
+from utils.taxonomy import taxonomy_version
+from utils.blob_store import sweep_orphans
+from utils.resume_scoring import run_rescore
+from utils.resume_dedup import run_dedup
+from utils.funnel import run_funnel_rollup
+from utils.expiry import expire_postings
+from utils.analytics_snapshot import refresh_snapshot
+from utils.background import start_interval_task
 
 # Get OpenAI API key
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -40,6 +50,37 @@ except ImportError:
     client = None
     OPENAI_AVAILABLE = False
 
+def start_background_tasks(app):
+    """Start the periodic maintenance tasks for app (each at most once per process)"""
+    # Sweep resume blobs no longer referenced by any resume
+    start_interval_task(
+        app, 'blob-sweeper', app.config.get('BLOB_SWEEP_INTERVAL'),
+        sweep_orphans, app.config.get('BLOB_ORPHAN_GRACE', 3600)
+    )
+    
+    # Re-score resumes scored by an older scoring model
+    start_interval_task(
+        app, 'resume-rescore', app.config.get('RESCORE_INTERVAL'),
+        run_rescore, app.config.get('RESCORE_STATE_PATH'),
+        app.config.get('RESCORE_BATCH_SIZE', 100), app.config.get('RESCORE_RATE', 20)
+    )
+    
+    # Fingerprint new uploads and update the resume similarity graph
+    start_interval_task(
+        app, 'resume-dedup', app.config.get('DEDUP_INTERVAL'),
+        run_dedup, app.config.get('DEDUP_BATCH_SIZE', 200)
+    )
+    
+    # Fold application status events into the funnel time series
+    start_interval_task(app, 'funnel-rollup', app.config.get('FUNNEL_ROLLUP_INTERVAL'), run_funnel_rollup)
+    
+    # Deactivate jobs, internships and business jobs past their expiry date
+    start_interval_task(app, 'posting-expiry', app.config.get('EXPIRY_SWEEP_INTERVAL'), expire_postings)
+    
+    # Refresh the read-only copy analytics and exports read from
+    if app.config.get('ANALYTICS_SNAPSHOT_PATH'):
+        start_interval_task(app, 'analytics-snapshot', app.config.get('ANALYTICS_SNAPSHOT_INTERVAL'), refresh_snapshot)
+
 def create_app(config_name=None):
     """Application Factory"""
     if config_name is None:
@@ -50,6 +91,18 @@ def create_app(config_name=None):
     # Load configuration
     app.config.from_object(config.get(config_name, config['development']))
     
+    # Progress files the app writes live in the instance folder, not the source tree
+    if not app.config.get('RESCORE_STATE_PATH'):
+        app.config['RESCORE_STATE_PATH'] = os.path.join(app.instance_path, 'rescore_state.json')
+    
+    # Select resume text extractors
+    configure_extractors(
+        app.config.get('PDF_EXTRACTOR'),
+        app.config.get('DOCX_EXTRACTOR'),
+        app.config.get('FALLBACK_MAX_CHARS'),
+        app.config.get('FALLBACK_MAX_SCAN_BYTES')
+    )
+    
     # Initialize extensions
     db.init_app(app)
     CORS(app, resources={r"/api/*": {"origins": "*"}})
@@ -70,6 +123,10 @@ def create_app(config_name=None):
     upload_folder = os.path.join(app.root_path, 'static', 'uploads', 'resumes')
     os.makedirs(upload_folder, exist_ok=True)
     
+    # Periodic maintenance (python app.py starts them after creating the app)
+    if app.config.get('BACKGROUND_TASKS_ENABLED'):
+        start_background_tasks(app)
+    
     # ==================== OPENAI ROUTES ====================
     
     @app.route('/api/openai/status', methods=['GET'], endpoint='openai_status')
@@ -309,6 +366,7 @@ Provide readiness level and a detailed improvement plan."""
             'platform': 'Skill-Link',
             'chatbot': 'CareerBot',
             'version': '1.0.0',
+            'taxonomy_version': taxonomy_version(),
             'team': 'Team Arena'
         })
     
@@ -449,9 +507,24 @@ app = create_app()
 @app.cli.command('init-db')
 def init_db_command():
     """Initialize the database"""
-    db.create_all()
+    from utils.schema_upgrade import upgrade_schema
+    from utils.analytics import seed_status_counts
+    upgrade_schema()
+    seed_status_counts()
     print("Database initialized successfully!")
 
+# Schema upgrade command (safe to run repeatedly, keeps existing data)
+@app.cli.command('upgrade-db')
+def upgrade_db_command():
+    """Add tables, columns and indexes missing from an existing database"""
+    from utils.schema_upgrade import upgrade_schema
+    from utils.analytics import seed_status_counts
+    added = upgrade_schema()
+    print(f"Added: {', '.join(added)}" if added else "Schema is up to date")
+    seeded = seed_status_counts()
+    if seeded:
+        print(f"Seeded {seeded} application status counter rows")
+
 # Seed demo data command
 @app.cli.command('seed-demo')
 def seed_demo_command():
@@ -459,13 +532,200 @@ def seed_demo_command():
     from demo_data import seed_demo_data
     seed_demo_data()
 
+# Bulk resume import command
+@app.cli.command('import-resumes')
+@click.argument('source', type=click.Path(exists=True))
+@click.option('--mapping', type=click.Path(exists=True), help='CSV with key,email columns (key = file stem or roll number)')
+@click.option('--workers', type=int, default=None, help='Parser processes (default: CPU count)')
+@click.option('--batch-size', type=click.IntRange(min=1), default=50, help='Resumes saved per transaction')
+@click.option('--checkpoint', type=click.Path(), default=None, help='Progress file (default: in the instance folder, per source)')
+def import_resumes_command(source, mapping, workers, batch_size, checkpoint):
+    """Bulk import resumes from a directory or ZIP archive"""
+    from utils.resume_import import import_resumes, default_checkpoint_path
+    checkpoint = checkpoint or default_checkpoint_path(source, os.path.join(app.instance_path, 'imports'))
+    summary = import_resumes(source, mapping, workers, batch_size, checkpoint)
+    print(f"Imported {summary['imported']}, unmatched {summary['unmatched']}, "
+          f"failed {summary['failed']}, already done {summary['skipped']} (of {summary['total']})")
+
+# Orphaned resume blob sweep command
+@app.cli.command('sweep-blobs')
+@click.option('--grace', default=None, type=int, help='Minimum blob age in seconds (default: BLOB_ORPHAN_GRACE)')
+def sweep_blobs_command(grace):
+    """Delete resume blobs no resume references"""
+    if grace is None:
+        grace = app.config.get('BLOB_ORPHAN_GRACE', 3600)
+    print(f"Removed {sweep_orphans(grace)} orphaned files")
+
+@app.cli.command('migrate-resume-blobs')
+def migrate_resume_blobs_command():
+    """Move resumes uploaded before the blob store into it"""
+    from utils.blob_store import migrate_legacy_resumes
+    migrated, missing = migrate_legacy_resumes()
+    print(f"Migrated {migrated} resumes ({missing} with missing files)")
+
+@app.cli.command('rescore-resumes')
+@click.option('--pause', 'action', flag_value='pause', help='Pause the background re-score job')
+@click.option('--resume', 'action', flag_value='resume', help='Resume a paused re-score job')
+@click.option('--status', 'action', flag_value='status', help='Show re-score progress')
+@click.option('--rate', default=None, type=float, help='Resumes per second (default: RESCORE_RATE)')
+@click.option('--batch-size', default=None, type=int, help='Resumes per batch (default: RESCORE_BATCH_SIZE)')
+def rescore_resumes_command(action, rate, batch_size):
+    """Re-score resumes whose score predates the current scoring model"""
+    from utils.resume_scoring import load_rescore_state, set_rescore_paused, scoring_model_version
+    state_path = app.config['RESCORE_STATE_PATH']
+    
+    if action in ('pause', 'resume'):
+        set_rescore_paused(state_path, action == 'pause')
+        print(f"Re-scoring {'paused' if action == 'pause' else 'resumed'}")
+        return
+    
+    if action == 'status':
+        state = load_rescore_state(state_path)
+        print(f"Current model {scoring_model_version()}; state: {state}")
+        return
+    
+    state = run_rescore(
+        state_path,
+        batch_size or app.config.get('RESCORE_BATCH_SIZE', 100),
+        rate if rate is not None else app.config.get('RESCORE_RATE', 20)
+    )
+    print(f"Re-scored {state['rescored']} resumes for model {state['model']} "
+          f"(last id {state['last_id']}{', paused' if state['paused'] else ''})")
+
+@app.cli.command('dedup-resumes')
+@click.option('--rebuild-index', is_flag=True, help='Rewrite the LSH band index from stored fingerprints first')
+def dedup_resumes_command(rebuild_index):
+    """Run the duplicate check for every resume waiting for it"""
+    if rebuild_index:
+        from utils.resume_dedup import rebuild_lsh_index
+        print(f"Indexed {rebuild_lsh_index()} fingerprints")
+    total = 0
+    while True:
+        checked = run_dedup(app.config.get('DEDUP_BATCH_SIZE', 200))
+        if not checked:
+            break
+        total += checked
+    print(f"Checked {total} resumes for duplicates")
+
+@app.cli.command('rebuild-funnel-counters')
+def rebuild_funnel_counters_command():
+    """Recompute the per-job/per-student application status counters"""
+    from utils.analytics import rebuild_status_counts
+    print(f"Rebuilt {rebuild_status_counts()} counter rows")
+
+@app.cli.command('funnel-rollup')
+@click.option('--backfill', is_flag=True, help='Seed status events from existing applications first')
+def funnel_rollup_command(backfill):
+    """Roll application status events up into daily/weekly funnel buckets"""
+    if backfill:
+        from utils.funnel import backfill_status_events
+        print(f"Backfilled {backfill_status_events()} status events")
+    print(f"Rolled up {run_funnel_rollup()} days")
+
+@app.cli.command('refresh-analytics-snapshot')
+def refresh_analytics_snapshot_command():
+    """Copy the database to ANALYTICS_SNAPSHOT_PATH for analytics reads"""
+    as_of = refresh_snapshot()
+    if as_of is None:
+        raise click.ClickException('Snapshots need ANALYTICS_SNAPSHOT_PATH and an on-disk SQLite database')
+    print(f"Analytics snapshot refreshed (as of {as_of.isoformat()})")
+
+@app.cli.command('expire-postings')
+def expire_postings_command():
+    """Deactivate jobs, internships and business jobs past their expiry date"""
+    for table, count in expire_postings().items():
+        print(f"{table}: {count} expired")
+
+@app.cli.command('export-placements')
+@click.argument('output', type=click.Path(dir_okay=False, writable=True))
+@click.option('--format', 'fmt', type=click.Choice(['parquet', 'arrow']), default=None,
+              help='File format (default: from the extension, else parquet)')
+@click.option('--chunk-size', default=None, type=int, help='Rows per row group (default: PLACEMENT_EXPORT_CHUNK_SIZE)')
+@click.option('--hr-id', default=None, type=int, help="Only this recruiter's jobs")
+def export_placements_command(output, fmt, chunk_size, hr_id):
+    """Export applications with student, job and skill data as Parquet or Arrow IPC"""
+    from utils.placement_export import write_placement_export
+    
+    fmt = fmt or ('arrow' if output.endswith(('.arrow', '.feather', '.ipc')) else 'parquet')
+    try:
+        rows = write_placement_export(
+            output, fmt, chunk_size or app.config.get('PLACEMENT_EXPORT_CHUNK_SIZE', 10000), hr_id
+        )
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    print(f"Wrote {rows} applications to {output} ({fmt})")
+
+# Text extractor benchmark command
+@app.cli.command('bench-extractors')
+@click.argument('corpus', type=click.Path(exists=True, file_okay=False))
+@click.option('--reference', default=None, help='Backend whose output counts as correct (default: configured one)')
+def bench_extractors_command(corpus, reference):
+    """Compare extractor backends on a folder of resumes"""
+    from utils.benchmarks import benchmark_extractors
+    print(f"{'backend':<12} {'kind':<5} {'files':>6} {'pages':>6} {'pages/s':>9} {'similarity':>10} {'agree':>7}")
+    for row in benchmark_extractors(corpus, reference):
+        marker = ' (reference)' if row['reference'] else ''
+        print(f"{row['backend']:<12} {row['kind']:<5} {row['files']:>6} {row['pages']:>6} "
+              f"{row['pages_per_sec']:>9} {row['mean_similarity']:>10} {row['agreement_rate']:>7.0%}{marker}")
+
+@app.cli.command('bench-parser')
+@click.option('--corpus', default=None, type=click.Path(exists=True, file_okay=False),
+              help='Folder of real resumes (default: generate a synthetic corpus)')
+@click.option('--count', default=40, help='Synthetic resumes to generate')
+@click.option('--seed', default=42, help='Seed for the synthetic corpus')
+@click.option('--rounds', default=3, help='Passes over the corpus')
+@click.option('--baseline', default='bench_baseline.json', help='Stored baseline to compare against')
+@click.option('--max-slowdown', default=0.2, help='Allowed throughput/p95 regression (fraction)')
+@click.option('--max-rss-growth', default=0.25, help='Allowed peak RSS growth (fraction)')
+@click.option('--save-baseline', is_flag=True, help='Store these results as the new baseline')
+def bench_parser_command(corpus, count, seed, rounds, baseline, max_slowdown, max_rss_growth, save_baseline):
+    """Benchmark extraction, parsing and scoring; exit non-zero on regression"""
+    import tempfile
+    from utils.benchmarks import (
+        benchmark_parser, generate_corpus, load_baseline, save_baseline as store_baseline, find_regressions
+    )
+    from utils.resume_import import list_resume_files
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if corpus:
+            paths = [os.path.join(corpus, key) for key in list_resume_files(corpus)]
+        else:
+            paths = generate_corpus(tmp_dir, count=count, seed=seed)
+        results = benchmark_parser(paths, rounds=rounds)
+
+    print(f"{results['resumes']} resumes, peak RSS {results['peak_rss_mb']} MB")
+    print(f"{'stage':<8} {'resumes/s':>10} {'p95 ms':>9}")
+    for stage in ('extract', 'parse', 'score', 'total'):
+        print(f"{stage:<8} {results[stage]['resumes_per_sec']:>10} {results[stage]['p95_ms']:>9}")
+
+    if save_baseline:
+        store_baseline(baseline, results)
+        print(f"Baseline saved to {baseline}")
+        return
+
+    stored = load_baseline(baseline)
+    if stored is None:
+        print(f"No baseline at {baseline}; run with --save-baseline to create one")
+        return
+
+    regressions = find_regressions(results, stored, max_slowdown, max_rss_growth)
+    if regressions:
+        raise click.ClickException('Regression against baseline:\n  ' + '\n  '.join(regressions))
+    print("No regressions against baseline")
+
 # Run the application
 if __name__ == '__main__':
-    # Initialize database
+    # Initialize database (and add columns/indexes a newer release needs)
+    from utils.schema_upgrade import upgrade_schema
+    from utils.analytics import seed_status_counts
     with app.app_context():
-        db.create_all()
+        upgrade_schema()
+        seed_status_counts()
         print("Database tables created!")
     
+    # Single server process: it runs the maintenance tasks itself
+    start_background_tasks(app)
+    
     # Run the app
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=True)
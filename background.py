@@ -0,0 +1,79 @@
+"""
+Background Tasks - periodic maintenance jobs on daemon threads
+Each task holds a lock file in the instance folder while it runs, so when
+several processes start the same task only one of them does the work
+Team Arena: Skill-Link Platform
+"""
+
+import os
+import threading
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+_tasks = {}
+_tasks_lock = threading.Lock()
+
+def _should_start(app):
+    """Skip the parent of the debug reloader; only the serving child runs tasks"""
+    return not app.debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
+
+def _acquire_task_lock(app, name):
+    """
+    Take the task's lock file without waiting
+    The lock is held for the life of the process (released when it exits)
+    Returns: open lock file, or None if another process holds it
+    """
+    if not FCNTL_AVAILABLE:
+        # No advisory locks on this platform: run a single process
+        return True
+    os.makedirs(app.instance_path, exist_ok=True)
+    lock_file = open(os.path.join(app.instance_path, f"{name}.lock"), 'w')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+def start_interval_task(app, name, interval, func, *args, **kwargs):
+    """
+    Run func(*args, **kwargs) every interval seconds inside an app context
+    A task name is started at most once per process; interval <= 0 disables it.
+    Across processes, only the one holding the task's lock file runs it; the
+    others keep trying, so one takes over if the holder exits
+    Returns: the threading.Event that stops the task, or None if not started
+    """
+    if not interval or interval <= 0 or not _should_start(app):
+        return None
+
+    with _tasks_lock:
+        if name in _tasks:
+            return _tasks[name]
+        stop = threading.Event()
+        _tasks[name] = stop
+
+    def run():
+        lock = None
+        while not stop.wait(interval):
+            lock = lock or _acquire_task_lock(app, name)
+            if not lock:
+                continue
+            with app.app_context():
+                try:
+                    func(*args, **kwargs)
+                except Exception as e:
+                    print(f"Background task {name} error: {e}")
+
+    threading.Thread(target=run, name=f"skilllink-{name}", daemon=True).start()
+    return stop
+
+def stop_interval_task(name):
+    """Signal a running task to stop after its current run"""
+    with _tasks_lock:
+        stop = _tasks.pop(name, None)
+    if stop:
+        stop.set()
@@ -0,0 +1,328 @@
+"""
+Benchmarks - resume extraction, parsing and scoring throughput
+Team Arena: Skill-Link Platform
+"""
+
+from utils.resume_parser import (
+    EXTRACTORS, EXTENSION_KINDS, available_extractors, get_extractor,
+    extract_text_from_file, parse_resume, calculate_resume_score
+)
+from difflib import SequenceMatcher
+from xml.sax.saxutils import escape
+import json
+import math
+import os
+import random
+import re
+import sys
+import time
+import zipfile
+
+# Outputs at least this similar to the reference count as agreeing
+AGREEMENT_THRESHOLD = 0.95
+
+def count_pages(file_path):
+    """
+    Page count of a PDF or DOCX file
+    DOCX uses the page count Word stores in docProps/app.xml (1 if absent)
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    try:
+        if ext == '.pdf':
+            import PyPDF2
+            with open(file_path, 'rb') as f:
+                return len(PyPDF2.PdfReader(f).pages)
+        with zipfile.ZipFile(file_path) as archive:
+            app_xml = archive.read('docProps/app.xml').decode('utf-8', errors='ignore')
+        match = re.search(r'<Pages>(\d+)</Pages>', app_xml)
+        return int(match.group(1)) if match else 1
+    except Exception:
+        return 1
+
+def _normalize(text):
+    """Whitespace-insensitive token list used for agreement checks"""
+    return text.split()
+
+def text_similarity(text, reference):
+    """Token-level similarity ratio between two extracted texts (0-1)"""
+    a, b = _normalize(text), _normalize(reference)
+    if not a and not b:
+        return 1.0
+    return SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+def benchmark_extractors(corpus_dir, reference=None):
+    """
+    Run every installed extractor over a folder of resumes
+    Each backend is compared with the reference backend for its file kind
+    (the configured one unless given)
+    Returns: list of dicts with files, pages, seconds, pages_per_sec,
+    mean_similarity and agreement_rate per backend
+    """
+    files = {}
+    for root, _, names in os.walk(corpus_dir):
+        for name in sorted(names):
+            kind = EXTENSION_KINDS.get(os.path.splitext(name)[1].lower())
+            if kind:
+                files.setdefault(kind, []).append(os.path.join(root, name))
+
+    results = []
+    for kind, paths in files.items():
+        pages = {path: count_pages(path) for path in paths}
+        reference_name = reference if EXTRACTORS.get(reference, {}).get('kind') == kind else get_extractor(kind)
+
+        outputs = {}
+        for name in available_extractors(kind):
+            extract = EXTRACTORS[name]['extract']
+            texts = {}
+            started = time.perf_counter()
+            for path in paths:
+                try:
+                    texts[path] = extract(path)
+                except Exception:
+                    texts[path] = ''
+            outputs[name] = (texts, time.perf_counter() - started)
+
+        reference_texts = outputs.get(reference_name, ({}, 0))[0]
+        for name, (texts, seconds) in outputs.items():
+            similarities = [text_similarity(texts[p], reference_texts.get(p, '')) for p in paths]
+            total_pages = sum(pages.values())
+            results.append({
+                'backend': name,
+                'kind': kind,
+                'reference': name == reference_name,
+                'files': len(paths),
+                'pages': total_pages,
+                'seconds': round(seconds, 3),
+                'pages_per_sec': round(total_pages / seconds, 1) if seconds else 0,
+                'mean_similarity': round(sum(similarities) / len(similarities), 4),
+                'agreement_rate': round(sum(1 for s in similarities if s >= AGREEMENT_THRESHOLD) / len(similarities), 4)
+            })
+
+    return results
+
+# ==================== SYNTHETIC CORPUS ====================
+
+SECTION_HEADINGS = {
+    'education': ['Education', 'EDUCATION', 'Academic Qualifications', 'Academics'],
+    'experience': ['Experience', 'Work Experience', 'Internship Experience', 'Employment'],
+    'skills': ['Skills', 'Technical Skills', 'Tech Stack'],
+    'projects': ['Projects', 'Academic Projects', 'Key Projects'],
+    'achievements': ['Achievements', 'Awards', 'Certifications']
+}
+
+SAMPLE_SKILLS = [
+    'Python', 'Java', 'JavaScript', 'React', 'Node.js', 'SQL', 'MongoDB', 'Docker', 'AWS', 'Git',
+    'Machine Learning', 'TensorFlow', 'Pandas', 'Flask', 'Django', 'C++', 'Kubernetes', 'Linux'
+]
+
+LINES_PER_PAGE = 45
+
+def _section_lines(section, rng):
+    """Body lines for one synthetic resume section"""
+    if section == 'education':
+        return [f"B.Tech Computer Science, {rng.choice(['NIT', 'IIIT', 'State'])} University {y}-{y + 4}"
+                for y in rng.sample(range(2015, 2022), 2)]
+    if section == 'experience':
+        return [f"{rng.choice(['Software', 'Data', 'Backend'])} Intern at Company {i}: built services with "
+                f"{', '.join(rng.sample(SAMPLE_SKILLS, 3))} and owned the responsibility for releases"
+                for i in range(rng.randint(1, 4))]
+    if section == 'skills':
+        return [', '.join(rng.sample(SAMPLE_SKILLS, rng.randint(4, 12)))]
+    if section == 'projects':
+        return [f"Project {i}: {rng.choice(['Resume parser', 'Chat app', 'Recommender'])} using "
+                f"{', '.join(rng.sample(SAMPLE_SKILLS, 2))} framework" for i in range(rng.randint(1, 3))]
+    return [f"Achievement {i}: ranked {rng.randint(1, 500)} in coding contest" for i in range(rng.randint(1, 3))]
+
+def synthetic_resume(rng, pages):
+    """
+    Lines of a random resume: shuffled section order, varied headings and
+    some sections missing, padded with project detail to fill the page count
+    Returns: list of pages, each a list of lines
+    """
+    lines = [f"Candidate {rng.randint(1, 10 ** 6)}", f"candidate{rng.randint(1, 10 ** 6)}@student.edu"]
+    sections = [s for s in SECTION_HEADINGS if s == 'skills' or rng.random() > 0.15]
+    rng.shuffle(sections)
+    for section in sections:
+        lines.append(rng.choice(SECTION_HEADINGS[section]))
+        lines.extend(_section_lines(section, rng))
+
+    while len(lines) < pages * LINES_PER_PAGE:
+        lines.append(f"- Worked on {rng.choice(SAMPLE_SKILLS)} module {len(lines)} with the team")
+
+    return [lines[i:i + LINES_PER_PAGE] for i in range(0, pages * LINES_PER_PAGE, LINES_PER_PAGE)]
+
+def write_pdf(path, pages):
+    """Write a minimal text-only PDF (Helvetica, one text object per page)"""
+    def pdf_string(line):
+        return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+    objects = [b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    pages_ref = 2 + 2 * len(pages)
+    page_refs = []
+    for lines in pages:
+        stream = ("BT /F1 10 Tf 40 800 Td 16 TL " + " ".join(f"({pdf_string(l)}) '" for l in lines) + " ET").encode('latin-1', 'replace')
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 842] /Contents %d 0 R "
+                       b"/Resources << /Font << /F1 1 0 R >> >> >>" % (pages_ref, len(objects)))
+        page_refs.append(len(objects))
+    objects.append(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % r for r in page_refs), len(page_refs)))
+    objects.append(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_ref)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, len(objects), xref)
+
+    with open(path, 'wb') as f:
+        f.write(out)
+
+def write_docx(path, pages):
+    """Write a minimal DOCX (one paragraph per line, page count in docProps/app.xml)"""
+    w = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+    paragraphs = ''.join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>'
+        for lines in pages for line in lines
+    )
+    parts = {
+        '[Content_Types].xml': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            '<Override PartName="/docProps/app.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.extended-properties+xml"/>'
+            '</Types>'
+        ),
+        '_rels/.rels': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="word/document.xml"/>'
+            '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/extended-properties" '
+            'Target="docProps/app.xml"/>'
+            '</Relationships>'
+        ),
+        'word/document.xml': (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            f'<w:document xmlns:w="{w}"><w:body>{paragraphs}</w:body></w:document>'
+        ),
+        'docProps/app.xml': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Properties xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties">'
+            f'<Pages>{len(pages)}</Pages></Properties>'
+        )
+    }
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, xml in parts.items():
+            archive.writestr(name, xml)
+
+def generate_corpus(directory, count=40, seed=42, page_counts=(1, 2, 3, 5)):
+    """
+    Write count synthetic resumes (alternating PDF and DOCX) into directory
+    Returns: list of file paths
+    """
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        pages = synthetic_resume(rng, page_counts[i % len(page_counts)])
+        ext = 'pdf' if i % 2 == 0 else 'docx'
+        path = os.path.join(directory, f"resume_{i:04d}.{ext}")
+        (write_pdf if ext == 'pdf' else write_docx)(path, pages)
+        paths.append(path)
+    return paths
+
+# ==================== PARSER BENCHMARK ====================
+
+def _percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def benchmark_parser(paths, rounds=1):
+    """
+    Time extraction, parsing and scoring separately for every file
+    Returns: dict of stage -> {resumes_per_sec, p95_ms} plus peak_rss_mb
+    """
+    timings = {'extract': [], 'parse': [], 'score': [], 'total': []}
+
+    for _ in range(rounds):
+        for path in paths:
+            started = time.perf_counter()
+            text = extract_text_from_file(path)
+            extracted = time.perf_counter()
+            parsed_data = parse_resume(text)
+            parsed = time.perf_counter()
+            calculate_resume_score(parsed_data, text=text)
+            scored = time.perf_counter()
+
+            timings['extract'].append(extracted - started)
+            timings['parse'].append(parsed - extracted)
+            timings['score'].append(scored - parsed)
+            timings['total'].append(scored - started)
+
+    results = {'resumes': len(paths) * rounds, 'peak_rss_mb': peak_rss_mb()}
+    for stage, values in timings.items():
+        seconds = sum(values)
+        results[stage] = {
+            'resumes_per_sec': round(len(values) / seconds, 1) if seconds else 0,
+            'p95_ms': round(_percentile(values, 95) * 1000, 3)
+        }
+    return results
+
+def load_baseline(path):
+    """Stored benchmark results, or None if there is no baseline yet"""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_baseline(path, results):
+    """Store benchmark results as the new baseline"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+# p95 changes smaller than this are timer noise, whatever the ratio
+MIN_P95_DELTA_MS = 0.5
+
+def find_regressions(results, baseline, max_slowdown=0.2, max_rss_growth=0.25):
+    """
+    Compare results with a baseline
+    A stage regresses when its throughput drops or its p95 latency grows by
+    more than max_slowdown (a fraction); peak RSS by more than max_rss_growth
+    Returns: list of human readable regression messages
+    """
+    regressions = []
+    for stage in ('extract', 'parse', 'score', 'total'):
+        current, before = results.get(stage), baseline.get(stage)
+        if not current or not before:
+            continue
+        if before['resumes_per_sec'] and current['resumes_per_sec'] < before['resumes_per_sec'] * (1 - max_slowdown):
+            regressions.append(f"{stage}: {current['resumes_per_sec']} resumes/s, baseline {before['resumes_per_sec']}")
+        if (current['p95_ms'] > before['p95_ms'] * (1 + max_slowdown)
+                and current['p95_ms'] - before['p95_ms'] > MIN_P95_DELTA_MS):
+            regressions.append(f"{stage}: p95 {current['p95_ms']} ms, baseline {before['p95_ms']} ms")
+
+    if results.get('peak_rss_mb') and baseline.get('peak_rss_mb'):
+        if results['peak_rss_mb'] > baseline['peak_rss_mb'] * (1 + max_rss_growth):
+            regressions.append(f"peak RSS {results['peak_rss_mb']} MB, baseline {baseline['peak_rss_mb']} MB")
+
+    return regressions
@@ -0,0 +1,156 @@
+"""
+Resume Blob Store - content-addressed resume files
+Files live at <root>/<aa>/<bb>/<sha256>.<ext>; identical bytes are stored once
+and a blob is kept for as long as a Resume row references its hash
+Team Arena: Skill-Link Platform
+"""
+
+from flask import current_app
+from models import db, Resume
+import hashlib
+import os
+import tempfile
+import time
+
+CHUNK_SIZE = 64 * 1024
+
+# Staging area for uploads in flight; same filesystem so os.replace is atomic
+TMP_DIRNAME = 'tmp'
+
+def blob_root():
+    """Directory holding the shards (RESUME_BLOB_DIR)"""
+    root = current_app.config.get('RESUME_BLOB_DIR') or os.path.join(
+        current_app.root_path, 'static', 'uploads', 'resumes'
+    )
+    os.makedirs(root, exist_ok=True)
+    return root
+
+def blob_path(content_hash, ext, root=None):
+    """Sharded path of a blob: two levels of two hex characters"""
+    root = root or blob_root()
+    return os.path.join(root, content_hash[:2], content_hash[2:4], f"{content_hash}.{ext}")
+
+class BlobWriter:
+    """
+    Incremental blob write: chunks are hashed as they go to a temp file,
+    which commit() moves into place (or drops on a dedup hit)
+    """
+
+    def __init__(self):
+        self.root = blob_root()
+        tmp_dir = os.path.join(self.root, TMP_DIRNAME)
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, self.tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        self._file = os.fdopen(fd, 'wb')
+        self._digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, chunk):
+        self._digest.update(chunk)
+        self._file.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self, ext):
+        """Returns: (content_hash, path)"""
+        self._file.close()
+        content_hash = self._digest.hexdigest()
+        path = blob_path(content_hash, ext.lower(), self.root)
+        if os.path.exists(path):
+            # Dedup hit: refresh mtime so the sweeper's grace period covers this upload
+            os.utime(path)
+            os.remove(self.tmp_path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(self.tmp_path, path)
+        return content_hash, path
+
+    def discard(self):
+        """Drop a rejected or failed upload"""
+        self._file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+def _write_blob(chunks, ext):
+    """Hash chunks while writing them to a temp file, then move it into place"""
+    writer = BlobWriter()
+    try:
+        for chunk in chunks:
+            writer.write(chunk)
+        return writer.commit(ext)
+    except BaseException:
+        writer.discard()
+        raise
+
+def store_blob(stream, ext):
+    """
+    Store an uploaded file object (werkzeug FileStorage or binary file)
+    Returns: (content_hash, path)
+    """
+    return _write_blob(iter(lambda: stream.read(CHUNK_SIZE), b''), ext.lower())
+
+def store_blob_from_path(source_path, ext=None):
+    """Store a file already on disk (imports, migrating legacy uploads)"""
+    ext = (ext or source_path.rsplit('.', 1)[-1]).lower()
+    with open(source_path, 'rb') as f:
+        return store_blob(f, ext)
+
+def iter_blobs(root=None):
+    """Yield (content_hash, path) for every blob in the shard tree"""
+    root = root or blob_root()
+    for first in os.listdir(root):
+        first_dir = os.path.join(root, first)
+        if len(first) != 2 or not os.path.isdir(first_dir):
+            continue
+        for second in os.listdir(first_dir):
+            second_dir = os.path.join(first_dir, second)
+            if not os.path.isdir(second_dir):
+                continue
+            for name in os.listdir(second_dir):
+                yield name.split('.', 1)[0], os.path.join(second_dir, name)
+
+def sweep_orphans(grace_seconds=3600):
+    """
+    Delete blobs no Resume row references, plus abandoned temp files
+    Files younger than grace_seconds are kept so an upload that has stored
+    its blob but not yet committed its row is never swept
+    Returns: number of files removed
+    """
+    root = blob_root()
+    cutoff = time.time() - grace_seconds
+    referenced = {h for (h,) in db.session.query(Resume.content_hash).filter(Resume.content_hash.isnot(None)).distinct()}
+
+    removed = 0
+    candidates = [path for content_hash, path in iter_blobs(root) if content_hash not in referenced]
+
+    tmp_dir = os.path.join(root, TMP_DIRNAME)
+    if os.path.isdir(tmp_dir):
+        candidates.extend(os.path.join(tmp_dir, name) for name in os.listdir(tmp_dir))
+
+    for path in candidates:
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError as e:
+            print(f"Blob sweep error for {path}: {e}")
+
+    return removed
+
+def migrate_legacy_resumes():
+    """
+    Move resumes saved before the blob store into it
+    Rows get a content hash and a sharded path; the flat file is removed
+    Returns: (migrated, missing)
+    """
+    migrated = missing = 0
+    for resume in Resume.query.filter(Resume.content_hash.is_(None)).all():
+        if not os.path.exists(resume.file_path):
+            missing += 1
+            continue
+        old_path = resume.file_path
+        resume.content_hash, resume.file_path = store_blob_from_path(old_path)
+        db.session.commit()
+        if os.path.abspath(old_path) != os.path.abspath(resume.file_path):
+            os.remove(old_path)
+        migrated += 1
+    return migrated, missing
@@ -0,0 +1,194 @@
+"""
+Cohort Analytics - placement statistics per branch and graduation year
+Covers the applicants of one HR's jobs. Applications and applicant skills
+are read in bulk into DataFrames and every
+metric is computed with vectorized pandas/NumPy operations; results are
+cached per HR until the database shows new data, for at most COHORT_CACHE_TTL
+Team Arena: Skill-Link Platform
+"""
+
+from models import db, Job, Student, StudentSkill, Application, ApplicationStatusEvent
+from utils.resume_scoring import LRUCache
+from sqlalchemy import func
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import time
+
+COHORT_DIMENSIONS = ('branch', 'grad_year')
+
+# Statuses that mean an applicant made it past screening
+SHORTLISTED_STATUSES = ('Shortlisted', 'Interview', 'Selected')
+
+CGPA_BINS = [0, 6, 7, 8, 9, 10.01]
+CGPA_LABELS = ['<6', '6-7', '7-8', '8-9', '9-10']
+
+# A skill must be held by this many applicants in a cohort to be ranked
+MIN_SKILL_SUPPORT = 5
+TOP_SKILLS = 5
+
+# ==================== CACHE ====================
+
+# Seconds a result may be reused: edits to student profiles (branch, CGPA)
+# don't show in the data version
+COHORT_CACHE_TTL = 300
+
+# hr_id -> (data version, time computed, result)
+_cache = LRUCache(256)
+
+def _data_version(hr_id):
+    """
+    Fingerprint of hr_id's cohort inputs, read from the database (or the
+    snapshot being read), so writes from any process change it: applications
+    and status changes append to application_status_events, deletions lower
+    the application count, skill edits move the student_skills id/count
+    Returns: tuple, compared for equality only
+    """
+    applications = db.session.query(func.count(Application.id)).join(
+        Job, Job.id == Application.job_id
+    ).filter(Job.hr_id == hr_id).scalar_subquery()
+    return tuple(db.session.query(
+        applications,
+        db.session.query(func.max(ApplicationStatusEvent.id)).scalar_subquery(),
+        db.session.query(func.count(StudentSkill.id)).scalar_subquery(),
+        db.session.query(func.max(StudentSkill.id)).scalar_subquery()
+    ).one())
+
+# ==================== LOADING ====================
+
+def _load_frames(hr_id):
+    """
+    One bulk query per table, limited to applications to hr_id's jobs
+    Returns: (applications DataFrame, applicant skills DataFrame)
+    """
+    apps = pd.DataFrame(
+        db.session.query(
+            Application.student_id, Application.status, Application.match_percentage,
+            Student.branch, Student.grad_year, Student.cgpa
+        ).join(Student, Student.id == Application.student_id
+        ).join(Job, Job.id == Application.job_id
+        ).filter(Job.hr_id == hr_id).all(),
+        columns=['student_id', 'status', 'match_percentage', 'branch', 'grad_year', 'cgpa']
+    )
+    # Subquery, not an id list: no bound-parameter limit
+    applicants = db.session.query(Application.student_id).join(
+        Job, Job.id == Application.job_id
+    ).filter(Job.hr_id == hr_id)
+    skills = pd.DataFrame(
+        db.session.query(StudentSkill.student_id, func.lower(StudentSkill.skill_name)).filter(
+            StudentSkill.student_id.in_(applicants)
+        ).distinct().all(),
+        columns=['student_id', 'skill']
+    )
+    return apps, skills
+
+def _num(value, digits=2):
+    """JSON-safe rounded float (NaN -> None)"""
+    return None if pd.isna(value) else round(float(value), digits)
+
+# ==================== METRICS ====================
+
+def _skill_correlations(matrix, shortlisted):
+    """
+    Phi coefficient of each skill column against shortlisting
+    matrix: students x skills 0/1 array; shortlisted: 0/1 vector
+    Returns: (phi, support) arrays, phi NaN where undefined
+    """
+    n = len(shortlisted)
+    support = matrix.sum(axis=0)
+    p_skill = support / n
+    p_short = shortlisted.mean()
+    joint = (matrix * shortlisted[:, None]).sum(axis=0) / n
+    with np.errstate(divide='ignore', invalid='ignore'):
+        phi = (joint - p_skill * p_short) / np.sqrt(p_skill * (1 - p_skill) * p_short * (1 - p_short))
+    return phi, support
+
+def _compute(apps, skills):
+    apps['shortlisted'] = apps['status'].isin(SHORTLISTED_STATUSES)
+    apps['selected'] = apps['status'].eq('Selected')
+
+    # One row per applicant
+    students = apps.groupby('student_id').agg(
+        branch=('branch', 'first'),
+        grad_year=('grad_year', 'first'),
+        cgpa=('cgpa', 'first'),
+        applications=('status', 'size'),
+        shortlisted=('shortlisted', 'any'),
+        selected=('selected', 'any')
+    )
+    students['cgpa_band'] = pd.cut(students['cgpa'].fillna(0), CGPA_BINS, labels=CGPA_LABELS, right=False)
+
+    # Applicant x skill indicator matrix, rows aligned with students
+    if len(skills):
+        matrix = pd.crosstab(skills['student_id'], skills['skill']).reindex(students.index, fill_value=0).clip(upper=1)
+    else:
+        matrix = pd.DataFrame(index=students.index)
+    skill_names = matrix.columns.to_numpy()
+    matrix_values = matrix.to_numpy(dtype=np.float64)
+
+    results = {}
+    for dimension in COHORT_DIMENSIONS:
+        summary = students.groupby(dimension).agg(
+            students=('applications', 'size'),
+            applications=('applications', 'sum'),
+            shortlist_rate=('shortlisted', 'mean'),
+            selection_rate=('selected', 'mean'),
+            avg_cgpa=('cgpa', 'mean')
+        )
+        avg_match_selected = apps[apps['selected']].groupby(dimension)['match_percentage'].mean()
+        by_band = students.groupby([dimension, 'cgpa_band'], observed=False)['selected'].agg(['size', 'mean'])
+
+        cohorts = []
+        for value, row in summary.iterrows():
+            positions = students.index.get_indexer(students.index[students[dimension] == value])
+            phi, support = _skill_correlations(matrix_values[positions], students['shortlisted'].to_numpy(dtype=np.float64)[positions])
+            ranked = [
+                i for i in np.argsort(-np.nan_to_num(phi, nan=-np.inf))
+                if support[i] >= MIN_SKILL_SUPPORT and phi[i] > 0
+            ][:TOP_SKILLS]
+
+            bands = by_band.loc[value]
+            cohorts.append({
+                dimension: value.item() if hasattr(value, 'item') else value,
+                'students': int(row['students']),
+                'applications': int(row['applications']),
+                'shortlist_rate': _num(row['shortlist_rate'] * 100),
+                'selection_rate': _num(row['selection_rate'] * 100),
+                'avg_cgpa': _num(row['avg_cgpa']),
+                'avg_match_selected': _num(avg_match_selected.get(value)),
+                'cgpa_distribution': [
+                    {
+                        'band': band,
+                        'students': int(counts['size']),
+                        'selection_rate': _num(counts['mean'] * 100)
+                    }
+                    for band, counts in bands.iterrows()
+                ],
+                'shortlisting_skills': [
+                    {'skill': str(skill_names[i]).title(), 'correlation': _num(phi[i], 3), 'applicants': int(support[i])}
+                    for i in ranked
+                ]
+            })
+        results[f'by_{dimension}'] = cohorts
+    return results
+
+def get_cohort_analytics(hr_id):
+    """
+    Cohort metrics per branch and per graduation year of hr_id's applicants
+    Returns: dict with by_branch and by_grad_year lists and computed_at
+    """
+    version = _data_version(hr_id)
+    cached = _cache.get(hr_id)
+    if cached and cached[0] == version and time.monotonic() - cached[1] < COHORT_CACHE_TTL:
+        return cached[2]
+
+    apps, skills = _load_frames(hr_id)
+    if apps.empty:
+        result = {f'by_{dimension}': [] for dimension in COHORT_DIMENSIONS}
+    else:
+        result = _compute(apps, skills)
+    result['computed_at'] = datetime.utcnow().isoformat()
+
+    # A write that lands while computing changes the version: the next call recomputes
+    _cache.put(hr_id, (version, time.monotonic(), result))
+    return result
@@ -21,6 +21,56 @@ class Config:
     UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc'}
+    RESUME_MAX_BYTES = int(os.environ.get('RESUME_MAX_BYTES', 10 * 1024 * 1024))  # checked while streaming
+    
+    # Periodic maintenance tasks (background.py) run only where enabled; a
+    # lock file per task keeps them to one process among several workers.
+    # python app.py enables them itself; flask CLI commands never need them
+    BACKGROUND_TASKS_ENABLED = os.environ.get('BACKGROUND_TASKS_ENABLED', '').lower() in ('1', 'true', 'yes')
+    
+    # Content-addressed resume store, swept for unreferenced blobs
+    RESUME_BLOB_DIR = os.environ.get('RESUME_BLOB_DIR', os.path.join(UPLOAD_FOLDER, 'resumes'))
+    BLOB_SWEEP_INTERVAL = int(os.environ.get('BLOB_SWEEP_INTERVAL', 3600))  # seconds, 0 disables
+    BLOB_ORPHAN_GRACE = int(os.environ.get('BLOB_ORPHAN_GRACE', 3600))  # min age before a blob is swept
+    
+    # Resume downloads: '' serves bytes from Python, 'x-sendfile' (Apache/lighttpd)
+    # or 'x-accel' (nginx internal location at RESUME_ACCEL_PREFIX) hands them to the proxy
+    RESUME_SENDFILE_MODE = os.environ.get('RESUME_SENDFILE_MODE', '')
+    RESUME_ACCEL_PREFIX = os.environ.get('RESUME_ACCEL_PREFIX', '/protected/resumes/')
+    USE_X_SENDFILE = RESUME_SENDFILE_MODE == 'x-sendfile'
+    
+    # Resume text extractor backends (see resume_parser.EXTRACTORS)
+    PDF_EXTRACTOR = os.environ.get('PDF_EXTRACTOR', 'pypdf2')
+    DOCX_EXTRACTOR = os.environ.get('DOCX_EXTRACTOR', 'docx-xml')
+    
+    # Bounds for the raw-bytes fallback used when a PDF can't be parsed
+    FALLBACK_MAX_CHARS = int(os.environ.get('FALLBACK_MAX_CHARS', 20000))
+    FALLBACK_MAX_SCAN_BYTES = int(os.environ.get('FALLBACK_MAX_SCAN_BYTES', 256 * 1024))
+    
+    # Background re-scoring after scoring rules or taxonomy change
+    RESCORE_INTERVAL = int(os.environ.get('RESCORE_INTERVAL', 600))  # seconds between checks, 0 disables
+    RESCORE_RATE = float(os.environ.get('RESCORE_RATE', 20))  # resumes per second
+    RESCORE_BATCH_SIZE = int(os.environ.get('RESCORE_BATCH_SIZE', 100))
+    RESCORE_STATE_PATH = os.environ.get('RESCORE_STATE_PATH', '')  # default: <instance folder>/rescore_state.json
+    
+    # Background near-duplicate detection (resume_dedup)
+    DEDUP_INTERVAL = int(os.environ.get('DEDUP_INTERVAL', 60))  # seconds, 0 disables
+    DEDUP_BATCH_SIZE = int(os.environ.get('DEDUP_BATCH_SIZE', 200))
+    
+    # Daily placement funnel rollup (funnel.run_funnel_rollup)
+    FUNNEL_ROLLUP_INTERVAL = int(os.environ.get('FUNNEL_ROLLUP_INTERVAL', 3600))  # seconds, 0 disables
+    
+    # Deactivate postings past their expiry date (expiry.expire_postings)
+    EXPIRY_SWEEP_INTERVAL = int(os.environ.get('EXPIRY_SWEEP_INTERVAL', 300))  # seconds, 0 disables
+    
+    # Read-only copy of the database for analytics and exports (analytics_snapshot.py)
+    # Empty disables it; only on-disk SQLite databases are snapshotted
+    ANALYTICS_SNAPSHOT_PATH = os.environ.get('ANALYTICS_SNAPSHOT_PATH', '')
+    ANALYTICS_SNAPSHOT_INTERVAL = int(os.environ.get('ANALYTICS_SNAPSHOT_INTERVAL', 60))  # seconds, 0 disables
+    ANALYTICS_MAX_STALENESS = int(os.environ.get('ANALYTICS_MAX_STALENESS', 300))  # older snapshots fall back to live reads
+    
+    # Rows per Parquet row group / Arrow record batch in placement exports
+    PLACEMENT_EXPORT_CHUNK_SIZE = int(os.environ.get('PLACEMENT_EXPORT_CHUNK_SIZE', 10000))
     
     # CORS Configuration
     CORS_ORIGINS = ['*']
@@ -45,6 +95,14 @@ class TestingConfig(Config):
     """Testing Configuration"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    
+    # No background tasks: tests run the jobs they cover directly
+    BLOB_SWEEP_INTERVAL = 0
+    RESCORE_INTERVAL = 0
+    DEDUP_INTERVAL = 0
+    FUNNEL_ROLLUP_INTERVAL = 0
+    EXPIRY_SWEEP_INTERVAL = 0
+    ANALYTICS_SNAPSHOT_PATH = ''
 
 # Configuration Dictionary
 config = {
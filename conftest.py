@@ -0,0 +1,77 @@
+"""
+Pytest fixtures - a testing app on an in-memory database and row factories
+Team Arena: Skill-Link Platform
+"""
+
+import os
+
+# app.py builds its module-level app on import: keep it on the testing config
+os.environ.setdefault('FLASK_CONFIG', 'testing')
+
+import itertools
+import pytest
+from app import create_app
+from flask_jwt_extended import create_access_token
+from models import db, HR, Student, Job, StudentSkill, JobSkill
+
+# Manual smoke script against a running server, not a pytest module
+collect_ignore = ['test_api.py']
+
+_ids = itertools.count(1)
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def make_hr(app):
+    def make(**fields):
+        n = next(_ids)
+        hr = HR(company_name=f'Company {n}', hr_name=f'HR {n}', email=f'hr{n}@test.com', password='x', **fields)
+        db.session.add(hr)
+        db.session.commit()
+        return hr
+    return make
+
+@pytest.fixture
+def make_student(app):
+    def make(branch='CSE', grad_year=2025, skills=(), **fields):
+        n = next(_ids)
+        fields.setdefault('name', f'Student {n}')
+        student = Student(email=f'student{n}@test.com', password='x',
+                          branch=branch, grad_year=grad_year, **fields)
+        db.session.add(student)
+        db.session.flush()
+        for skill in skills:
+            db.session.add(StudentSkill(student_id=student.id, skill_name=skill))
+        db.session.commit()
+        return student
+    return make
+
+@pytest.fixture
+def make_job(app):
+    def make(hr, skills=(), **fields):
+        fields.setdefault('title', 'Engineer')
+        fields.setdefault('description', 'Build things')
+        fields.setdefault('branch', 'CSE')
+        job = Job(hr_id=hr.id, **fields)
+        db.session.add(job)
+        db.session.flush()
+        for skill in skills:
+            db.session.add(JobSkill(job_id=job.id, skill_name=skill))
+        db.session.commit()
+        return job
+    return make
+
+@pytest.fixture
+def auth_headers(app):
+    """Bearer headers for a user row, as issued at login"""
+    def headers(user, role):
+        token = create_access_token(identity=user.email, additional_claims={'role': role, 'user_id': user.id})
+        return {'Authorization': f'Bearer {token}'}
+    return headers
@@ -4,7 +4,7 @@ This script populates the database with realistic demo data for judges
 """
 
 from app import create_app
-from models import db, HR, Student, Job, JobSkill, Resume, Application, StudentSkill, SavedJob, Internship, InternshipSkill, InternshipApplication, BusinessJob, SkillTest, SKILL_DEMAND
+from models import db, HR, Student, Job, JobSkill, Resume, Application, StudentSkill, SavedJob, Internship, InternshipSkill, InternshipApplication, BusinessJob, SkillTest
 from datetime import datetime, timedelta
 import random
 
@@ -0,0 +1,51 @@
+"""
+Posting Expiry - deactivate jobs, internships and business jobs past their expiry date
+One bulk UPDATE per table, backed by the (is_active, expiry_date) indexes
+Team Arena: Skill-Link Platform
+"""
+
+from models import db, Job, Internship, BusinessJob
+from sqlalchemy import update
+from blinker import Namespace
+from datetime import datetime
+
+EXPIRING_MODELS = (Job, Internship, BusinessJob)
+
+_signals = Namespace()
+
+# Sent once per table that had postings expire: sender is the table name,
+# ids the expired rows (None when the database can't report them).
+# Anything caching listings should connect to this and drop its entries.
+postings_expired = _signals.signal('postings-expired')
+
+def expire_postings(now=None):
+    """
+    Mark every active posting whose expiry_date has passed as inactive
+    Returns: dict of table name -> number of postings expired
+    """
+    now = now or datetime.utcnow()
+    returning = db.engine.dialect.update_returning
+
+    expired = {}
+    for model in EXPIRING_MODELS:
+        statement = update(model).where(
+            model.is_active == True,
+            model.expiry_date < now
+        ).values(is_active=False).execution_options(synchronize_session=False)
+
+        if returning:
+            ids = db.session.execute(statement.returning(model.id)).scalars().all()
+            count = len(ids)
+        else:
+            ids = None
+            count = db.session.execute(statement).rowcount
+        expired[model.__tablename__] = (count, ids)
+
+    db.session.commit()
+
+    # Only announce once the change is visible to other sessions
+    for table, (count, ids) in expired.items():
+        if count:
+            postings_expired.send(table, ids=ids, count=count)
+
+    return {table: count for table, (count, ids) in expired.items()}
@@ -3,6 +3,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from models import db, Student, StudentSkill, Job, JobSkill, Application, Resume
 from utils.auth import student_required, hr_required
 from utils.ai_engine import get_missing_skills, get_learning_paths_for_missing_skills
+from utils.analytics_snapshot import analytics_reads
 import json
 import random
 
@@ -314,8 +315,10 @@ def get_mock_test_skills():
 @feature_bp.route('/analytics/skill-demand', methods=['GET'])
 def get_skill_demand():
     """Get skill demand analytics from all job postings"""
-    # Get all job skills
-    job_skills = JobSkill.query.all()
+    with analytics_reads() as freshness:
+        # Get all job skills
+        job_skills = JobSkill.query.all()
+        total_jobs = Job.query.count()
     
     # Count skill occurrences
     skill_counts = {}
@@ -352,9 +355,6 @@ def get_skill_demand():
         else:
             low_demand.append(skill_data)
     
-    # Get total jobs
-    total_jobs = Job.query.count()
-    
     return jsonify({
         'success': True,
         'total_jobs': total_jobs,
@@ -362,7 +362,8 @@ def get_skill_demand():
         'high_demand_skills': high_demand[:15],
         'medium_demand_skills': medium_demand[:10],
         'low_demand_skills': low_demand[:10],
-        'all_skills': [{'skill': s[0].title(), 'count': s[1]} for s in sorted_skills[:30]]
+        'all_skills': [{'skill': s[0].title(), 'count': s[1]} for s in sorted_skills[:30]],
+        'data_freshness': freshness
     })
 
 @feature_bp.route('/analytics/skill-demand/hr', methods=['GET'])
@@ -372,9 +373,13 @@ def get_skill_demand_for_hr():
     claims = get_jwt()
     hr_id = claims.get('user_id')
     
-    # Get HR's jobs
-    hr_jobs = Job.query.filter_by(hr_id=hr_id).all()
-    job_ids = [j.id for j in hr_jobs]
+    with analytics_reads() as freshness:
+        # Get HR's jobs
+        hr_jobs = Job.query.filter_by(hr_id=hr_id).all()
+        job_ids = [j.id for j in hr_jobs]
+        
+        # Get skills for HR's jobs only
+        job_skills = JobSkill.query.filter(JobSkill.job_id.in_(job_ids)).all() if job_ids else []
     
     if not job_ids:
         return jsonify({
@@ -383,12 +388,10 @@ def get_skill_demand_for_hr():
             'total_jobs': 0,
             'high_demand_skills': [],
             'medium_demand_skills': [],
-            'low_demand_skills': []
+            'low_demand_skills': [],
+            'data_freshness': freshness
         })
     
-    # Get skills for HR's jobs only
-    job_skills = JobSkill.query.filter(JobSkill.job_id.in_(job_ids)).all()
-    
     skill_counts = {}
     for js in job_skills:
         skill = js.skill_name.lower()
@@ -408,5 +411,6 @@ def get_skill_demand_for_hr():
         'total_jobs': len(hr_jobs),
         'high_demand_skills': high_demand,
         'medium_demand_skills': medium_demand,
-        'low_demand_skills': low_demand
+        'low_demand_skills': low_demand,
+        'data_freshness': freshness
     })
@@ -0,0 +1,210 @@
+"""
+Funnel Analytics - daily/weekly placement funnel time series
+A rollup job folds application_status_events into funnel_buckets one day at
+a time, per HR; range queries read one HR's buckets only
+Team Arena: Skill-Link Platform
+"""
+
+from models import db, Job, Student, Application, ApplicationStatusEvent, FunnelBucket
+from sqlalchemy import func
+from datetime import date, datetime, timedelta
+
+# Status -> bucket column
+FUNNEL_METRICS = {
+    'Applied': 'applications',
+    'Shortlisted': 'shortlisted',
+    'Interview': 'interviews',
+    'Selected': 'selected',
+    'Rejected': 'rejected'
+}
+
+DIMENSIONS = ('all', 'branch', 'grad_year')
+
+# Longest range one query may cover, in periods
+MAX_PERIODS = {'day': 93, 'week': 106}
+
+def week_start(day):
+    """Monday of the ISO week containing day"""
+    return day - timedelta(days=day.weekday())
+
+def _to_date(value):
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+def _empty_counts():
+    return dict.fromkeys(FUNNEL_METRICS.values(), 0)
+
+def _daily_counts(start, end):
+    """
+    Aggregate events in [start, end] in one grouped query
+    Returns: dict of (day, hr_id, dimension, value) -> metric counts
+    """
+    day = func.date(ApplicationStatusEvent.created_at)
+    rows = db.session.query(
+        day, Job.hr_id, Student.branch, Student.grad_year, ApplicationStatusEvent.status,
+        func.count(ApplicationStatusEvent.id)
+    ).join(Job, Job.id == ApplicationStatusEvent.job_id
+    ).join(Student, Student.id == ApplicationStatusEvent.student_id
+    ).filter(
+        ApplicationStatusEvent.created_at >= datetime.combine(start, datetime.min.time()),
+        ApplicationStatusEvent.created_at < datetime.combine(end + timedelta(days=1), datetime.min.time())
+    ).group_by(day, Job.hr_id, Student.branch, Student.grad_year, ApplicationStatusEvent.status).all()
+
+    counts = {}
+    for day_value, hr_id, branch, grad_year, status, count in rows:
+        metric = FUNNEL_METRICS.get(status)
+        if not metric:
+            continue
+        day_value = _to_date(day_value)
+        for dimension, value in (('all', ''), ('branch', branch), ('grad_year', grad_year)):
+            key = (day_value, hr_id, dimension, str(value if value is not None else ''))
+            counts.setdefault(key, _empty_counts())[metric] += count
+    return counts
+
+def _replace_buckets(granularity, start, end, counts):
+    """Swap the buckets of [start, end] for freshly computed ones"""
+    FunnelBucket.query.filter(
+        FunnelBucket.granularity == granularity,
+        FunnelBucket.period_start >= start,
+        FunnelBucket.period_start <= end
+    ).delete(synchronize_session=False)
+
+    for (period_start, hr_id, dimension, value), metrics in counts.items():
+        db.session.add(FunnelBucket(granularity=granularity, period_start=period_start, hr_id=hr_id,
+                                    dimension=dimension, value=value, **metrics))
+
+def last_rolled_up_day():
+    """Latest rolled-up day (every rolled-up day has a marker row with no hr_id)"""
+    return db.session.query(func.max(FunnelBucket.period_start)).filter(
+        FunnelBucket.granularity == 'day', FunnelBucket.hr_id.is_(None)
+    ).scalar()
+
+def run_funnel_rollup(today=None):
+    """
+    Roll events up into day and week buckets, incrementally
+    Starts at the last rolled-up day (it may have been partial) and runs
+    through today; events are stamped when they happen, so finished days
+    never change afterwards
+    Returns: number of days rolled up
+    """
+    today = today or datetime.utcnow().date()
+    start = last_rolled_up_day()
+    if start is None:
+        first = db.session.query(func.min(ApplicationStatusEvent.created_at)).scalar()
+        if first is None:
+            return 0
+        start = first.date()
+    start = _to_date(start)
+
+    daily = _daily_counts(start, today)
+    days = [start + timedelta(days=i) for i in range((today - start).days + 1)]
+    for day in days:
+        # Marker row so quiet days count as rolled up; never served
+        daily.setdefault((day, None, 'all', ''), _empty_counts())
+    _replace_buckets('day', start, today, daily)
+    db.session.flush()
+
+    # Weeks touched by this run, summed from their day buckets
+    first_week = week_start(start)
+    week_rows = db.session.query(
+        FunnelBucket.period_start, FunnelBucket.hr_id, FunnelBucket.dimension, FunnelBucket.value,
+        *[func.sum(getattr(FunnelBucket, metric)) for metric in FUNNEL_METRICS.values()]
+    ).filter(
+        FunnelBucket.granularity == 'day',
+        FunnelBucket.period_start >= first_week,
+        FunnelBucket.period_start <= today
+    ).group_by(FunnelBucket.period_start, FunnelBucket.hr_id, FunnelBucket.dimension, FunnelBucket.value).all()
+
+    weekly = {}
+    for period_start, hr_id, dimension, value, *metrics in week_rows:
+        key = (week_start(_to_date(period_start)), hr_id, dimension, value)
+        bucket = weekly.setdefault(key, _empty_counts())
+        for metric, count in zip(FUNNEL_METRICS.values(), metrics):
+            bucket[metric] += int(count or 0)
+    _replace_buckets('week', first_week, today, weekly)
+
+    db.session.commit()
+    return len(days)
+
+def backfill_status_events():
+    """
+    Seed the event log from applications that predate it: each one counts
+    as applied on applied_at, and its current status is dated the same day
+    Returns: number of events written
+    """
+    if ApplicationStatusEvent.query.first():
+        return 0
+
+    written = 0
+    for application in Application.query.yield_per(500):
+        applied_at = application.applied_at or datetime.utcnow()
+        statuses = ['Applied']
+        if application.status and application.status != 'Applied':
+            statuses.append(application.status)
+        for status in statuses:
+            db.session.add(ApplicationStatusEvent(
+                application_id=application.id, job_id=application.job_id,
+                student_id=application.student_id, status=status, created_at=applied_at
+            ))
+            written += 1
+
+    FunnelBucket.query.delete()
+    db.session.commit()
+    return written
+
+def get_funnel_series(hr_id, start, end, granularity='day', dimension='all', value=None):
+    """
+    Funnel buckets of one HR's jobs for a date range
+    Reads at most MAX_PERIODS[granularity] periods times the dimension's values
+    Returns: dict with the series, or raises ValueError for a bad range
+    """
+    if granularity not in MAX_PERIODS:
+        raise ValueError("granularity must be 'day' or 'week'")
+    if dimension not in DIMENSIONS:
+        raise ValueError(f"group_by must be one of: {', '.join(DIMENSIONS)}")
+    if end < start:
+        raise ValueError('end must not be before start')
+
+    if granularity == 'week':
+        start = week_start(start)
+        periods = (end - start).days // 7 + 1
+    else:
+        periods = (end - start).days + 1
+    if periods > MAX_PERIODS[granularity]:
+        raise ValueError(f"Range too long for {granularity} buckets (max {MAX_PERIODS[granularity]}); use a coarser granularity")
+
+    query = FunnelBucket.query.filter(
+        FunnelBucket.hr_id == hr_id,
+        FunnelBucket.granularity == granularity,
+        FunnelBucket.dimension == dimension,
+        FunnelBucket.period_start >= start,
+        FunnelBucket.period_start <= end
+    )
+    if value is not None and dimension != 'all':
+        query = query.filter(FunnelBucket.value == str(value))
+
+    buckets = query.order_by(FunnelBucket.period_start, FunnelBucket.value).all()
+    rolled_up = last_rolled_up_day()
+    series = [bucket.to_dict() for bucket in buckets]
+
+    if dimension == 'all' and rolled_up:
+        # Quiet periods have no rows: show them as zeros up to the rollup
+        step = timedelta(days=7 if granularity == 'week' else 1)
+        seen = {row['period'] for row in series}
+        period = start
+        while period <= min(end, _to_date(rolled_up)):
+            if period.isoformat() not in seen:
+                series.append({'period': period.isoformat(), 'value': '', **_empty_counts()})
+            period += step
+        series.sort(key=lambda row: row['period'])
+
+    return {
+        'granularity': granularity,
+        'group_by': dimension,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'series': series,
+        'rows_read': len(buckets),
+        'rolled_up_through': _to_date(rolled_up).isoformat() if rolled_up else None
+    }
@@ -1,12 +1,18 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context, current_app
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, get_jwt
 from models import db, HR, Job, JobSkill, Application, Student, Resume, HRNote, InterviewEmail
 from utils.auth import hr_required, validate_email, validate_password
 from utils.ai_engine import get_recommended_students, calculate_ai_match_score, bulk_shortlist_top_students
-from utils.analytics import get_hr_analytics
-from datetime import datetime
-import csv
-import io
+from utils.analytics import get_hr_analytics, stream_applicants_csv
+from utils.funnel import get_funnel_series
+from utils.cohort_analytics import get_cohort_analytics
+from utils.analytics_snapshot import analytics_reads, stream_from_snapshot
+from utils.zip_stream import stream_zip
+from utils.placement_export import stream_placement_export, EXPORT_FORMATS, PYARROW_AVAILABLE
+from utils.resume_dedup import get_duplicate_clusters, pending_dedup_count, DUPLICATE_THRESHOLD
+from werkzeug.utils import secure_filename
+from datetime import datetime, timedelta
+import os
 
 hr_bp = Blueprint('hr', __name__)
 
@@ -489,18 +495,86 @@ def get_analytics():
     claims = get_jwt()
     hr_id = claims.get('user_id')
     
-    analytics = get_hr_analytics(hr_id)
+    with analytics_reads() as freshness:
+        analytics = get_hr_analytics(hr_id)
     
+    analytics['data_freshness'] = freshness
     return jsonify(analytics)
 
+@hr_bp.route('/analytics/funnel', methods=['GET'])
+@hr_required
+def get_funnel_analytics():
+    """
+    Placement funnel trend of this HR's jobs from the daily rollup
+    Query: start, end (YYYY-MM-DD, default last 30 days), granularity (day|week),
+    group_by (all|branch|grad_year), value (one branch/year)
+    """
+    claims = get_jwt()
+    hr_id = claims.get('user_id')
+    
+    try:
+        end = datetime.strptime(request.args['end'], '%Y-%m-%d').date() if request.args.get('end') else datetime.utcnow().date()
+        start = datetime.strptime(request.args['start'], '%Y-%m-%d').date() if request.args.get('start') else end - timedelta(days=29)
+    except ValueError:
+        return jsonify({'error': 'Dates must be YYYY-MM-DD'}), 400
+    
+    try:
+        with analytics_reads() as freshness:
+            result = get_funnel_series(
+                hr_id, start, end,
+                granularity=request.args.get('granularity', 'day'),
+                dimension=request.args.get('group_by', 'all'),
+                value=request.args.get('value')
+            )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    result['data_freshness'] = freshness
+    return jsonify(result)
+
+@hr_bp.route('/analytics/cohorts', methods=['GET'])
+@hr_required
+def get_cohort_analytics_route():
+    """
+    Placement statistics of this HR's applicants per branch and graduation
+    year: CGPA bands vs selection rate, skills most correlated with
+    shortlisting, average match of selected candidates
+    """
+    claims = get_jwt()
+    hr_id = claims.get('user_id')
+    
+    with analytics_reads() as freshness:
+        result = get_cohort_analytics(hr_id)
+    
+    return jsonify({**result, 'data_freshness': freshness})
+
+# ==================== DUPLICATE REVIEW ====================
+
+@hr_bp.route('/duplicates', methods=['GET'])
+@hr_required
+def get_duplicate_resumes():
+    """Clusters of near-duplicate resumes among this HR's applicants (?min_similarity= percent)"""
+    claims = get_jwt()
+    
+    try:
+        min_similarity = float(request.args.get('min_similarity', DUPLICATE_THRESHOLD * 100)) / 100
+    except ValueError:
+        return jsonify({'error': 'min_similarity must be a number'}), 400
+    
+    clusters = get_duplicate_clusters(max(min_similarity, DUPLICATE_THRESHOLD), hr_id=claims.get('user_id'))
+    
+    return jsonify({
+        'clusters': clusters,
+        'total_clusters': len(clusters),
+        'pending_checks': pending_dedup_count()
+    })
+
 # ==================== EXPORT ====================
 
 @hr_bp.route('/jobs/<int:job_id>/export', methods=['GET'])
 @hr_required
 def export_applicants(job_id):
-    """Export applicants as CSV"""
-    from utils.analytics import export_applicants_csv
-    
+    """Stream applicants as a CSV download"""
     job = Job.query.get(job_id)
     
     if not job:
@@ -511,21 +585,89 @@ def export_applicants(job_id):
     if job.hr_id != claims.get('user_id'):
         return jsonify({'error': 'Unauthorized'}), 403
     
-    rows, job_title = export_applicants_csv(job_id)
+    filename = secure_filename(f"{job.title}_applicants.csv") or 'applicants.csv'
+    # The generator queries as it goes, so it needs the app context kept open
+    chunks = stream_from_snapshot(stream_applicants_csv, job_id)
+    freshness = next(chunks)
+    return Response(
+        stream_with_context(chunks),
+        mimetype='text/csv',
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            'X-Data-As-Of': freshness['as_of']
+        }
+    )
+
+@hr_bp.route('/export/placements', methods=['GET'])
+@hr_required
+def export_placements():
+    """
+    Download applications to this HR's jobs, joined with student, job and
+    skill data, as a Parquet (default) or Arrow IPC file
+    """
+    if not PYARROW_AVAILABLE:
+        return jsonify({'error': 'Columnar export is not available (pyarrow not installed)'}), 501
+    
+    fmt = request.args.get('format', 'parquet')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
     
-    # Create CSV
-    output = io.StringIO()
-    if rows:
-        writer = csv.DictWriter(output, fieldnames=rows[0].keys())
-        writer.writeheader()
-        writer.writerows(rows)
+    claims = get_jwt()
+    mimetype, ext = EXPORT_FORMATS[fmt]
+    chunk_size = current_app.config.get('PLACEMENT_EXPORT_CHUNK_SIZE', 10000)
+    chunks = stream_from_snapshot(stream_placement_export, fmt, chunk_size, hr_id=claims.get('user_id'))
+    freshness = next(chunks)
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={
+            'Content-Disposition': f'attachment; filename="placements.{ext}"',
+            'X-Data-As-Of': freshness['as_of']
+        }
+    )
+
+@hr_bp.route('/jobs/<int:job_id>/resumes.zip', methods=['GET'])
+@hr_required
+def download_job_resumes(job_id):
+    """Stream a ZIP of every applicant's resume (optional ?status= filter)"""
+    job = Job.query.get(job_id)
     
-    csv_content = output.getvalue()
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
     
-    return jsonify({
-        'csv': csv_content,
-        'filename': f'{job_title}_applicants.csv'
-    })
+    # Verify ownership
+    claims = get_jwt()
+    if job.hr_id != claims.get('user_id'):
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    query = db.session.query(
+        Student.id, Student.name, Application.match_percentage, Resume.filename, Resume.file_path
+    ).join(Application, Application.student_id == Student.id
+    ).join(Resume, Resume.student_id == Student.id
+    ).filter(Application.job_id == job_id)
+    
+    status = request.args.get('status')
+    if status:
+        query = query.filter(Application.status == status)
+    
+    # Best matches first; names carry the match so the archive sorts the same way
+    entries = []
+    for student_id, name, match, filename, file_path in query.order_by(Application.match_percentage.desc()):
+        if not os.path.exists(file_path):
+            continue
+        ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else 'pdf'
+        student_name = secure_filename(name) or 'student'
+        entries.append((f"{round(match or 0):03d}pct_{student_name}_{student_id}.{ext}", file_path))
+    
+    if not entries:
+        return jsonify({'error': 'No resumes found for this job'}), 404
+    
+    archive_name = secure_filename(f"{job.title}_resumes.zip") or 'resumes.zip'
+    return Response(
+        stream_zip(entries),
+        mimetype='application/zip',
+        headers={'Content-Disposition': f'attachment; filename="{archive_name}"'}
+    )
 
 @hr_bp.route('/profile', methods=['GET'])
 @hr_required
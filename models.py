@@ -1,6 +1,9 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 import bcrypt
+import zlib
 
 db = SQLAlchemy()
 
@@ -82,7 +85,7 @@ class Job(db.Model):
     __tablename__ = 'jobs'
     
     id = db.Column(db.Integer, primary_key=True)
-    hr_id = db.Column(db.Integer, db.ForeignKey('hr.id'), nullable=False)
+    hr_id = db.Column(db.Integer, db.ForeignKey('hr.id'), nullable=False, index=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
     min_cgpa = db.Column(db.Float, default=0.0)
@@ -92,6 +95,9 @@ class Job(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
     
+    # Expiry sweep (expiry.expire_postings)
+    __table_args__ = (db.Index('ix_jobs_active_expiry', 'is_active', 'expiry_date'),)
+    
     # Relationships
     skills = db.relationship('JobSkill', backref='job', lazy=True, cascade='all, delete-orphan')
     applications = db.relationship('Application', backref='job', lazy=True, cascade='all, delete-orphan')
@@ -141,6 +147,7 @@ class Resume(db.Model):
     student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
     filename = db.Column(db.String(255), nullable=False)
     file_path = db.Column(db.String(500), nullable=False)
+    content_hash = db.Column(db.String(64), nullable=True, index=True)  # sha256 of the blob (blob_store)
     score = db.Column(db.Integer, default=0)
     skills = db.Column(db.Text, nullable=True)
     education = db.Column(db.Text, nullable=True)
@@ -148,6 +155,25 @@ class Resume(db.Model):
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_duplicate = db.Column(db.Boolean, default=False)
     duplicate_of = db.Column(db.Integer, nullable=True)
+    text_compressed = db.Column(db.LargeBinary, nullable=True)
+    version = db.Column(db.Integer, default=1)
+    score_model = db.Column(db.String(40), nullable=True, index=True)  # scoring model that produced score
+    fingerprint = db.Column(db.LargeBinary, nullable=True)  # MinHash of the text (resume_dedup)
+    dedup_version = db.Column(db.Integer, nullable=True)  # version the fingerprint was computed for
+    
+    # Relationships
+    scores = db.relationship('ResumeScore', backref='resume', lazy=True, cascade='all, delete-orphan')
+    
+    def set_text(self, text):
+        """Store extracted text compressed and bump the resume version"""
+        self.text_compressed = zlib.compress((text or '').encode('utf-8'))
+        self.version = (self.version or 0) + 1
+    
+    def get_text(self):
+        """Return the stored extracted text ('' for resumes uploaded before it was kept)"""
+        if not self.text_compressed:
+            return ''
+        return zlib.decompress(self.text_compressed).decode('utf-8')
     
     def to_dict(self):
         import json
@@ -163,6 +189,43 @@ class Resume(db.Model):
             'is_duplicate': self.is_duplicate
         }
 
+class ResumeScore(db.Model):
+    """Memoized resume score per (resume, job); job_id 0 is the general score"""
+    __tablename__ = 'resume_scores'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    resume_id = db.Column(db.Integer, db.ForeignKey('resumes.id'), nullable=False)
+    job_id = db.Column(db.Integer, nullable=False, default=0)
+    resume_version = db.Column(db.Integer, nullable=False)
+    job_skills_key = db.Column(db.String(40), nullable=False, default='')
+    model_version = db.Column(db.String(40), nullable=False)
+    score = db.Column(db.Integer, default=0)
+    components = db.Column(db.Text, nullable=True)
+    suggestions = db.Column(db.Text, nullable=True)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (db.UniqueConstraint('resume_id', 'job_id', name='unique_resume_score'),)
+
+class ResumeSimilarity(db.Model):
+    """Near-duplicate resume pair (edge of the similarity graph); resume_a_id < resume_b_id"""
+    __tablename__ = 'resume_similarities'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    resume_a_id = db.Column(db.Integer, db.ForeignKey('resumes.id'), nullable=False, index=True)
+    resume_b_id = db.Column(db.Integer, db.ForeignKey('resumes.id'), nullable=False, index=True)
+    similarity = db.Column(db.Float, nullable=False)
+    detected_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (db.UniqueConstraint('resume_a_id', 'resume_b_id', name='unique_resume_pair'),)
+
+class ResumeLSHBand(db.Model):
+    """LSH band bucket of a checked resume's fingerprint; resumes sharing a band_key are candidates"""
+    __tablename__ = 'resume_lsh_bands'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    resume_id = db.Column(db.Integer, db.ForeignKey('resumes.id'), nullable=False, index=True)
+    band_key = db.Column(db.BigInteger, nullable=False, index=True)  # hash of (band number, band values)
+
 class Application(db.Model):
     """Application Model - Tracks job applications"""
     __tablename__ = 'applications'
@@ -176,7 +239,11 @@ class Application(db.Model):
     match_percentage = db.Column(db.Float, default=0.0)
     hr_notes = db.Column(db.Text, nullable=True)
     
-    __table_args__ = (db.UniqueConstraint('student_id', 'job_id', name='unique_application'),)
+    __table_args__ = (
+        db.UniqueConstraint('student_id', 'job_id', name='unique_application'),
+        # Applicants of a job (the unique constraint covers a student's applications)
+        db.Index('ix_applications_job_student', 'job_id', 'student_id'),
+    )
     
     def to_dict(self, include_student=False, include_job=False):
         data = {
@@ -268,6 +335,8 @@ class Internship(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
     
+    __table_args__ = (db.Index('ix_internships_active_expiry', 'is_active', 'expiry_date'),)
+    
     # Relationships
     skills = db.relationship('InternshipSkill', backref='internship', lazy=True, cascade='all, delete-orphan')
     applications = db.relationship('InternshipApplication', backref='internship', lazy=True, cascade='all, delete-orphan')
@@ -351,6 +420,8 @@ class BusinessJob(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
     
+    __table_args__ = (db.Index('ix_business_jobs_active_expiry', 'is_active', 'expiry_date'),)
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -394,8 +465,193 @@ class SkillTest(db.Model):
             'difficulty': self.difficulty
         }
 
-# Skill demand data
-SKILL_DEMAND = {
-    'high_demand': ['Python', 'Java', 'JavaScript', 'React', 'SQL', 'AWS', 'Machine Learning', 'Data Analysis', 'Node.js', 'Docker', 'Git', 'C++', 'Angular', 'MongoDB', 'TypeScript', 'Kubernetes', 'Flutter', 'Go', 'Rust', 'TensorFlow'],
-    'low_demand': ['Perl', 'Ruby', 'Scala', 'Haskell', 'Erlang', 'COBOL', 'Fortran', 'Pascal', 'Assembly', 'VB.NET', 'Objective-C', 'Shell Scripting', 'Lua', 'MATLAB', 'R Programming', 'SPSS', 'SAS']
+# ==================== FUNNEL COUNTERS ====================
+
+class ApplicationStatusCount(db.Model):
+    """
+    Rollup of applications per (scope, owner, status)
+    Scopes: 'job' and 'student' count Application rows by job_id and
+    student_id; 'internship' and 'intern_student' do the same for
+    InternshipApplication. Kept current by _update_status_counts
+    """
+    __tablename__ = 'application_status_counts'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    scope = db.Column(db.String(20), nullable=False)
+    owner_id = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(50), nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    
+    __table_args__ = (db.UniqueConstraint('scope', 'owner_id', 'status', name='unique_status_count'),)
+
+# (model, [(scope, owner attribute)]) for every counted application table
+COUNTED_APPLICATIONS = {
+    Application: (('job', 'job_id'), ('student', 'student_id')),
+    InternshipApplication: (('internship', 'internship_id'), ('intern_student', 'student_id'))
 }
+
+def _keep_previous_status(target, value, oldvalue, initiator):
+    """No-op; registered with active_history so an expired status is loaded before it is overwritten"""
+
+for _model in COUNTED_APPLICATIONS:
+    event.listen(_model.status, 'set', _keep_previous_status, active_history=True)
+
+def _status_before(obj):
+    """Status as last loaded from the database"""
+    history = inspect(obj).attrs.status.history
+    if history.deleted:
+        return history.deleted[0]
+    return history.unchanged[0] if history.unchanged else obj.status
+
+def _update_status_counts(session, flush_context):
+    """
+    Apply this flush's application inserts, deletes and status changes to
+    application_status_counts on the same connection, so the counters
+    commit or roll back together with the change
+    """
+    deltas = {}
+
+    def add(obj, status, delta):
+        for scope, attr in COUNTED_APPLICATIONS[type(obj)]:
+            key = (scope, getattr(obj, attr), status or 'Applied')
+            deltas[key] = deltas.get(key, 0) + delta
+
+    for obj in session.new:
+        if type(obj) in COUNTED_APPLICATIONS:
+            add(obj, obj.status, 1)
+    for obj in session.deleted:
+        if type(obj) in COUNTED_APPLICATIONS:
+            add(obj, _status_before(obj), -1)
+    for obj in session.dirty:
+        if type(obj) in COUNTED_APPLICATIONS and inspect(obj).attrs.status.history.has_changes():
+            before = _status_before(obj)
+            if before != obj.status:
+                add(obj, before, -1)
+                add(obj, obj.status, 1)
+
+    connection = session.connection()
+    # Sorted, so concurrent flushes lock counter rows in the same order
+    changes = sorted((key, delta) for key, delta in deltas.items() if delta)
+    _increment_status_counts(connection, [
+        {'scope': scope, 'owner_id': owner_id, 'status': status, 'count': delta}
+        for (scope, owner_id, status), delta in changes if delta > 0
+    ])
+    # A decrement always has a counter row to apply to (or nothing to undo)
+    table = ApplicationStatusCount.__table__
+    for (scope, owner_id, status), delta in changes:
+        if delta < 0:
+            match = (table.c.scope == scope) & (table.c.owner_id == owner_id) & (table.c.status == status)
+            connection.execute(table.update().where(match).values(count=table.c.count + delta))
+
+def _increment_status_counts(connection, rows):
+    """
+    Add rows' counts to application_status_counts with INSERT ... ON CONFLICT
+    (scope, owner_id, status) DO UPDATE, so two transactions creating the
+    same first counter can't collide and roll back an application
+    Other dialects update first and insert inside a savepoint
+    """
+    if not rows:
+        return
+    table = ApplicationStatusCount.__table__
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        insert = None
+
+    if insert is not None:
+        statement = insert(table).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=['scope', 'owner_id', 'status'],
+            set_={'count': table.c.count + statement.excluded['count']}
+        )
+        connection.execute(statement)
+        return
+
+    for row in rows:
+        match = (table.c.scope == row['scope']) & (table.c.owner_id == row['owner_id']) & (table.c.status == row['status'])
+        increment = table.update().where(match).values(count=table.c.count + row['count'])
+        if connection.execute(increment).rowcount:
+            continue
+        try:
+            with connection.begin_nested():
+                connection.execute(table.insert().values(row))
+        except IntegrityError:
+            # Another transaction inserted it first
+            connection.execute(increment)
+
+event.listen(db.session, 'after_flush', _update_status_counts)
+
+# ==================== FUNNEL TIME SERIES ====================
+
+class ApplicationStatusEvent(db.Model):
+    """Append-only log of job application status transitions (source of funnel_buckets)"""
+    __tablename__ = 'application_status_events'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    application_id = db.Column(db.Integer, nullable=False)
+    job_id = db.Column(db.Integer, nullable=False)
+    student_id = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(50), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+class FunnelBucket(db.Model):
+    """
+    Funnel counts for one day or ISO week of one HR's jobs, per dimension value
+    dimension is 'all' (value ''), 'branch' or 'grad_year'
+    """
+    __tablename__ = 'funnel_buckets'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    hr_id = db.Column(db.Integer, nullable=True)  # NULL only on the per-day rollup marker
+    granularity = db.Column(db.String(10), nullable=False)  # 'day' or 'week'
+    period_start = db.Column(db.Date, nullable=False)
+    dimension = db.Column(db.String(20), nullable=False)
+    value = db.Column(db.String(200), nullable=False, default='')
+    applications = db.Column(db.Integer, default=0)
+    shortlisted = db.Column(db.Integer, default=0)
+    interviews = db.Column(db.Integer, default=0)
+    selected = db.Column(db.Integer, default=0)
+    rejected = db.Column(db.Integer, default=0)
+    
+    __table_args__ = (
+        db.UniqueConstraint('granularity', 'period_start', 'hr_id', 'dimension', 'value', name='unique_funnel_bucket'),
+        db.Index('ix_funnel_bucket_range', 'hr_id', 'granularity', 'dimension', 'period_start'),
+    )
+    
+    def to_dict(self):
+        return {
+            'period': self.period_start.isoformat(),
+            'value': self.value,
+            'applications': self.applications,
+            'shortlisted': self.shortlisted,
+            'interviews': self.interviews,
+            'selected': self.selected,
+            'rejected': self.rejected
+        }
+
+def _record_status_events(session, flush_context):
+    """Log new job applications and their status changes in the same transaction"""
+    events = []
+    now = datetime.utcnow()
+    for obj in session.new:
+        if isinstance(obj, Application):
+            # Every application enters the funnel as Applied, even if created shortlisted
+            events.append((obj, 'Applied', obj.applied_at or now))
+            if obj.status and obj.status != 'Applied':
+                events.append((obj, obj.status, obj.applied_at or now))
+    for obj in session.dirty:
+        if isinstance(obj, Application) and obj not in session.deleted:
+            if inspect(obj).attrs.status.history.has_changes() and _status_before(obj) != obj.status:
+                events.append((obj, obj.status or 'Applied', now))
+
+    if events:
+        session.connection().execute(ApplicationStatusEvent.__table__.insert(), [
+            {'application_id': obj.id, 'job_id': obj.job_id, 'student_id': obj.student_id,
+             'status': status, 'created_at': created_at}
+            for obj, status, created_at in events
+        ])
+
+event.listen(db.session, 'after_flush', _record_status_events)
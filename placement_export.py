@@ -0,0 +1,170 @@
+"""
+Placement Export - columnar dumps of applications for offline analysis
+Applications joined with student, job and skill data are read through a
+server-side cursor in chunks; each chunk becomes one Parquet row group or
+Arrow IPC record batch, so memory stays bounded for any number of rows
+Team Arena: Skill-Link Platform
+"""
+
+from models import db, HR, Job, JobSkill, Student, StudentSkill, Application
+from sqlalchemy import select
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+EXPORT_FORMATS = {
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.file', 'arrow')
+}
+
+# Student ids per skill lookup, well under any bound-parameter limit
+SKILL_LOOKUP_SIZE = 500
+
+def _schema():
+    return pa.schema([
+        ('application_id', pa.int64()),
+        ('applied_at', pa.timestamp('us')),
+        ('status', pa.string()),
+        ('interview_round', pa.int32()),
+        ('match_percentage', pa.float64()),
+        ('student_id', pa.int64()),
+        ('student_branch', pa.string()),
+        ('grad_year', pa.int32()),
+        ('cgpa', pa.float64()),
+        ('student_skills', pa.list_(pa.string())),
+        ('job_id', pa.int64()),
+        ('job_title', pa.string()),
+        ('job_branch', pa.string()),
+        ('min_cgpa', pa.float64()),
+        ('job_active', pa.bool_()),
+        ('company_name', pa.string()),
+        ('job_skills', pa.list_(pa.string()))
+    ])
+
+def _skills_by_owner(column, owner_ids):
+    """owner id -> list of skill names, looked up in bounded IN lists"""
+    skills = {}
+    owner_ids = list(owner_ids)
+    model = column.class_
+    for i in range(0, len(owner_ids), SKILL_LOOKUP_SIZE):
+        rows = db.session.execute(
+            select(column, model.skill_name).where(column.in_(owner_ids[i:i + SKILL_LOOKUP_SIZE]))
+        )
+        for owner_id, skill_name in rows:
+            skills.setdefault(owner_id, []).append(skill_name)
+    return skills
+
+def iter_placement_batches(chunk_size=10000, hr_id=None):
+    """
+    Yield the export as pyarrow RecordBatches of at most chunk_size rows
+    hr_id limits it to one recruiter's jobs
+    """
+    schema = _schema()
+    job_filter = Job.hr_id == hr_id if hr_id is not None else True
+
+    # Jobs are few next to applications: their skills are read once up front
+    job_ids = db.session.execute(select(Job.id).where(job_filter)).scalars().all()
+    job_skills = _skills_by_owner(JobSkill.job_id, job_ids)
+
+    query = select(
+        Application.id, Application.applied_at, Application.status, Application.interview_round,
+        Application.match_percentage, Student.id, Student.branch, Student.grad_year, Student.cgpa,
+        Job.id, Job.title, Job.branch, Job.min_cgpa, Job.is_active, HR.company_name
+    ).join(Student, Student.id == Application.student_id
+    ).join(Job, Job.id == Application.job_id
+    ).join(HR, HR.id == Job.hr_id
+    ).where(job_filter
+    ).order_by(Application.id)
+
+    # stream_results keeps the rows on the server (or in the driver's cursor)
+    # instead of buffering the whole result in Python
+    result = db.session.execute(query, execution_options={'stream_results': True, 'yield_per': chunk_size})
+    try:
+        for rows in result.partitions():
+            student_skills = _skills_by_owner(StudentSkill.student_id, {row[5] for row in rows})
+            columns = list(zip(*rows))
+            arrays = columns[:9] + [
+                [student_skills.get(student_id, []) for student_id in columns[5]]
+            ] + columns[9:] + [
+                [job_skills.get(job_id, []) for job_id in columns[9]]
+            ]
+            yield pa.RecordBatch.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(arrays, schema)],
+                schema=schema
+            )
+    finally:
+        # Also when the consumer stops early: release the server-side cursor
+        result.close()
+
+def _open_writer(sink, fmt):
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    if fmt == 'parquet':
+        return pq.ParquetWriter(sink, _schema(), compression='zstd')
+    return pa.ipc.new_file(sink, _schema())
+
+def write_placement_export(sink, fmt='parquet', chunk_size=10000, hr_id=None):
+    """
+    Write the export to a path or writable file object
+    Returns: number of rows written
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError('pyarrow is required for placement exports')
+    if not isinstance(sink, str):
+        sink = pa.PythonFile(sink, mode='w')
+
+    writer = _open_writer(sink, fmt)
+    rows = 0
+    try:
+        for batch in iter_placement_batches(chunk_size, hr_id):
+            # One row group / record batch per chunk
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    finally:
+        writer.close()
+    return rows
+
+class _ChunkSink:
+    """Write-only file object whose contents are handed out as they arrive"""
+
+    def __init__(self):
+        self._chunks = []
+        self.closed = False
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return [data] if data else []
+
+def stream_placement_export(fmt='parquet', chunk_size=10000, hr_id=None):
+    """
+    Generate the export file chunk by chunk for an HTTP response
+    Neither format needs to seek back: the footer is written last
+    """
+    sink = _ChunkSink()
+    writer = _open_writer(pa.PythonFile(sink, mode='w'), fmt)
+    batches = iter_placement_batches(chunk_size, hr_id)
+    try:
+        for batch in batches:
+            writer.write_batch(batch)
+            yield from sink.drain()
+    finally:
+        # Runs on client disconnect (GeneratorExit) and mid-stream errors too
+        batches.close()
+        writer.close()
+    # The footer written by close()
+    yield from sink.drain()
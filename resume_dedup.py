@@ -0,0 +1,256 @@
+"""
+Resume Duplicate Detection - background near-duplicate pipeline
+Each resume gets a MinHash fingerprint of its text; LSH band keys are stored
+in resume_lsh_bands, so candidates are found with an indexed lookup instead
+of loading every fingerprint, and pairs above the threshold form a similarity graph
+Team Arena: Skill-Link Platform
+"""
+
+from models import db, Resume, Student, Job, Application, ResumeSimilarity, ResumeLSHBand
+from sqlalchemy import or_
+from datetime import datetime
+import hashlib
+import numpy as np
+import re
+import zlib
+
+# Estimated Jaccard similarity of word shingles that counts as a near-duplicate
+DUPLICATE_THRESHOLD = 0.7
+
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 32  # 4 rows per band: pairs at 0.7 become candidates with p > 0.999
+SHINGLE_SIZE = 3
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Fixed multiply-shift hash family so fingerprints stay comparable across runs
+_rng = np.random.default_rng(20240601)
+_PERM_A = _rng.integers(1, 2 ** 63, NUM_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+_PERM_B = _rng.integers(0, 2 ** 63, NUM_PERMUTATIONS, dtype=np.uint64)
+
+def shingles(text):
+    """Overlapping SHINGLE_SIZE-word shingles of normalized text"""
+    tokens = TOKEN_PATTERN.findall((text or '').lower())
+    if len(tokens) < SHINGLE_SIZE:
+        return set(tokens)
+    return {' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+
+def minhash_signature(text):
+    """
+    MinHash fingerprint of a resume's text
+    Returns: uint32 numpy array of NUM_PERMUTATIONS values, or None for empty text
+    """
+    items = shingles(text)
+    if not items:
+        return None
+    hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in items), dtype=np.uint64, count=len(items))
+    with np.errstate(over='ignore'):
+        permuted = (_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) >> np.uint64(32)
+    return permuted.min(axis=1).astype(np.uint32)
+
+def band_keys(signature):
+    """One signed 64-bit key per LSH band, as stored in resume_lsh_bands"""
+    rows = NUM_PERMUTATIONS // LSH_BANDS
+    return [
+        int.from_bytes(
+            hashlib.blake2b(bytes([band]) + signature[band * rows:(band + 1) * rows].tobytes(), digest_size=8).digest(),
+            'big', signed=True
+        )
+        for band in range(LSH_BANDS)
+    ]
+
+def _pending_filter():
+    return or_(Resume.dedup_version.is_(None), Resume.dedup_version != Resume.version)
+
+def _index_resume(resume_id, signature):
+    """Replace a resume's band rows (none when it has no fingerprint)"""
+    ResumeLSHBand.query.filter_by(resume_id=resume_id).delete(synchronize_session=False)
+    if signature is not None:
+        db.session.add_all([ResumeLSHBand(resume_id=resume_id, band_key=key) for key in band_keys(signature)])
+
+def _similar(resume, signature, threshold):
+    """
+    Yield (other_id, similarity) for checked resumes of other students at or
+    above threshold; only resumes sharing a band are read
+    """
+    candidates = db.session.query(Resume.id, Resume.fingerprint).join(
+        ResumeLSHBand, ResumeLSHBand.resume_id == Resume.id
+    ).filter(
+        ResumeLSHBand.band_key.in_(band_keys(signature)),
+        Resume.id != resume.id,
+        Resume.student_id != resume.student_id,
+        Resume.fingerprint.isnot(None),
+        ~_pending_filter()
+    ).distinct()
+    for other_id, fingerprint in candidates:
+        similarity = float(np.mean(np.frombuffer(fingerprint, dtype=np.uint32) == signature))
+        if similarity >= threshold:
+            yield other_id, similarity
+
+def _remove_edges(resume_id):
+    """Drop a resume's edges; returns the ids it was linked to"""
+    edges = ResumeSimilarity.query.filter(
+        or_(ResumeSimilarity.resume_a_id == resume_id, ResumeSimilarity.resume_b_id == resume_id)
+    ).all()
+    neighbours = set()
+    for edge in edges:
+        neighbours.add(edge.resume_b_id if edge.resume_a_id == resume_id else edge.resume_a_id)
+        db.session.delete(edge)
+    return neighbours
+
+def refresh_duplicate_flags(resume_ids):
+    """
+    Recompute is_duplicate/duplicate_of from the graph: a resume is a
+    duplicate when it closely matches one uploaded earlier by another student
+    """
+    if not resume_ids:
+        return
+    resumes = {r.id: r for r in Resume.query.filter(Resume.id.in_(list(resume_ids))).all()}
+    edges = ResumeSimilarity.query.filter(
+        or_(ResumeSimilarity.resume_a_id.in_(list(resume_ids)), ResumeSimilarity.resume_b_id.in_(list(resume_ids)))
+    ).all()
+
+    others = {edge.resume_a_id for edge in edges} | {edge.resume_b_id for edge in edges}
+    uploaded = dict(db.session.query(Resume.id, Resume.uploaded_at).filter(Resume.id.in_(list(others | set(resumes)))))
+    students = dict(db.session.query(Resume.id, Resume.student_id).filter(Resume.id.in_(list(others | set(resumes)))))
+
+    def earlier(a, b):
+        return (uploaded.get(a) or datetime.min, a) < (uploaded.get(b) or datetime.min, b)
+
+    best = {}
+    for edge in edges:
+        for resume_id, other_id in ((edge.resume_a_id, edge.resume_b_id), (edge.resume_b_id, edge.resume_a_id)):
+            if resume_id in resumes and earlier(other_id, resume_id):
+                if resume_id not in best or edge.similarity > best[resume_id][1]:
+                    best[resume_id] = (other_id, edge.similarity)
+
+    for resume_id, resume in resumes.items():
+        match = best.get(resume_id)
+        resume.is_duplicate = match is not None
+        resume.duplicate_of = students.get(match[0]) if match else None
+
+def run_dedup(batch_size=200, threshold=DUPLICATE_THRESHOLD):
+    """
+    Fingerprint resumes uploaded or changed since their last check and
+    rebuild their edges in the similarity graph
+    Returns: number of resumes checked
+    """
+    pending = Resume.query.filter(_pending_filter()).order_by(Resume.id).limit(batch_size).all()
+    if not pending:
+        return 0
+
+    affected = set()
+
+    for resume in pending:
+        affected.add(resume.id)
+        affected.update(_remove_edges(resume.id))
+
+        signature = minhash_signature(resume.get_text())
+        resume.fingerprint = signature.tobytes() if signature is not None else None
+        resume.dedup_version = resume.version
+        # Later resumes in this batch are compared against this one too
+        _index_resume(resume.id, signature)
+        if signature is None:
+            continue
+
+        for other_id, similarity in _similar(resume, signature, threshold):
+            a, b = sorted((resume.id, other_id))
+            db.session.add(ResumeSimilarity(resume_a_id=a, resume_b_id=b, similarity=round(similarity, 4)))
+            affected.add(other_id)
+
+    db.session.flush()
+    refresh_duplicate_flags(affected)
+    db.session.commit()
+    return len(pending)
+
+def forget_resume(resume):
+    """Remove a resume from the graph before it is deleted; its neighbours are re-checked"""
+    _index_resume(resume.id, None)
+    neighbours = _remove_edges(resume.id)
+    if neighbours:
+        Resume.query.filter(Resume.id.in_(list(neighbours))).update({'dedup_version': None}, synchronize_session=False)
+
+def rebuild_lsh_index(batch_size=500):
+    """
+    Rewrite resume_lsh_bands from the stored fingerprints of checked resumes
+    For databases fingerprinted before band keys were stored
+    Returns: number of resumes indexed
+    """
+    ResumeLSHBand.query.delete()
+    indexed = 0
+    rows = db.session.query(Resume.id, Resume.fingerprint).filter(
+        Resume.fingerprint.isnot(None), ~_pending_filter()
+    ).yield_per(batch_size)
+    for resume_id, fingerprint in rows:
+        _index_resume(resume_id, np.frombuffer(fingerprint, dtype=np.uint32))
+        indexed += 1
+    db.session.commit()
+    return indexed
+
+def pending_dedup_count():
+    """Resumes waiting for the background duplicate check"""
+    return Resume.query.filter(_pending_filter()).count()
+
+def get_duplicate_clusters(min_similarity=DUPLICATE_THRESHOLD, hr_id=None):
+    """
+    Connected components of the similarity graph at min_similarity
+    hr_id limits the graph to resumes of students who applied to that HR's
+    jobs: both ends of every pair must be such an applicant
+    Returns: list of clusters (resumes and pairs), largest and closest first
+    """
+    query = ResumeSimilarity.query.filter(ResumeSimilarity.similarity >= min_similarity)
+    if hr_id is not None:
+        applicant_resumes = db.session.query(Resume.id).join(
+            Application, Application.student_id == Resume.student_id
+        ).join(Job, Job.id == Application.job_id).filter(Job.hr_id == hr_id)
+        query = query.filter(
+            ResumeSimilarity.resume_a_id.in_(applicant_resumes),
+            ResumeSimilarity.resume_b_id.in_(applicant_resumes)
+        )
+    edges = query.all()
+
+    parent = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for edge in edges:
+        parent[find(edge.resume_a_id)] = find(edge.resume_b_id)
+
+    groups = {}
+    for edge in edges:
+        groups.setdefault(find(edge.resume_a_id), []).append(edge)
+
+    resume_ids = list(parent)
+    details = {
+        resume_id: {
+            'resume_id': resume_id,
+            'student_id': student_id,
+            'student_name': name,
+            'student_email': email,
+            'uploaded_at': uploaded_at.isoformat() if uploaded_at else None
+        }
+        for resume_id, student_id, name, email, uploaded_at in db.session.query(
+            Resume.id, Student.id, Student.name, Student.email, Resume.uploaded_at
+        ).join(Student, Student.id == Resume.student_id).filter(Resume.id.in_(resume_ids))
+    } if resume_ids else {}
+
+    clusters = []
+    for group_edges in groups.values():
+        members = sorted({e.resume_a_id for e in group_edges} | {e.resume_b_id for e in group_edges})
+        clusters.append({
+            'size': len(members),
+            'max_similarity': round(max(e.similarity for e in group_edges) * 100, 2),
+            'resumes': [details[m] for m in members if m in details],
+            'pairs': [
+                {'resume_a_id': e.resume_a_id, 'resume_b_id': e.resume_b_id, 'similarity': round(e.similarity * 100, 2)}
+                for e in sorted(group_edges, key=lambda e: e.similarity, reverse=True)
+            ]
+        })
+
+    clusters.sort(key=lambda c: (c['size'], c['max_similarity']), reverse=True)
+    return clusters
@@ -0,0 +1,225 @@
+"""
+Bulk Resume Import - ingest a folder or ZIP archive of resumes
+Team Arena: Skill-Link Platform
+"""
+
+from models import db, Student, Resume
+from utils.resume_parser import extract_text_from_file, parse_resume, calculate_resume_score
+from utils.blob_store import store_blob_from_path
+from utils.resume_scoring import scoring_model_version
+from multiprocessing import Pool
+import csv
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import uuid
+import zipfile
+
+# File types the parser understands
+IMPORT_EXTENSIONS = {'pdf', 'docx', 'doc'}
+
+EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+def list_resume_files(source):
+    """
+    List importable resumes in a directory or ZIP archive
+    Returns: sorted list of keys (relative path or archive member name)
+    """
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            names = [info.filename for info in archive.infolist() if not info.is_dir()]
+    else:
+        names = []
+        for root, _, files in os.walk(source):
+            for name in files:
+                names.append(os.path.relpath(os.path.join(root, name), source))
+
+    return sorted(n for n in names if n.rsplit('.', 1)[-1].lower() in IMPORT_EXTENSIONS)
+
+def load_mapping(mapping_path):
+    """
+    Load an optional CSV mapping file stems or roll numbers to student emails
+    Expected columns: key, email
+    """
+    if not mapping_path:
+        return {}
+
+    with open(mapping_path, newline='', encoding='utf-8') as f:
+        return {
+            row['key'].strip().lower(): row['email'].strip().lower()
+            for row in csv.DictReader(f)
+            if row.get('key') and row.get('email')
+        }
+
+def load_checkpoint(checkpoint_path, source):
+    """Load import progress, starting fresh if it belongs to another source"""
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        with open(checkpoint_path, encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        if checkpoint.get('source') == os.path.abspath(source):
+            return checkpoint
+    return {'source': os.path.abspath(source), 'done': {}}
+
+def default_checkpoint_path(source, directory=None):
+    """
+    Progress file for importing source
+    directory: where to keep it (the CLI uses the instance folder); the name
+    includes a hash of the source path, so two sources never share a file.
+    Without it the file sits next to the source
+    """
+    source = os.path.abspath(source).rstrip(os.sep)
+    if directory is None:
+        return f"{source}.import.json"
+    digest = hashlib.sha1(source.encode('utf-8')).hexdigest()[:12]
+    return os.path.join(directory, f"{os.path.basename(source)}-{digest}.import.json")
+
+def save_checkpoint(checkpoint_path, checkpoint):
+    """Write progress atomically so a crash never leaves a torn file"""
+    os.makedirs(os.path.dirname(os.path.abspath(checkpoint_path)), exist_ok=True)
+    tmp_path = f"{checkpoint_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, checkpoint_path)
+
+def _parse_file(task):
+    """
+    Worker: extract, parse and score one staged file
+    Runs in a pool process, so it must not touch the database
+    A file that can't be parsed comes back with an 'error' instead of
+    raising, so one corrupt resume never aborts the import
+    """
+    key, path = task
+    try:
+        text = extract_text_from_file(path)
+        parsed_data = parse_resume(text)
+        score, _ = calculate_resume_score(parsed_data, text=text)
+    except Exception as e:
+        return {'key': key, 'path': path, 'error': f"{type(e).__name__}: {e}"}
+
+    return {
+        'key': key,
+        'path': path,
+        'text': text,
+        'emails': [e.lower() for e in EMAIL_PATTERN.findall(text[:5000])],
+        'parsed_data': parsed_data,
+        'score': score
+    }
+
+def _stage_batch(source, keys, staging_dir):
+    """Give every key in the batch a readable path on local disk"""
+    if not zipfile.is_zipfile(source):
+        return [(key, os.path.join(source, key)) for key in keys]
+
+    tasks = []
+    with zipfile.ZipFile(source) as archive:
+        for key in keys:
+            # Never trust member paths; keep only the extension
+            ext = key.rsplit('.', 1)[-1].lower()
+            path = os.path.join(staging_dir, f"{uuid.uuid4().hex}.{ext}")
+            with archive.open(key) as src, open(path, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            tasks.append((key, path))
+    return tasks
+
+def _match_student(result, mapping, students_by_email):
+    """Find the student a parsed file belongs to"""
+    stem = os.path.splitext(os.path.basename(result['key']))[0].lower()
+
+    candidates = []
+    if stem in mapping:
+        candidates.append(mapping[stem])
+    candidates.extend(e.lower() for e in EMAIL_PATTERN.findall(stem))
+    candidates.extend(result['emails'])
+
+    for email in candidates:
+        if email in students_by_email:
+            return students_by_email[email]
+    return None
+
+def _save_resume(student_id, result):
+    """Copy the file into the blob store and upsert the student's resume"""
+    ext = result['key'].rsplit('.', 1)[-1].lower()
+    content_hash, file_path = store_blob_from_path(result['path'], ext)
+
+    parsed_data = result['parsed_data']
+    resume = Resume.query.filter_by(student_id=student_id).first()
+    if not resume:
+        resume = Resume(student_id=student_id)
+        db.session.add(resume)
+
+    resume.filename = os.path.basename(result['key'])
+    resume.file_path = file_path
+    resume.content_hash = content_hash
+    resume.score = result['score']
+    resume.score_model = scoring_model_version()
+    resume.skills = json.dumps(parsed_data['skills'])
+    resume.education = parsed_data['education']
+    resume.experience = parsed_data['experience']
+    resume.set_text(result['text'])
+
+def import_resumes(source, mapping_path=None, workers=None, batch_size=50, checkpoint_path=None):
+    """
+    Import every resume in a directory or ZIP archive
+    Files are parsed on a process pool and saved one transaction per batch;
+    progress is checkpointed after each batch so a rerun skips finished files
+    Returns: summary dict with imported/unmatched/failed/skipped counts
+    """
+    if batch_size < 1:
+        raise ValueError('batch_size must be at least 1')
+    if checkpoint_path is None:
+        checkpoint_path = default_checkpoint_path(source)
+
+    mapping = load_mapping(mapping_path)
+    checkpoint = load_checkpoint(checkpoint_path, source)
+    done = checkpoint['done']
+
+    keys = list_resume_files(source)
+    pending = [k for k in keys if k not in done]
+    summary = {'total': len(keys), 'skipped': len(keys) - len(pending), 'imported': 0, 'unmatched': 0, 'failed': 0}
+
+    if not pending:
+        return summary
+
+    students_by_email = {email.lower(): sid for sid, email in db.session.query(Student.id, Student.email)}
+
+    with Pool(processes=workers) as pool, tempfile.TemporaryDirectory() as staging_dir:
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            tasks = _stage_batch(source, batch, staging_dir)
+            statuses = {}
+
+            for result in pool.imap_unordered(_parse_file, tasks):
+                if 'error' in result:
+                    print(f"Import error for {result['key']}: {result['error']}")
+                    statuses[result['key']] = 'failed'
+                    continue
+                student_id = _match_student(result, mapping, students_by_email)
+                if student_id is None:
+                    statuses[result['key']] = 'unmatched'
+                    continue
+                try:
+                    _save_resume(student_id, result)
+                    statuses[result['key']] = 'imported'
+                except OSError as e:
+                    print(f"Import error for {result['key']}: {e}")
+                    statuses[result['key']] = 'failed'
+
+            # One transaction per batch, then record progress
+            db.session.commit()
+            done.update(statuses)
+            save_checkpoint(checkpoint_path, checkpoint)
+
+            for status in statuses.values():
+                summary[status] += 1
+
+            # Staged archive members are no longer needed
+            if zipfile.is_zipfile(source):
+                for _, path in tasks:
+                    os.remove(path)
+
+            print(f"Processed {min(start + batch_size, len(pending))}/{len(pending)} files")
+
+    return summary
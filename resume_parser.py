@@ -1,70 +1,34 @@
 import re
 import json
+import os
+from collections import namedtuple
+from utils.taxonomy import get_taxonomy
 
-# Common skills database
-COMMON_SKILLS = [
-    # Programming Languages
-    'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'go', 'rust', 'typescript', 'php', 'swift', 'kotlin',
-    # Web Technologies
-    'html', 'css', 'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask', 'spring', 'bootstrap',
-    'jquery', 'ajax', 'rest api', 'graphql', 'webpack', 'sass', 'less',
-    # Database
-    'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'oracle', 'sqlite', 'firebase', 'elasticsearch',
-    # Data Science & ML
-    'machine learning', 'deep learning', 'data science', 'data analysis', 'numpy', 'pandas', 'scikit-learn',
-    'tensorflow', 'pytorch', 'keras', 'nlp', 'computer vision', 'data visualization',
-    # DevOps & Cloud
-    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git', 'github', 'gitlab', 'ci/cd',
-    'devops', 'linux', 'unix', 'bash', 'terraform', 'ansible',
-    # Tools
-    'jira', 'confluence', 'figma', 'photoshop', 'illustrator', 'postman', 'selenium',
-    # Soft Skills
-    'leadership', 'communication', 'teamwork', 'problem solving', 'analytical',
-    # Other
-    'agile', 'scrum', 'oops', 'dsa', 'algorithm', 'testing', 'unit testing', 'debugging'
-]
-
-# Education keywords
-EDUCATION_KEYWORDS = [
-    'bachelor', 'master', 'phd', 'b.tech', 'm.tech', 'b.e', 'm.e', 'bca', 'mca',
-    'bsc', 'msc', 'diploma', 'degree', 'university', 'institute', 'college'
-]
+# Skills and keyword lists live in taxonomy.json (see taxonomy.py)
 
-# Experience keywords
-EXPERIENCE_KEYWORDS = [
-    'experience', 'internship', 'project', 'work', 'employment', 'role', 'responsibility',
-    'achievement', 'company', 'organization', 'team'
-]
-
-def extract_text_from_file(file_path):
+def extract_text_from_file(file_path, backend=None):
     """
     Extract text from PDF or DOCX file
+    Uses the configured extractor backend unless one is named explicitly
     """
-    import os
-    
     ext = os.path.splitext(file_path)[1].lower()
+    kind = EXTENSION_KINDS.get(ext)
+    if not kind:
+        return ""
+    
+    backend = backend or get_extractor(kind)
     
     try:
-        if ext == '.pdf':
-            return extract_text_from_pdf(file_path)
-        elif ext in ['.docx', '.doc']:
-            return extract_text_from_docx(file_path)
-        else:
-            return ""
+        return EXTRACTORS[backend]['extract'](file_path)
     except Exception as e:
-        print(f"Error extracting text: {e}")
-        return ""
+        print(f"Error extracting text ({backend}): {e}")
+        # PDFs still get the plain-text fallback
+        return extract_text_simple(file_path) if kind == 'pdf' else ""
 
 def extract_text_from_pdf(file_path):
     """Extract text from PDF using PyPDF2"""
     try:
-        import PyPDF2
-        text = ""
-        with open(file_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            for page in reader.pages:
-                text += page.extract_text() or ""
-        return text
+        return _pdf_pypdf2(file_path)
     except Exception as e:
         print(f"PDF extraction error: {e}")
         return extract_text_simple(file_path)
@@ -72,78 +36,324 @@ def extract_text_from_pdf(file_path):
 def extract_text_from_docx(file_path):
     """Extract text from DOCX using python-docx"""
     try:
-        from docx import Document
-        doc = Document(file_path)
-        return '\n'.join([para.text for para in doc.paragraphs])
+        return _docx_python_docx(file_path)
     except Exception as e:
         print(f"DOCX extraction error: {e}")
         return ""
 
+# ==================== EXTRACTOR BACKENDS ====================
+# Backends raise on failure; extract_text_from_file handles fallbacks
+
+def _pdf_pypdf2(file_path):
+    """PDF text via PyPDF2 (pure Python, slowest)"""
+    import PyPDF2
+    with open(file_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        # Separate pages so the last word of one page doesn't fuse with the next
+        return '\n'.join(page.extract_text() or "" for page in reader.pages)
+
+def _pdf_pdfminer(file_path):
+    """PDF text via pdfminer.six"""
+    from pdfminer.high_level import extract_text
+    return extract_text(file_path)
+
+def _pdf_pypdfium2(file_path):
+    """PDF text via pypdfium2 (PDFium bindings, fastest)"""
+    import pypdfium2 as pdfium
+    pages = []
+    pdf = pdfium.PdfDocument(file_path)
+    try:
+        for page in pdf:
+            textpage = page.get_textpage()
+            pages.append(textpage.get_text_range().replace('\r\n', '\n'))
+            textpage.close()
+            page.close()
+    finally:
+        pdf.close()
+    return '\n'.join(pages)
+
+def _docx_python_docx(file_path):
+    """DOCX text via the full python-docx document model"""
+    from docx import Document
+    doc = Document(file_path)
+    return '\n'.join([para.text for para in doc.paragraphs])
+
+def _docx_xml(file_path):
+    """DOCX text streamed from word/document.xml without building a document model"""
+    return '\n'.join(iter_docx_paragraphs(file_path))
+
+WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+# Run children that contribute text, mirroring python-docx's Run.text
+DOCX_RUN_TEXT = {
+    f'{WORD_NS}tab': '\t',
+    f'{WORD_NS}ptab': '\t',
+    f'{WORD_NS}cr': '\n',
+    f'{WORD_NS}noBreakHyphen': '-'
+}
+
+def iter_docx_paragraphs(file_path):
+    """
+    Yield the text of each body paragraph of a DOCX file
+    iterparses word/document.xml straight out of the zip and clears every
+    finished body element, so memory stays flat however large the file is.
+    Output matches python-docx's Document(...).paragraphs text.
+    """
+    import zipfile
+    import xml.etree.ElementTree as ET
+    
+    body_tag, p_tag, r_tag = f'{WORD_NS}body', f'{WORD_NS}p', f'{WORD_NS}r'
+    t_tag, br_tag, hyperlink_tag = f'{WORD_NS}t', f'{WORD_NS}br', f'{WORD_NS}hyperlink'
+    
+    with zipfile.ZipFile(file_path) as archive, archive.open('word/document.xml') as xml_file:
+        stack = []
+        body = None
+        parts = []
+        
+        for event, elem in ET.iterparse(xml_file, events=('start', 'end')):
+            if event == 'start':
+                stack.append(elem.tag)
+                if elem.tag == body_tag and len(stack) == 2:
+                    body = elem
+                continue
+            
+            stack.pop()
+            depth = len(stack)
+            
+            # Text-bearing run children: body/p/r/* or body/p/hyperlink/r/*
+            if depth >= 4 and stack[1] == body_tag and stack[2] == p_tag and stack[-1] == r_tag and (
+                    depth == 4 or (depth == 5 and stack[3] == hyperlink_tag)):
+                if elem.tag == t_tag:
+                    parts.append(elem.text or '')
+                elif elem.tag == br_tag:
+                    # Page and column breaks carry no text
+                    if elem.get(f'{WORD_NS}type', 'textWrapping') == 'textWrapping':
+                        parts.append('\n')
+                elif elem.tag in DOCX_RUN_TEXT:
+                    parts.append(DOCX_RUN_TEXT[elem.tag])
+            
+            # Finished a direct child of body: emit paragraphs, then drop it
+            elif depth == 2 and body is not None:
+                if elem.tag == p_tag:
+                    yield ''.join(parts)
+                parts = []
+                body.clear()
+
+# name -> file kind, extract function, module that must be importable
+EXTRACTORS = {
+    'pypdf2': {'kind': 'pdf', 'extract': _pdf_pypdf2, 'module': 'PyPDF2'},
+    'pdfminer': {'kind': 'pdf', 'extract': _pdf_pdfminer, 'module': 'pdfminer'},
+    'pypdfium2': {'kind': 'pdf', 'extract': _pdf_pypdfium2, 'module': 'pypdfium2'},
+    'python-docx': {'kind': 'docx', 'extract': _docx_python_docx, 'module': 'docx'},
+    'docx-xml': {'kind': 'docx', 'extract': _docx_xml, 'module': None}
+}
+
+EXTENSION_KINDS = {'.pdf': 'pdf', '.docx': 'docx', '.doc': 'docx'}
+
+# Selected backends; overridden from app config by configure_extractors
+SELECTED_EXTRACTORS = {
+    'pdf': os.environ.get('PDF_EXTRACTOR', 'pypdf2'),
+    'docx': os.environ.get('DOCX_EXTRACTOR', 'docx-xml')
+}
+
+def extractor_available(name):
+    """Check that an extractor exists and its library is installed"""
+    import importlib.util
+    
+    extractor = EXTRACTORS.get(name)
+    if not extractor:
+        return False
+    return extractor['module'] is None or importlib.util.find_spec(extractor['module']) is not None
+
+def available_extractors(kind=None):
+    """List installed extractor backends, optionally for one file kind"""
+    return [
+        name for name, extractor in EXTRACTORS.items()
+        if (kind is None or extractor['kind'] == kind) and extractor_available(name)
+    ]
+
+def configure_extractors(pdf=None, docx=None, fallback_max_chars=None, fallback_max_scan_bytes=None):
+    """Select extractor backends and fallback limits (unknown names raise ValueError)"""
+    if fallback_max_chars:
+        FALLBACK_LIMITS['max_chars'] = int(fallback_max_chars)
+    if fallback_max_scan_bytes:
+        FALLBACK_LIMITS['max_scan_bytes'] = int(fallback_max_scan_bytes)
+    
+    for kind, name in (('pdf', pdf), ('docx', docx)):
+        if not name:
+            continue
+        if EXTRACTORS.get(name, {}).get('kind') != kind:
+            raise ValueError(f"Unknown {kind} extractor: {name}")
+        SELECTED_EXTRACTORS[kind] = name
+
+def get_extractor(kind):
+    """Selected backend for a file kind, or the first installed one if it is missing"""
+    name = SELECTED_EXTRACTORS[kind]
+    if extractor_available(name):
+        return name
+    installed = available_extractors(kind)
+    return installed[0] if installed else name
+
+# Limits for the raw-bytes fallback; a corrupt upload costs at most this much work
+FALLBACK_LIMITS = {
+    'max_chars': int(os.environ.get('FALLBACK_MAX_CHARS', 20000)),
+    'max_scan_bytes': int(os.environ.get('FALLBACK_MAX_SCAN_BYTES', 256 * 1024))
+}
+
+# Runs of at least 4 printable ASCII characters, like strings(1)
+PRINTABLE_RUN_PATTERN = re.compile(rb'[\x20-\x7e\t]{4,}')
+
 def extract_text_simple(file_path):
-    """Simple text extraction fallback"""
+    """
+    Simple text extraction fallback
+    Scans the memory-mapped file for printable text runs, stopping after
+    max_scan_bytes of input or max_chars of output, whichever comes first
+    """
+    import mmap
+    
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            return f.read()
-    except:
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size:
+                return ""
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                runs = []
+                remaining = FALLBACK_LIMITS['max_chars']
+                end = min(size, FALLBACK_LIMITS['max_scan_bytes'])
+                
+                # finditer walks the mapping lazily; pages past `end` are never read
+                for match in PRINTABLE_RUN_PATTERN.finditer(mm, 0, end):
+                    run = match.group().decode('ascii')
+                    runs.append(run[:remaining])
+                    remaining -= len(run) + 1  # plus the joining newline
+                    if remaining <= 0:
+                        break
+                
+                return '\n'.join(runs)
+    except (OSError, ValueError):
         return ""
 
-def extract_skills(text):
+# Sections whose lines name skills the candidate has
+SKILL_SECTIONS = ('skills', 'projects', 'experience')
+
+def extract_skills(text, sections=None):
     """
     Extract skills from resume text using keyword matching
+    Reads the skills, projects and experience sections; the whole text only
+    when segmentation found none of them
     """
-    text_lower = text.lower()
-    found_skills = []
+    if sections is None:
+        sections = segment_resume(text)
     
-    for skill in COMMON_SKILLS:
-        if skill in text_lower:
-            # Capitalize skill name for display
-            found_skills.append(skill.title())
-    
-    # Remove duplicates and return
-    return list(set(found_skills))
+    if any(sections[name] for name in SKILL_SECTIONS):
+        text = '\n'.join(line for name in SKILL_SECTIONS for line in sections[name])
+    # One pass of the taxonomy's precompiled skill matcher
+    return get_taxonomy().find_skills(text)
+
+# Section headings recognised by segment_resume (one named group per section)
+SECTION_NAMES = ('education', 'experience', 'skills', 'projects', 'achievements')
 
-def extract_education(text):
+SECTION_HEADER_PATTERN = re.compile(
+    r'\b(?:'
+    r'(?P<education>education|academics?|academic qualifications?)'
+    r'|(?P<experience>experience|work history|employment)'
+    r'|(?P<skills>skills|technologies|tech stack)'
+    r'|(?P<projects>projects)'
+    r'|(?P<achievements>achievements|awards|accomplishments|certifications)'
+    r')\b',
+    re.IGNORECASE
+)
+
+# Headings are short lines; longer lines mentioning a keyword are content
+MAX_HEADER_LENGTH = 40
+
+# Words besides the keyword a heading may carry ("Technical Skills"), and
+# only when the line is styled as a heading
+MAX_HEADER_QUALIFIERS = 1
+
+# Bullets, numbering and rules around a heading ("1. ", "## ", "-- ")
+HEADER_DECORATION_PATTERN = re.compile(r'^[\W\d_]+|[\s:\-\u2013\u2014=*#]+$')
+# Words besides "and" joining two keywords ("Awards and Achievements")
+QUALIFIER_PATTERN = re.compile(r'\b(?!and\b)\w+', re.IGNORECASE)
+
+def _heading_section(line):
     """
-    Extract education information from resume text
+    Section a line is the heading of, or None if the line is content
+    The line must be mostly the keyword: just the keyword, or the keyword
+    plus one qualifier when it ends with a colon or is in all caps / title case.
+    "Skills: Python" and "Projects in ML" are content.
     """
-    text_lower = text.lower()
-    education_info = []
+    if len(line) > MAX_HEADER_LENGTH or line.endswith('.'):
+        return None
+    label = HEADER_DECORATION_PATTERN.sub('', line)
+    # Text after a colon is the section's content, not part of a heading
+    if not label or ':' in label:
+        return None
     
-    # Find education section
-    lines = text.split('\n')
-    in_education_section = False
+    matches = list(SECTION_HEADER_PATTERN.finditer(label))
+    if not matches:
+        return None
+    # The last keyword names the section: "Academic Projects" is projects
+    section = matches[-1].lastgroup
+    extra_words = len(QUALIFIER_PATTERN.findall(label)) - sum(len(m.group().split()) for m in matches)
+    if extra_words == 0:
+        return section
+    styled = line.endswith(':') or label.isupper() or label.title() == label
+    if styled and extra_words <= MAX_HEADER_QUALIFIERS:
+        return section
+    return None
+
+# Fallback patterns used when the resume has no education section
+DEGREE_PATTERNS = [
+    re.compile(r'(b\.?tech|m\.?tech|b\.?e|m\.?e|b\.?sc|m\.?sc|b\.?ca|m\.?ca)\s*[-–]?\s*(\d{4})?'),
+    re.compile(r'(bachelor|master|phd)\s*(of|degree)?\s*(\w+)?\s*[-–]?\s*(\d{4})?'),
+    re.compile(r'(\d{4})\s*[-–]\s*(\d{4})?')
+]
+
+def segment_resume(text):
+    """
+    Split resume text into sections in a single pass over its lines
+    Returns dict: section name -> list of stripped lines
+    ('other' holds lines that appear before the first heading)
+    """
+    sections = {name: [] for name in SECTION_NAMES}
+    sections['other'] = []
+    current = sections['other']
     
-    for i, line in enumerate(lines):
-        line_lower = line.lower()
-        
-        # Check if we're in education section
-        if 'education' in line_lower or 'academic' in line_lower:
-            in_education_section = True
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
             continue
         
-        if in_education_section:
-            # Check for education keywords
-            for keyword in EDUCATION_KEYWORDS:
-                if keyword in line_lower and len(line.strip()) > 5:
-                    education_info.append(line.strip())
-                    break
+        # A line that is essentially a section keyword starts that section
+        section = _heading_section(line)
+        if section:
+            current = sections[section]
+            continue
         
-        # Stop if we hit another section
-        if in_education_section and any(x in line_lower for x in ['experience', 'skills', 'projects']):
-            break
+        current.append(line)
+    
+    return sections
+
+def extract_education(text, sections=None):
+    """
+    Extract education information from resume text
+    """
+    if sections is None:
+        sections = segment_resume(text)
+    
+    education_pattern = get_taxonomy().education_pattern
+    education_info = [
+        line for line in sections['education']
+        if len(line) > 5 and education_pattern.search(line)
+    ]
     
     # If no structured education found, extract using patterns
     if not education_info:
-        # Pattern for degree/year
-        degree_patterns = [
-            r'(b\.?tech|m\.?tech|b\.?e|m\.?e|b\.?sc|m\.?sc|b\.?ca|m\.?ca)\s*[-–]?\s*(\d{4})?',
-            r'(bachelor|master|phd)\s*(of|degree)?\s*(\w+)?\s*[-–]?\s*(\d{4})?',
-            r'(\d{4})\s*[-–]\s*(\d{4})?'
-        ]
-        
-        for pattern in degree_patterns:
-            matches = re.findall(pattern, text_lower)
-            for match in matches:
+        text_lower = text.lower()
+        for pattern in DEGREE_PATTERNS:
+            for match in pattern.findall(text_lower):
                 if isinstance(match, tuple):
                     edu = ' '.join([m for m in match if m])
                     if edu:
@@ -153,29 +363,14 @@ def extract_education(text):
     
     return ' | '.join(education_info[:3]) if education_info else "Not found"
 
-def extract_experience(text):
+def extract_experience(text, sections=None):
     """
     Extract experience information from resume text
     """
-    lines = text.split('\n')
-    experience_info = []
-    in_experience_section = False
+    if sections is None:
+        sections = segment_resume(text)
     
-    for line in lines:
-        line_lower = line.lower()
-        
-        # Check if we're in experience section
-        if 'experience' in line_lower or 'work history' in line_lower:
-            in_experience_section = True
-            continue
-        
-        if in_experience_section:
-            if len(line.strip()) > 10:
-                experience_info.append(line.strip())
-        
-        # Stop if we hit another section
-        if in_experience_section and any(x in line_lower for x in ['skills', 'education', 'projects', 'achievements']):
-            break
+    experience_info = [line for line in sections['experience'] if len(line) > 10]
     
     return ' | '.join(experience_info[:5]) if experience_info else "Fresher"
 
@@ -184,9 +379,12 @@ def parse_resume(text):
     Main function to parse resume text
     Returns JSON with skills, education, experience
     """
-    skills = extract_skills(text)
-    education = extract_education(text)
-    experience = extract_experience(text)
+    # Segment once; every extractor reads from the same sections
+    sections = segment_resume(text)
+    
+    skills = extract_skills(text, sections)
+    education = extract_education(text, sections)
+    experience = extract_experience(text, sections)
     
     return {
         'skills': skills,
@@ -194,9 +392,54 @@ def parse_resume(text):
         'experience': experience
     }
 
-def calculate_resume_score(resume_data, job_requirements=None):
+# Bump whenever the scoring rules below change; together with the taxonomy
+# version it forms the scoring model version (resume_scoring.scoring_model_version)
+SCORING_RULES_VERSION = 1
+
+def calculate_resume_score(resume_data, job_requirements=None, text=None):
     """
     Calculate resume score out of 100
+    Returns: (score, suggestions)
+    """
+    score, suggestions, _ = calculate_resume_score_components(resume_data, job_requirements, text)
+    return score, suggestions
+
+FORMATTING_KEYWORDS = ('project', 'achievement', 'responsibility', 'technology', 'framework')
+
+# Everything the scoring rules read from a resume, precomputed once
+ResumeFeatures = namedtuple('ResumeFeatures', 'skills skills_lower skill_set has_education has_experience keyword_count')
+
+def resume_features(resume_data, text=None):
+    """
+    Reduce parsed resume data to the compact form scoring needs
+    text is the full extracted resume text; when it is not available the
+    formatting keywords are looked up in the education and experience strings
+    """
+    skills = tuple(resume_data.get('skills', []))
+    skills_lower = tuple(s.lower() for s in skills)
+    education = resume_data.get('education', '')
+    experience = resume_data.get('experience', '')
+    text = (text or f"{education} {experience}").lower()
+
+    return ResumeFeatures(
+        skills=skills,
+        skills_lower=skills_lower,
+        skill_set=frozenset(skills_lower),
+        has_education=bool(education and education != 'Not found'),
+        has_experience=bool(experience and experience != 'Fresher'),
+        keyword_count=sum(1 for kw in FORMATTING_KEYWORDS if kw in text)
+    )
+
+def calculate_resume_score_components(resume_data, job_requirements=None, text=None):
+    """
+    Calculate resume score out of 100 with a per-factor breakdown
+    Returns: (score, suggestions, components)
+    """
+    return score_resume_features(resume_features(resume_data, text), job_requirements)
+
+def score_resume_features(features, job_requirements=None):
+    """
+    Score precomputed ResumeFeatures, optionally against job skills
     
     Factors:
     - Skills count (max 25 points)
@@ -204,50 +447,49 @@ def calculate_resume_score(resume_data, job_requirements=None):
     - Education details (max 15 points)
     - Experience section (max 15 points)
     - Formatting keywords (max 20 points)
+    
+    Returns: (score, suggestions, components)
     """
-    score = 0
+    components = {}
     suggestions = []
     
     # Skills score (max 25)
-    skills = resume_data.get('skills', [])
-    skills_count = len(skills)
+    skills_count = len(features.skills)
     if skills_count >= 10:
-        score += 25
+        components['skills'] = 25
         suggestions.append("Great skill set!")
     elif skills_count >= 5:
-        score += 15
+        components['skills'] = 15
         suggestions.append("Add more technical skills")
     else:
-        score += 5
+        components['skills'] = 5
         suggestions.append("Add more skills to improve visibility")
     
     # Job requirements match (max 25)
     if job_requirements:
         job_skills = [s.lower() for s in job_requirements]
-        matched_skills = [s for s in skills if s.lower() in job_skills]
-        match_ratio = len(matched_skills) / len(job_skills) if job_skills else 0
-        score += int(match_ratio * 25)
+        job_skill_set = set(job_skills)
+        matched_count = sum(1 for s in features.skills_lower if s in job_skill_set)
+        match_ratio = matched_count / len(job_skills) if job_skills else 0
+        components['job_match'] = int(match_ratio * 25)
         if match_ratio < 0.5:
-            suggestions.append(f"Add these skills: {', '.join([s for s in job_skills if s.lower() not in [x.lower() for x in skills]][:5])}")
+            suggestions.append(f"Add these skills: {', '.join([s for s in job_skills if s not in features.skill_set][:5])}")
     
     # Education score (max 15)
-    education = resume_data.get('education', '')
-    if education and education != 'Not found':
-        score += 15
+    if features.has_education:
+        components['education'] = 15
     else:
+        components['education'] = 0
         suggestions.append("Add education details")
     
     # Experience score (max 15)
-    experience = resume_data.get('experience', '')
-    if experience and experience != 'Fresher':
-        score += 15
+    if features.has_experience:
+        components['experience'] = 15
     else:
+        components['experience'] = 0
         suggestions.append("Add project/internship experience")
     
     # Formatting keywords (max 20)
-    formatting_keywords = ['project', 'achievement', 'responsibility', 'technology', 'framework']
-    text = f"{education} {experience}".lower()
-    keyword_count = sum(1 for kw in formatting_keywords if kw in text)
-    score += min(keyword_count * 4, 20)
+    components['formatting'] = min(features.keyword_count * 4, 20)
     
-    return min(score, 100), suggestions
+    return min(sum(components.values()), 100), suggestions, components
@@ -1,19 +1,25 @@
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify, send_file, current_app, make_response
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from models import db, Resume, Student
 from utils.auth import student_required, hr_required
 from utils.resume_parser import parse_resume, calculate_resume_score, extract_text_from_file
-from utils.ai_engine import detect_duplicate_resume
+from utils.resume_scoring import get_resume_score as get_cached_resume_score, get_resume_scores, scoring_model_version
+from utils.resume_dedup import forget_resume
+from utils.blob_store import blob_root
+from utils.upload_stream import receive_resume_upload, UploadRejected
 from werkzeug.utils import secure_filename
 import os
-import uuid
 import json
+import mimetypes
 
 resume_bp = Blueprint('resume', __name__)
 
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc'}
 
+# Most jobs one /score/batch call may ask for
+MAX_BATCH_SCORE_JOBS = 50
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
@@ -26,30 +32,21 @@ def upload_resume():
     claims = get_jwt()
     student_id = claims.get('user_id')
     
-    # Check if file is present
-    if 'file' not in request.files:
-        return jsonify({'error': 'No file provided'}), 400
-    
-    file = request.files['file']
-    
-    if file.filename == '':
-        return jsonify({'error': 'No file selected'}), 400
-    
-    if not allowed_file(file.filename):
-        return jsonify({'error': 'Invalid file type. Allowed: PDF, DOCX, DOC'}), 400
-    
-    # Generate unique filename
-    filename = secure_filename(file.filename)
-    ext = filename.rsplit('.', 1)[1].lower()
-    unique_filename = f"{student_id}_{uuid.uuid4().hex}.{ext}"
+    # Stream the file into the blob store (identical bytes are stored once);
+    # wrong content or size is rejected before the body is fully read
+    try:
+        upload = receive_resume_upload(
+            request, ALLOWED_EXTENSIONS, current_app.config.get('RESUME_MAX_BYTES', 10 * 1024 * 1024)
+        )
+    except UploadRejected as e:
+        return jsonify({'error': e.message}), e.status
     
-    # Create upload folder if not exists
-    upload_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'static', 'uploads', 'resumes')
-    os.makedirs(upload_folder, exist_ok=True)
+    content_hash, file_path = upload['content_hash'], upload['file_path']
     
-    # Save file
-    file_path = os.path.join(upload_folder, unique_filename)
-    file.save(file_path)
+    # Keep the original name for downloads; the extension follows the sniffed content
+    ext = upload['ext']
+    filename = secure_filename(upload['filename']).rsplit('.', 1)[0] or 'resume'
+    filename = f"{filename}.{ext}"
     
     # Extract text from file
     extracted_text = extract_text_from_file(file_path)
@@ -57,12 +54,9 @@ def upload_resume():
     # Parse resume
     parsed_data = parse_resume(extracted_text)
     
-    # Check for duplicates
-    duplicates = detect_duplicate_resume(extracted_text, student_id)
-    
     # Calculate resume score
     # Get job requirements if provided
-    job_requirements = request.form.get('job_requirements')
+    job_requirements = upload['fields'].get('job_requirements')
     job_req_list = []
     if job_requirements:
         try:
@@ -70,23 +64,27 @@ def upload_resume():
         except:
             pass
     
-    score, suggestions = calculate_resume_score(parsed_data, job_req_list if job_req_list else None)
+    score, suggestions = calculate_resume_score(parsed_data, job_req_list if job_req_list else None, text=extracted_text)
     
     # Check if resume already exists for this student
     existing_resume = Resume.query.filter_by(student_id=student_id).first()
     
     if existing_resume:
         # Update existing resume
-        existing_resume.filename = unique_filename
+        # The previous blob is left to the orphan sweeper once nothing references it
+        existing_resume.filename = filename
         existing_resume.file_path = file_path
+        existing_resume.content_hash = content_hash
         existing_resume.score = score
+        existing_resume.score_model = scoring_model_version()
         existing_resume.skills = json.dumps(parsed_data['skills'])
         existing_resume.education = parsed_data['education']
         existing_resume.experience = parsed_data['experience']
-        existing_resume.is_duplicate = len(duplicates) > 0
+        existing_resume.set_text(extracted_text)
         
-        if duplicates:
-            existing_resume.duplicate_of = duplicates[0].get('student_id')
+        # Duplicate check runs in the background (resume_dedup) once the new version is stored
+        existing_resume.is_duplicate = False
+        existing_resume.duplicate_of = None
         
         db.session.commit()
         resume = existing_resume
@@ -94,17 +92,17 @@ def upload_resume():
         # Create new resume
         resume = Resume(
             student_id=student_id,
-            filename=unique_filename,
+            filename=filename,
             file_path=file_path,
+            content_hash=content_hash,
             score=score,
+            score_model=scoring_model_version(),
             skills=json.dumps(parsed_data['skills']),
             education=parsed_data['education'],
             experience=parsed_data['experience'],
-            is_duplicate=len(duplicates) > 0
+            is_duplicate=False
         )
-        
-        if duplicates:
-            resume.duplicate_of = duplicates[0].get('student_id')
+        resume.set_text(extracted_text)
         
         db.session.add(resume)
         db.session.commit()
@@ -115,7 +113,8 @@ def upload_resume():
         'parsed_data': parsed_data,
         'score': score,
         'suggestions': suggestions,
-        'duplicates': duplicates
+        'duplicates': [],
+        'duplicate_check': 'pending'
     }), 201
 
 # ==================== RESUME SCORE ====================
@@ -132,19 +131,13 @@ def get_resume_score():
     if not resume:
         return jsonify({'error': 'No resume uploaded'}), 404
     
-    # Get resume data
-    parsed_data = {
-        'skills': json.loads(resume.skills) if resume.skills else [],
-        'education': resume.education,
-        'experience': resume.experience
-    }
-    
-    # Calculate score with suggestions
-    score, suggestions = calculate_resume_score(parsed_data)
+    # Cached until the resume or the scoring rules change
+    score, suggestions, components = get_cached_resume_score(resume)
     
     return jsonify({
         'resume': resume.to_dict(),
         'score': score,
+        'components': components,
         'suggestions': suggestions
     })
 
@@ -167,25 +160,65 @@ def get_resume_score_for_job(job_id):
     if not job:
         return jsonify({'error': 'Job not found'}), 404
     
-    job_skills = [skill.skill_name for skill in job.skills]
-    
-    # Get resume data
-    parsed_data = {
-        'skills': json.loads(resume.skills) if resume.skills else [],
-        'education': resume.education,
-        'experience': resume.experience
-    }
-    
-    # Calculate score with job-specific suggestions
-    score, suggestions = calculate_resume_score(parsed_data, job_skills)
+    # Cached until the resume, the job's skills or the scoring rules change
+    score, suggestions, components = get_cached_resume_score(resume, job)
     
     return jsonify({
         'resume': resume.to_dict(),
         'score': score,
+        'components': components,
         'suggestions': suggestions,
         'job_title': job.title
     })
 
+@resume_bp.route('/score/batch', methods=['POST'])
+@student_required
+def get_resume_scores_for_jobs():
+    """Score the current student's resume against several jobs in one call"""
+    from models import Job
+    from sqlalchemy.orm import selectinload
+    
+    claims = get_jwt()
+    student_id = claims.get('user_id')
+    
+    data = request.get_json(silent=True) or {}
+    job_ids = data.get('job_ids')
+    if not isinstance(job_ids, list) or not job_ids:
+        return jsonify({'error': 'job_ids must be a non-empty list'}), 400
+    try:
+        job_ids = list(dict.fromkeys(int(job_id) for job_id in job_ids))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'job_ids must be integers'}), 400
+    if len(job_ids) > MAX_BATCH_SCORE_JOBS:
+        return jsonify({'error': f'At most {MAX_BATCH_SCORE_JOBS} jobs per request'}), 400
+    
+    resume = Resume.query.filter_by(student_id=student_id).first()
+    
+    if not resume:
+        return jsonify({'error': 'No resume uploaded'}), 404
+    
+    jobs = Job.query.options(selectinload(Job.skills)).filter(Job.id.in_(job_ids)).all()
+    jobs_by_id = {job.id: job for job in jobs}
+    scores = get_resume_scores(resume, jobs)
+    
+    results = []
+    for job_id in job_ids:
+        if job_id not in jobs_by_id:
+            continue
+        score, suggestions, components = scores[job_id]
+        results.append({
+            'job_id': job_id,
+            'job_title': jobs_by_id[job_id].title,
+            'score': score,
+            'components': components,
+            'suggestions': suggestions
+        })
+    
+    return jsonify({
+        'scores': results,
+        'not_found': [job_id for job_id in job_ids if job_id not in jobs_by_id]
+    })
+
 # ==================== RESUME DOWNLOAD ====================
 
 @resume_bp.route('/download/<int:student_id>', methods=['GET'])
@@ -200,11 +233,39 @@ def download_resume(student_id):
     if not os.path.exists(resume.file_path):
         return jsonify({'error': 'Resume file not found on server'}), 404
     
-    return send_file(
-        resume.file_path,
-        as_attachment=True,
-        download_name=resume.filename
-    )
+    # Blobs are immutable, so their content hash is a strong ETag
+    if current_app.config.get('RESUME_SENDFILE_MODE') == 'x-accel' and resume.content_hash:
+        response = accel_redirect_response(resume)
+    else:
+        # Handles If-None-Match (304) and Range (206); with USE_X_SENDFILE it emits X-Sendfile
+        response = send_file(
+            resume.file_path,
+            as_attachment=True,
+            download_name=resume.filename,
+            etag=resume.content_hash or True,
+            conditional=True
+        )
+    
+    # Downloads are per HR user; revalidate every time, a 304 costs nothing
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def accel_redirect_response(resume):
+    """
+    Let nginx stream the blob through an internal location
+    The proxy serves Range requests itself; conditional GETs are answered here
+    """
+    if request.if_none_match.contains(resume.content_hash):
+        response = make_response('', 304)
+    else:
+        response = make_response('')
+        relative_path = os.path.relpath(resume.file_path, blob_root()).replace(os.sep, '/')
+        response.headers['X-Accel-Redirect'] = current_app.config.get('RESUME_ACCEL_PREFIX', '/protected/resumes/') + relative_path
+        response.headers.set('Content-Disposition', 'attachment', filename=resume.filename)
+        response.headers['Accept-Ranges'] = 'bytes'
+        response.content_type = mimetypes.guess_type(resume.filename)[0] or 'application/octet-stream'
+    response.set_etag(resume.content_hash)
+    return response
 
 # ==================== RESUME DATA ====================
 
@@ -238,14 +299,15 @@ def delete_resume():
     if not resume:
         return jsonify({'error': 'No resume uploaded'}), 404
     
-    # Delete file from server
-    if os.path.exists(resume.file_path):
+    # Delete file from server; blobs may be shared and are left to the orphan sweeper
+    if not resume.content_hash and os.path.exists(resume.file_path):
         try:
             os.remove(resume.file_path)
         except:
             pass
     
     # Delete from database
+    forget_resume(resume)
     db.session.delete(resume)
     db.session.commit()
     
@@ -0,0 +1,295 @@
+"""
+Resume Scoring - memoized resume scores per (resume version, job) and
+background re-scoring when the scoring model changes
+Team Arena: Skill-Link Platform
+"""
+
+from models import db, Resume, ResumeScore
+from utils.resume_parser import (
+    calculate_resume_score, extract_text_from_file, parse_resume, resume_features,
+    score_resume_features, SCORING_RULES_VERSION
+)
+from utils.taxonomy import taxonomy_version
+from collections import OrderedDict
+from datetime import datetime
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+
+# job_id used for the general (not job specific) score
+GENERAL_SCORE_JOB_ID = 0
+
+def scoring_model_version():
+    """Scoring rules plus the taxonomy they read; a change to either makes scores stale"""
+    return f"{SCORING_RULES_VERSION}:{taxonomy_version()}"
+
+def job_skills_key(job_skills):
+    """Stable fingerprint of a job's skill list, so edits to it invalidate cached scores"""
+    normalized = sorted({s.lower() for s in job_skills})
+    return hashlib.sha1('\n'.join(normalized).encode('utf-8')).hexdigest()
+
+# ==================== PARSED RESUME CACHE ====================
+
+class LRUCache:
+    """Small thread-safe LRU for per-process caches"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+_features_cache = LRUCache(int(os.environ.get('RESUME_FEATURE_CACHE_SIZE', 2048)))
+
+def get_resume_features(resume):
+    """
+    Compact scoring view of a resume (skill set, section flags, keyword count)
+    Kept in a process-local LRU keyed by resume version and scoring model, so
+    the skills JSON and compressed text are decoded once per upload or re-score
+    """
+    key = (resume.id, resume.version, resume.score_model)
+    features = _features_cache.get(key)
+    if features is None:
+        parsed_data = {
+            'skills': json.loads(resume.skills) if resume.skills else [],
+            'education': resume.education,
+            'experience': resume.experience
+        }
+        features = resume_features(parsed_data, text=resume.get_text())
+        _features_cache.put(key, features)
+    return features
+
+# ==================== MEMOIZED SCORES ====================
+
+def get_resume_score(resume, job=None):
+    """
+    Get the resume score, optionally against a job
+    Served from resume_scores unless the resume, the job's skills or the
+    scoring rules changed since it was computed
+    Returns: (score, suggestions, components)
+    """
+    return get_resume_scores(resume, [job])[job.id if job else GENERAL_SCORE_JOB_ID]
+
+def _upsert_scores(rows):
+    """
+    Write resume_scores rows with INSERT ... ON CONFLICT (resume_id, job_id)
+    DO UPDATE, so concurrent first requests for the same pair can't collide
+    Other dialects update first and insert inside a savepoint
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        insert = None
+
+    if insert is not None:
+        statement = insert(ResumeScore).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=['resume_id', 'job_id'],
+            set_={column: statement.excluded[column] for column in rows[0] if column not in ('resume_id', 'job_id')}
+        )
+        db.session.execute(statement)
+        return
+
+    for row in rows:
+        key = {'resume_id': row['resume_id'], 'job_id': row['job_id']}
+        if ResumeScore.query.filter_by(**key).update(row, synchronize_session=False):
+            continue
+        try:
+            with db.session.begin_nested():
+                db.session.execute(ResumeScore.__table__.insert().values(row))
+        except IntegrityError:
+            # Another request inserted it first
+            ResumeScore.query.filter_by(**key).update(row, synchronize_session=False)
+
+def get_resume_scores(resume, jobs):
+    """
+    Score one resume against several jobs (None = general score)
+    Cached scores are read in one query, misses share one feature lookup and
+    are upserted in one commit
+    Returns: dict of job_id -> (score, suggestions, components)
+    """
+    model_version = scoring_model_version()
+    targets = {job.id if job else GENERAL_SCORE_JOB_ID: job for job in jobs}
+    cached_rows = {
+        row.job_id: row
+        for row in ResumeScore.query.filter(ResumeScore.resume_id == resume.id, ResumeScore.job_id.in_(list(targets)))
+    }
+
+    results = {}
+    writes = []
+    for job_id, job in targets.items():
+        job_skills = [skill.skill_name for skill in job.skills] if job else []
+        skills_key = job_skills_key(job_skills) if job else ''
+
+        cached = cached_rows.get(job_id)
+        if (cached
+                and cached.resume_version == resume.version
+                and cached.job_skills_key == skills_key
+                and cached.model_version == model_version):
+            results[job_id] = (cached.score, json.loads(cached.suggestions or '[]'), json.loads(cached.components or '{}'))
+            continue
+
+        score, suggestions, components = score_resume_features(get_resume_features(resume), job_skills or None)
+
+        writes.append({
+            'resume_id': resume.id,
+            'job_id': job_id,
+            'resume_version': resume.version,
+            'job_skills_key': skills_key,
+            'model_version': model_version,
+            'score': score,
+            'suggestions': json.dumps(suggestions),
+            'components': json.dumps(components),
+            'computed_at': datetime.utcnow()
+        })
+
+        results[job_id] = (score, suggestions, components)
+
+    if writes:
+        _upsert_scores(writes)
+        db.session.commit()
+
+    return results
+
+# ==================== BACKGROUND RE-SCORING ====================
+
+# score_model of resumes a pass could not re-score (no stored text or file)
+SKIPPED_PREFIX = 'skipped:'
+
+def load_rescore_state(state_path):
+    """Re-score progress: model being applied, last resume id done, pause flag"""
+    if os.path.exists(state_path):
+        with open(state_path, encoding='utf-8') as f:
+            return json.load(f)
+    return {'model': None, 'last_id': 0, 'rescored': 0, 'paused': False, 'finished': False}
+
+def save_rescore_state(state_path, state):
+    """Write progress atomically so a crash never leaves a torn file"""
+    os.makedirs(os.path.dirname(os.path.abspath(state_path)), exist_ok=True)
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_path)
+
+def set_rescore_paused(state_path, paused):
+    """Pause or resume the re-score job; a running pass stops after its current batch"""
+    state = load_rescore_state(state_path)
+    state['paused'] = paused
+    save_rescore_state(state_path, state)
+    return state
+
+def rescore_resume(resume, model_version):
+    """
+    Re-parse a resume's stored text and recompute its general score
+    Resumes stored before text was kept are extracted from their file once
+    Written with a version check so a concurrent re-upload is never overwritten
+    Resumes with neither text nor file are marked skipped for this model
+    Returns: True if the row was re-scored
+    """
+    text = resume.get_text()
+    values = {}
+    if not text:
+        if not os.path.exists(resume.file_path):
+            # Later passes of this model leave it alone; a re-upload resets it
+            Resume.query.filter_by(id=resume.id, version=resume.version).update(
+                {'score_model': SKIPPED_PREFIX + model_version}, synchronize_session=False
+            )
+            return False
+        text = extract_text_from_file(resume.file_path)
+        values['text_compressed'] = zlib.compress(text.encode('utf-8'))
+        values['version'] = (resume.version or 0) + 1
+
+    parsed_data = parse_resume(text)
+    score, _ = calculate_resume_score(parsed_data, text=text)
+    values.update({
+        'score': score,
+        'skills': json.dumps(parsed_data['skills']),
+        'education': parsed_data['education'],
+        'experience': parsed_data['experience'],
+        'score_model': model_version
+    })
+
+    updated = Resume.query.filter_by(id=resume.id, version=resume.version).update(values, synchronize_session=False)
+    return updated == 1
+
+def run_rescore(state_path, batch_size=100, rate=20, max_batches=None):
+    """
+    Re-score resumes whose score came from an older scoring model
+    Walks resumes in id order at most rate resumes per second. Each resume
+    is committed before the throttle sleeps, so the database write lock is
+    never held while waiting; progress is checkpointed after every batch, and a pause
+    (set_rescore_paused) takes effect at the next batch boundary. A finished
+    pass rewinds to id 0, so the next run catches rows written late with an
+    older model
+    Returns: the saved state
+    """
+    model_version = scoring_model_version()
+    state = load_rescore_state(state_path)
+    if state.get('model') != model_version:
+        state = {'model': model_version, 'last_id': 0, 'rescored': 0, 'paused': state.get('paused', False), 'finished': False}
+        save_rescore_state(state_path, state)
+
+    batches = 0
+    while not state['paused']:
+        batch = Resume.query.filter(
+            Resume.id > state['last_id'],
+            or_(Resume.score_model.is_(None),
+                Resume.score_model.notin_([model_version, SKIPPED_PREFIX + model_version]))
+        ).order_by(Resume.id).limit(batch_size).all()
+        # Detach so per-resume commits don't expire (and reload) the rest
+        for resume in batch:
+            db.session.expunge(resume)
+
+        if not batch:
+            state['finished'] = True
+            state['last_id'] = 0
+            save_rescore_state(state_path, state)
+            break
+
+        started = time.monotonic()
+        for count, resume in enumerate(batch, 1):
+            if rescore_resume(resume, model_version):
+                state['rescored'] += 1
+            db.session.commit()
+            # Throttle: never run ahead of rate resumes per second
+            if rate:
+                delay = started + count / rate - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+
+        state['last_id'] = batch[-1].id
+        state['finished'] = False
+        # Pick up a pause requested while this batch ran
+        state['paused'] = load_rescore_state(state_path).get('paused', False)
+        save_rescore_state(state_path, state)
+
+        batches += 1
+        if max_batches and batches >= max_batches:
+            break
+
+    return state
@@ -0,0 +1,53 @@
+"""
+Schema Upgrade - bring an existing database up to the current models
+db.create_all() only creates missing tables; this also adds the columns
+and indexes that later releases added to existing tables. Idempotent: run
+it after every upgrade (flask upgrade-db, also part of flask init-db)
+Team Arena: Skill-Link Platform
+"""
+
+from models import db
+from sqlalchemy import inspect, text
+
+def _column_ddl(column, dialect):
+    """Column definition for ALTER TABLE ... ADD COLUMN"""
+    ddl = f"{dialect.identifier_preparer.quote(column.name)} {column.type.compile(dialect=dialect)}"
+    default = column.default.arg if column.default is not None and column.default.is_scalar else None
+    if column.server_default is not None:
+        ddl += f" DEFAULT {column.server_default.arg}"
+    elif default is not None:
+        # Existing rows get the model default instead of NULL
+        ddl += f" DEFAULT {column.type.literal_processor(dialect)(default)}"
+    elif not column.nullable:
+        raise RuntimeError(f"Can't add NOT NULL column {column.table.name}.{column.name} without a default")
+    return ddl
+
+def upgrade_schema():
+    """
+    Create missing tables, then add missing columns and indexes
+    Added columns are nullable at the database level (existing rows have no
+    value); the models supply defaults for new rows
+    Returns: list of 'table.column' / index names that were added
+    """
+    db.create_all()
+    inspector = inspect(db.engine)
+    dialect = db.engine.dialect
+    added = []
+
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    connection.execute(text(
+                        f"ALTER TABLE {dialect.identifier_preparer.quote(table.name)} ADD COLUMN {_column_ddl(column, dialect)}"
+                    ))
+                    added.append(f"{table.name}.{column.name}")
+
+            indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(connection)
+                    added.append(index.name)
+
+    return added
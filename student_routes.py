@@ -1,9 +1,10 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, get_jwt
-from models import db, Student, StudentSkill, Resume, Application, Job, JobSkill, SavedJob, Internship, BusinessJob, SkillTest, SKILL_DEMAND
+from models import db, Student, StudentSkill, Resume, Application, Job, JobSkill, SavedJob, Internship, BusinessJob, SkillTest
 from utils.auth import student_required, validate_email, validate_password
 from utils.ai_engine import get_recommended_jobs, get_missing_skills, get_learning_paths_for_missing_skills
 from utils.analytics import get_student_analytics
+from utils.taxonomy import get_taxonomy
 import os
 import random
 
@@ -317,14 +318,15 @@ def get_skill_demand():
     # Get student's skills
     student_skills = [s.skill_name for s in StudentSkill.query.filter_by(student_id=student_id).all()]
     
+    taxonomy = get_taxonomy()
     high_demand = []
     low_demand = []
     neutral = []
     
     for skill in student_skills:
-        if skill in SKILL_DEMAND['high_demand']:
+        if skill.lower() in taxonomy.high_demand_lower:
             high_demand.append(skill)
-        elif skill in SKILL_DEMAND['low_demand']:
+        elif skill.lower() in taxonomy.low_demand_lower:
             low_demand.append(skill)
         else:
             neutral.append(skill)
@@ -333,8 +335,8 @@ def get_skill_demand():
         'high_demand_skills': high_demand,
         'low_demand_skills': low_demand,
         'neutral_skills': neutral,
-        'all_high_demand': SKILL_DEMAND['high_demand'][:10],
-        'all_low_demand': SKILL_DEMAND['low_demand'][:5]
+        'all_high_demand': list(taxonomy.high_demand[:10]),
+        'all_low_demand': list(taxonomy.low_demand[:5])
     })
 
 # ==================== ROLE SUGGESTIONS ====================
@@ -350,16 +352,7 @@ def get_role_suggestions():
     student_skills = [s.skill_name.lower() for s in StudentSkill.query.filter_by(student_id=student_id).all()]
     
     # Role definitions
-    roles = {
-        'Frontend Developer': ['html', 'css', 'javascript', 'react', 'angular', 'vue', 'bootstrap'],
-        'Backend Developer': ['python', 'java', 'node.js', 'django', 'flask', 'express', 'sql'],
-        'Full Stack Developer': ['javascript', 'react', 'node.js', 'python', 'sql', 'mongodb'],
-        'Data Analyst': ['python', 'sql', 'excel', 'tableau', 'data analysis'],
-        'Machine Learning Engineer': ['python', 'machine learning', 'tensorflow', 'deep learning', 'data science'],
-        'DevOps Engineer': ['aws', 'docker', 'kubernetes', 'jenkins', 'git', 'linux'],
-        'Mobile Developer': ['flutter', 'kotlin', 'swift', 'react native'],
-        'Cloud Engineer': ['aws', 'azure', 'gcp', 'docker', 'kubernetes']
-    }
+    roles = get_taxonomy().roles
     
     suggestions = []
     for role, required_skills in roles.items():
@@ -0,0 +1,109 @@
+"""
+Skill Taxonomy - skills, keywords, learning paths, demand and role data
+Loaded from taxonomy.json, compiled once, and reloaded when the file changes
+Team Arena: Skill-Link Platform
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+TAXONOMY_PATH = os.environ.get(
+    'TAXONOMY_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'taxonomy.json')
+)
+
+# How often get_taxonomy() stats the file for changes (seconds)
+RELOAD_CHECK_INTERVAL = float(os.environ.get('TAXONOMY_RELOAD_INTERVAL', 5))
+
+def _keyword_pattern(keywords):
+    """Plain substring alternation, longest first"""
+    ordered = sorted(set(keywords), key=len, reverse=True)
+    return re.compile('|'.join(re.escape(k) for k in ordered), re.IGNORECASE)
+
+# Word tokens of lowercased text; digits split off so 'html5' yields 'html'
+SKILL_TOKEN_PATTERN = re.compile(r'[a-z+#]+')
+
+def _phrase_pattern(phrases):
+    """Whole-word match for multi-token skills ('rest api', 'node.js')"""
+    ordered = sorted(set(phrases), key=len, reverse=True)
+    return re.compile(r'(?<![a-z])(?:%s)(?![a-z])' % '|'.join(re.escape(p) for p in ordered))
+
+class Taxonomy:
+    """Immutable compiled view of one taxonomy.json revision"""
+
+    def __init__(self, data, version, mtime):
+        self.version = version
+        self.mtime = mtime
+
+        # Single-token skills are found with a set lookup, the rest with one regex
+        self.skills = tuple(s.lower() for s in data['skills'])
+        self.token_skills = frozenset(s for s in self.skills if SKILL_TOKEN_PATTERN.fullmatch(s))
+        self.phrase_pattern = _phrase_pattern(s for s in self.skills if s not in self.token_skills)
+
+        self.education_keywords = tuple(data['education_keywords'])
+        self.education_pattern = _keyword_pattern(self.education_keywords)
+        self.experience_keywords = tuple(data['experience_keywords'])
+        self.experience_pattern = _keyword_pattern(self.experience_keywords)
+
+        self.learning_paths = {k.lower(): v for k, v in data['learning_paths'].items()}
+
+        self.high_demand = tuple(data['skill_demand']['high_demand'])
+        self.low_demand = tuple(data['skill_demand']['low_demand'])
+        self.high_demand_lower = frozenset(s.lower() for s in self.high_demand)
+        self.low_demand_lower = frozenset(s.lower() for s in self.low_demand)
+
+        self.roles = {role: tuple(s.lower() for s in skills) for role, skills in data['roles'].items()}
+
+    def find_skills(self, text):
+        """
+        Skills mentioned in text as whole words ('go' is not found in 'good'),
+        title-cased, in taxonomy order
+        """
+        text_lower = text.lower()
+        found = set(self.token_skills.intersection(SKILL_TOKEN_PATTERN.findall(text_lower)))
+        found.update(self.phrase_pattern.findall(text_lower))
+        return [skill.title() for skill in self.skills if skill in found]
+
+def load_taxonomy(path=None):
+    """Read and compile a taxonomy file; the version is a hash of its contents"""
+    path = path or TAXONOMY_PATH
+    with open(path, 'rb') as f:
+        raw = f.read()
+    mtime = os.path.getmtime(path)
+    return Taxonomy(json.loads(raw.decode('utf-8')), hashlib.sha1(raw).hexdigest()[:12], mtime)
+
+_current = load_taxonomy()
+_last_check = time.monotonic()
+_reload_lock = threading.Lock()
+
+def reload_taxonomy(force=False):
+    """
+    Swap in a freshly compiled taxonomy if the file changed
+    A broken file is reported and the previous taxonomy stays active
+    """
+    global _current
+    with _reload_lock:
+        try:
+            if not force and os.path.getmtime(TAXONOMY_PATH) == _current.mtime:
+                return _current
+            _current = load_taxonomy()
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Taxonomy reload error: {e}")
+    return _current
+
+def get_taxonomy():
+    """Current taxonomy, checking the file for changes at most every RELOAD_CHECK_INTERVAL seconds"""
+    global _last_check
+    now = time.monotonic()
+    if now - _last_check >= RELOAD_CHECK_INTERVAL:
+        _last_check = now
+        return reload_taxonomy()
+    return _current
+
+def taxonomy_version():
+    """Version string of the active taxonomy, for keying caches"""
+    return get_taxonomy().version
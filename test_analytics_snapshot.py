@@ -0,0 +1,85 @@
+"""
+Analytics reads: served from the snapshot while it is fresh, from the
+live database when it is missing, stale or not a snapshot at all
+"""
+
+import shutil
+import sqlite3
+import time
+import pytest
+from config import TestingConfig
+from app import create_app
+from models import db, Application
+from utils.analytics_snapshot import refresh_snapshot, analytics_reads
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    # Snapshots copy a database file: replaces the in-memory conftest app
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'live.db'}")
+    app = create_app('testing')
+    app.config['ANALYTICS_SNAPSHOT_PATH'] = str(tmp_path / 'snapshot.db')
+    app.config['ANALYTICS_MAX_STALENESS'] = 300
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def job(make_hr, make_student, make_job):
+    job = make_job(make_hr())
+    db.session.add(Application(student_id=make_student().id, job_id=job.id))
+    db.session.commit()
+    return job
+
+def add_application(job, make_student):
+    db.session.add(Application(student_id=make_student().id, job_id=job.id))
+    db.session.commit()
+
+def read_count():
+    with analytics_reads() as freshness:
+        return freshness, Application.query.count()
+
+def test_fresh_snapshot_is_read_instead_of_live(app, job, make_student):
+    as_of = refresh_snapshot()
+    add_application(job, make_student)
+
+    freshness, count = read_count()
+    assert freshness['source'] == 'snapshot'
+    assert freshness['as_of'] == as_of.isoformat()
+    assert count == 1
+    # The live session is back once the block ends
+    assert Application.query.count() == 2
+
+def test_missing_snapshot_reads_live(app, job):
+    freshness, count = read_count()
+    assert freshness['source'] == 'live'
+    assert freshness['staleness_seconds'] == 0
+    assert count == 1
+
+def test_stale_snapshot_reads_live(app, job, make_student):
+    refresh_snapshot()
+    add_application(job, make_student)
+    with sqlite3.connect(app.config['ANALYTICS_SNAPSHOT_PATH']) as snapshot:
+        snapshot.execute('UPDATE snapshot_meta SET taken_at = ?', (time.time() - 301,))
+
+    freshness, count = read_count()
+    assert freshness['source'] == 'live'
+    assert count == 2
+
+def test_file_without_snapshot_meta_reads_live(app, job, tmp_path):
+    db.session.remove()
+    shutil.copy(tmp_path / 'live.db', app.config['ANALYTICS_SNAPSHOT_PATH'])
+
+    freshness, count = read_count()
+    assert freshness['source'] == 'live'
+    assert count == 1
+
+def test_export_header_reports_the_snapshot_time(app, job, make_student, auth_headers):
+    as_of = refresh_snapshot()
+    add_application(job, make_student)
+
+    response = app.test_client().get(f'/api/hr/jobs/{job.id}/export', headers=auth_headers(job.hr, 'hr'))
+    assert response.headers['X-Data-As-Of'] == as_of.isoformat()
+    # Header row plus the one application the snapshot holds
+    assert len(response.get_data(as_text=True).strip().splitlines()) == 2
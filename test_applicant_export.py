@@ -0,0 +1,88 @@
+"""
+Applicant CSV export: row contents, batching and a query count that
+does not grow with the number of applicants
+"""
+
+import csv
+import io
+from datetime import datetime
+from sqlalchemy import event
+from models import db, Application, Resume
+from utils import analytics
+from utils.analytics import stream_applicants_csv, iter_applicant_rows, EXPORT_COLUMNS
+
+def apply(student, job, **fields):
+    db.session.add(Application(student_id=student.id, job_id=job.id, **fields))
+    db.session.commit()
+
+def parse(chunks):
+    return list(csv.reader(io.StringIO(''.join(chunks))))
+
+def test_rows_follow_the_export_columns(make_hr, make_student, make_job):
+    hr = make_hr()
+    job, other = make_job(hr), make_job(hr)
+    asha = make_student(name='Asha', branch='ECE', grad_year=2026, cgpa=8.7, skills=['Python', 'SQL'])
+    ravi = make_student(name='Ravi')
+    db.session.add_all([
+        Resume(student_id=asha.id, filename='a.pdf', file_path='/a.pdf', score=81),
+        Resume(student_id=asha.id, filename='b.pdf', file_path='/b.pdf', score=40)
+    ])
+    apply(asha, job, match_percentage=66.666, status='Shortlisted', applied_at=datetime(2025, 3, 4, 10))
+    apply(ravi, job)
+    apply(ravi, other)
+
+    rows = parse(stream_applicants_csv(job.id))
+    assert rows[0] == EXPORT_COLUMNS
+    assert rows[1] == ['Asha', asha.email, 'ECE', '2026', '8.7', 'Python, SQL', '81', '66.67', 'Shortlisted', '2025-03-04']
+    assert rows[2][0] == 'Ravi'
+    assert rows[2][6:9] == ['0', '0', 'Applied']
+    assert len(rows) == 3
+
+def test_stream_yields_a_chunk_per_batch(monkeypatch, make_hr, make_student, make_job):
+    monkeypatch.setattr(analytics, 'EXPORT_BATCH_SIZE', 2)
+    job = make_job(make_hr())
+    for _ in range(5):
+        apply(make_student(skills=['Go']), job)
+
+    chunks = list(stream_applicants_csv(job.id))
+    assert len(chunks) == 3
+    assert len(parse(chunks)) == 6
+
+def count_queries(job_id):
+    statements = []
+    def record(*args):
+        statements.append(args[2])
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        list(iter_applicant_rows(job_id))
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    return len(statements)
+
+def test_query_count_does_not_grow_with_applicants(make_hr, make_student, make_job):
+    hr = make_hr()
+    small, large = make_job(hr), make_job(hr)
+    for job, applicants in ((small, 2), (large, 12)):
+        for _ in range(applicants):
+            student = make_student(skills=['Python'])
+            db.session.add(Resume(student_id=student.id, filename='cv.pdf', file_path='/cv.pdf', score=50))
+            apply(student, job)
+    db.session.expire_all()
+
+    assert count_queries(large.id) == count_queries(small.id)
+
+def test_export_route(app, auth_headers, make_hr, make_student, make_job):
+    hr = make_hr()
+    job = make_job(hr, title='Data Engineer')
+    apply(make_student(skills=['C', 'C++']), job)
+    client = app.test_client()
+    url = f'/api/hr/jobs/{job.id}/export'
+
+    response = client.get(url, headers=auth_headers(hr, 'hr'))
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    assert 'Data_Engineer_applicants.csv' in response.headers['Content-Disposition']
+    assert parse([response.get_data(as_text=True)])[1][5] == 'C, C++'
+
+    assert client.get(url, headers=auth_headers(make_hr(), 'hr')).status_code == 403
+    assert client.get('/api/hr/jobs/999999/export', headers=auth_headers(hr, 'hr')).status_code == 404
@@ -0,0 +1,28 @@
+"""
+Background tasks start only where enabled, and only one process holds each
+task's lock
+"""
+
+import pytest
+from app import create_app
+from utils import background
+
+def test_create_app_starts_no_tasks_by_default(monkeypatch):
+    started = []
+    monkeypatch.setattr(background, '_tasks', {})
+    monkeypatch.setattr('app.start_interval_task', lambda app, name, *args, **kwargs: started.append(name))
+
+    create_app('production')
+    assert started == []
+
+@pytest.mark.skipif(not background.FCNTL_AVAILABLE, reason='needs fcntl')
+def test_task_lock_is_exclusive(app, tmp_path):
+    app.instance_path = str(tmp_path)
+    first = background._acquire_task_lock(app, 'rescore')
+    assert first
+    # Same as a second worker process: its own open file can't take the lock
+    assert background._acquire_task_lock(app, 'rescore') is None
+    assert background._acquire_task_lock(app, 'expiry')
+
+    first.close()
+    assert background._acquire_task_lock(app, 'rescore')
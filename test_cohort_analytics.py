@@ -0,0 +1,93 @@
+"""
+Cohort metrics against hand-computed values, and cache invalidation from
+writes made outside this process
+"""
+
+import pandas as pd
+import pytest
+from models import db, Application
+from utils import cohort_analytics
+from utils.cohort_analytics import _compute, get_cohort_analytics, MIN_SKILL_SUPPORT
+
+# Ten CSE 2025 applicants, one application each: 0-4 shortlisted (0 also
+# selected, at 90% match), 5-9 not; 0-4 have CGPA 8.5, 5-9 have 6.5
+STATUSES = ['Selected'] + ['Shortlisted'] * 4 + ['Applied'] * 5
+SKILL_HOLDERS = {
+    'python': [0, 1, 2, 3, 4, 5],   # phi = (0.5 - 0.6*0.5) / sqrt(0.6*0.4*0.5*0.5) = 0.816
+    'sql': [0, 1, 2, 5, 6],         # phi = (0.3 - 0.5*0.5) / sqrt(0.5*0.5*0.5*0.5) = 0.2
+    'rare': [0, 1, 2, 3],           # phi 0.816, but held by fewer than MIN_SKILL_SUPPORT
+    'java': [5, 6, 7, 8, 9]         # phi = -1: not a shortlisting skill
+}
+
+def frames():
+    apps = pd.DataFrame({
+        'student_id': range(10),
+        'status': STATUSES,
+        'match_percentage': [90.0] + [70.0] * 9,
+        'branch': ['CSE'] * 10,
+        'grad_year': [2025] * 10,
+        'cgpa': [8.5] * 5 + [6.5] * 5
+    })
+    skills = pd.DataFrame(
+        [(student, skill) for skill, holders in SKILL_HOLDERS.items() for student in holders],
+        columns=['student_id', 'skill']
+    )
+    return apps, skills
+
+def test_compute_matches_hand_computed_metrics():
+    assert len(SKILL_HOLDERS['rare']) < MIN_SKILL_SUPPORT <= len(SKILL_HOLDERS['sql'])
+    result = _compute(*frames())
+
+    cohort, = result['by_branch']
+    by_year, = result['by_grad_year']
+    assert by_year == {**{key: value for key, value in cohort.items() if key != 'branch'}, 'grad_year': 2025}
+    assert cohort['branch'] == 'CSE'
+    assert (cohort['students'], cohort['applications']) == (10, 10)
+    assert (cohort['shortlist_rate'], cohort['selection_rate']) == (50.0, 10.0)
+    assert (cohort['avg_cgpa'], cohort['avg_match_selected']) == (7.5, 90.0)
+    assert cohort['cgpa_distribution'] == [
+        {'band': '<6', 'students': 0, 'selection_rate': None},
+        {'band': '6-7', 'students': 5, 'selection_rate': 0.0},
+        {'band': '7-8', 'students': 0, 'selection_rate': None},
+        {'band': '8-9', 'students': 5, 'selection_rate': 20.0},
+        {'band': '9-10', 'students': 0, 'selection_rate': None}
+    ]
+    # Ranked by phi; 'rare' lacks support and 'java' correlates negatively
+    assert cohort['shortlisting_skills'] == [
+        {'skill': 'Python', 'correlation': 0.816, 'applicants': 6},
+        {'skill': 'Sql', 'correlation': 0.2, 'applicants': 5}
+    ]
+
+@pytest.fixture
+def hr_with_applicants(make_hr, make_student, make_job):
+    # Ids repeat across tests on a fresh database
+    cohort_analytics._cache.clear()
+    hr = make_hr()
+    job = make_job(hr)
+    for _ in range(3):
+        db.session.add(Application(student_id=make_student(cgpa=8.0).id, job_id=job.id))
+    db.session.commit()
+    return hr, job
+
+def test_cache_follows_writes_from_other_processes(hr_with_applicants, make_student):
+    hr, job = hr_with_applicants
+    first = get_cohort_analytics(hr.id)
+    assert get_cohort_analytics(hr.id) is first
+    assert first['by_branch'][0]['students'] == 3
+
+    # Written on another connection, as by another worker or a CLI import
+    student = make_student()
+    with db.engine.begin() as connection:
+        connection.execute(Application.__table__.insert().values(student_id=student.id, job_id=job.id, status='Applied'))
+    assert get_cohort_analytics(hr.id)['by_branch'][0]['students'] == 4
+
+def test_cache_entries_expire(monkeypatch, hr_with_applicants):
+    hr, _ = hr_with_applicants
+    first = get_cohort_analytics(hr.id)
+    # Profile edits aren't in the data version; the TTL bounds how long they are missed
+    Application.query.first().student.cgpa = 6.0
+    db.session.commit()
+    assert get_cohort_analytics(hr.id) is first
+
+    monkeypatch.setattr(cohort_analytics, 'COHORT_CACHE_TTL', 0)
+    assert get_cohort_analytics(hr.id)['by_branch'][0]['avg_cgpa'] == pytest.approx(7.33)
@@ -0,0 +1,72 @@
+"""
+The expiry sweep deactivates exactly the active postings whose expiry date
+has passed, and announces them once committed
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from models import db, Job, Internship, BusinessJob
+from utils.expiry import expire_postings, postings_expired
+
+NOW = datetime(2026, 3, 1, 12, 0)
+
+@pytest.fixture
+def announced():
+    received = []
+
+    def receiver(table, ids, count):
+        received.append((table, sorted(ids) if ids is not None else None, count))
+
+    postings_expired.connect(receiver)
+    yield received
+    postings_expired.disconnect(receiver)
+
+def seed_postings(hr, make_job):
+    """One posting per expiry case in each table; returns the ids that should expire"""
+    cases = {
+        'past': (NOW - timedelta(days=1), True),
+        'just_past': (NOW - timedelta(seconds=1), True),
+        'future': (NOW + timedelta(days=1), True),
+        'no_expiry': (None, True),
+        'already_inactive': (NOW - timedelta(days=1), False)
+    }
+    expiring = {'jobs': [], 'internships': [], 'business_jobs': []}
+    for case, (expiry_date, is_active) in cases.items():
+        postings = {
+            'jobs': make_job(hr, expiry_date=expiry_date, is_active=is_active),
+            'internships': Internship(hr_id=hr.id, title=case, company='Co', description='d', branch='CSE',
+                                      expiry_date=expiry_date, is_active=is_active),
+            'business_jobs': BusinessJob(hr_id=hr.id, title=case, company='Co', description='d', job_type='Full-time',
+                                         branch='CSE', expiry_date=expiry_date, is_active=is_active)
+        }
+        db.session.add_all(postings.values())
+        db.session.commit()
+        if case in ('past', 'just_past'):
+            for table, posting in postings.items():
+                expiring[table].append(posting.id)
+    return expiring
+
+def active_ids(model):
+    return {posting.id for posting in model.query.filter_by(is_active=True)}
+
+def test_sweep_expires_only_past_active_postings(make_hr, make_job, announced):
+    expiring = seed_postings(make_hr(), make_job)
+    before = {model: active_ids(model) for model in (Job, Internship, BusinessJob)}
+
+    assert expire_postings(NOW) == {'jobs': 2, 'internships': 2, 'business_jobs': 2}
+    for model, table in ((Job, 'jobs'), (Internship, 'internships'), (BusinessJob, 'business_jobs')):
+        assert active_ids(model) == before[model] - set(expiring[table])
+
+    assert sorted(announced) == sorted((table, sorted(ids), 2) for table, ids in expiring.items())
+
+    # Nothing left to expire: no changes, no announcements
+    announced.clear()
+    assert expire_postings(NOW) == {'jobs': 0, 'internships': 0, 'business_jobs': 0}
+    assert announced == []
+
+def test_sweep_without_returning_reports_counts(monkeypatch, make_hr, make_job, announced):
+    seed_postings(make_hr(), make_job)
+    monkeypatch.setattr(db.engine.dialect, 'update_returning', False)
+
+    assert expire_postings(NOW) == {'jobs': 2, 'internships': 2, 'business_jobs': 2}
+    assert sorted(announced) == [('business_jobs', None, 2), ('internships', None, 2), ('jobs', None, 2)]
@@ -0,0 +1,58 @@
+"""
+Placement export streams: complete files, and cleanup when the client
+stops reading part way through
+"""
+
+import io
+import pytest
+from models import db, Application
+from utils import placement_export
+from utils.placement_export import stream_placement_export
+
+pq = pytest.importorskip('pyarrow.parquet')
+
+@pytest.fixture
+def applications(make_hr, make_student, make_job):
+    hr = make_hr()
+    jobs = [make_job(hr, skills=['Python']), make_job(hr)]
+    for i in range(25):
+        db.session.add(Application(student_id=make_student(skills=['SQL']).id, job_id=jobs[i % 2].id))
+    db.session.commit()
+    return hr
+
+def test_stream_is_a_complete_file(applications):
+    data = b''.join(stream_placement_export('parquet', chunk_size=10, hr_id=applications.id))
+    table = pq.read_table(io.BytesIO(data))
+    assert table.num_rows == 25
+    assert pq.ParquetFile(io.BytesIO(data)).num_row_groups == 3
+    assert table.column('student_skills').to_pylist()[0] == ['SQL']
+
+def test_abandoned_stream_closes_writer_and_cursor(monkeypatch, applications):
+    closed = []
+    open_writer, iter_batches = placement_export._open_writer, placement_export.iter_placement_batches
+
+    class TrackingWriter:
+        def __init__(self, sink, fmt):
+            self.writer = open_writer(sink, fmt)
+
+        def write_batch(self, batch):
+            self.writer.write_batch(batch)
+
+        def close(self):
+            closed.append('writer')
+            self.writer.close()
+
+    def tracking_batches(*args):
+        try:
+            yield from iter_batches(*args)
+        finally:
+            closed.append('batches')
+
+    monkeypatch.setattr(placement_export, '_open_writer', TrackingWriter)
+    monkeypatch.setattr(placement_export, 'iter_placement_batches', tracking_batches)
+
+    chunks = stream_placement_export('arrow', chunk_size=10, hr_id=applications.id)
+    next(chunks)
+    # What the server does when the client disconnects
+    chunks.close()
+    assert sorted(closed) == ['batches', 'writer']
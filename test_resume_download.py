@@ -0,0 +1,87 @@
+"""
+Resume downloads: content-hash ETags, conditional GETs and byte ranges,
+served directly or handed to nginx
+"""
+
+import hashlib
+import os
+import pytest
+from models import db, Resume
+
+CONTENT = b'%PDF-1.4\n' + bytes(range(256)) * 8
+
+@pytest.fixture
+def download(app, tmp_path, make_hr, make_student, auth_headers):
+    """(url, headers, resume) for one stored resume"""
+    app.config['RESUME_BLOB_DIR'] = str(tmp_path)
+    digest = hashlib.sha256(CONTENT).hexdigest()
+    path = tmp_path / digest[:2] / digest[2:4] / f'{digest}.pdf'
+    path.parent.mkdir(parents=True)
+    path.write_bytes(CONTENT)
+
+    student = make_student()
+    resume = Resume(student_id=student.id, filename='asha_cv.pdf', file_path=str(path), content_hash=digest)
+    db.session.add(resume)
+    db.session.commit()
+    return f'/api/resume/download/{student.id}', auth_headers(make_hr(), 'hr'), resume
+
+def test_full_download_carries_the_content_hash_etag(app, download):
+    url, headers, resume = download
+    response = app.test_client().get(url, headers=headers)
+    assert response.status_code == 200
+    assert response.get_data() == CONTENT
+    assert response.get_etag() == (resume.content_hash, False)
+    assert response.headers['Accept-Ranges'] == 'bytes'
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+    assert 'asha_cv.pdf' in response.headers['Content-Disposition']
+
+def test_if_none_match_answers_304(app, download):
+    url, headers, resume = download
+    client = app.test_client()
+    response = client.get(url, headers={**headers, 'If-None-Match': f'"{resume.content_hash}"'})
+    assert response.status_code == 304
+    assert response.get_data() == b''
+    stale = client.get(url, headers={**headers, 'If-None-Match': '"other"'})
+    assert stale.status_code == 200
+
+def test_range_requests(app, download):
+    url, headers, resume = download
+    client = app.test_client()
+
+    partial = client.get(url, headers={**headers, 'Range': 'bytes=100-199'})
+    assert partial.status_code == 206
+    assert partial.get_data() == CONTENT[100:200]
+    assert partial.headers['Content-Range'] == f'bytes 100-199/{len(CONTENT)}'
+
+    tail = client.get(url, headers={**headers, 'Range': 'bytes=-10'})
+    assert tail.get_data() == CONTENT[-10:]
+
+    # A resumed download whose copy is out of date gets the whole new file
+    changed = client.get(url, headers={**headers, 'Range': 'bytes=100-199', 'If-Range': '"other"'})
+    assert changed.status_code == 200
+    assert changed.get_data() == CONTENT
+
+    past_end = client.get(url, headers={**headers, 'Range': f'bytes={len(CONTENT) + 10}-'})
+    assert past_end.status_code == 416
+
+def test_x_accel_hands_the_blob_to_the_proxy(app, download):
+    url, headers, resume = download
+    app.config['RESUME_SENDFILE_MODE'] = 'x-accel'
+    client = app.test_client()
+
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert response.get_data() == b''
+    relative = os.path.relpath(resume.file_path, app.config['RESUME_BLOB_DIR']).replace(os.sep, '/')
+    assert response.headers['X-Accel-Redirect'] == '/protected/resumes/' + relative
+    assert response.get_etag() == (resume.content_hash, False)
+    assert response.mimetype == 'application/pdf'
+
+    cached = client.get(url, headers={**headers, 'If-None-Match': f'"{resume.content_hash}"'})
+    assert cached.status_code == 304
+    assert 'X-Accel-Redirect' not in cached.headers
+
+def test_students_cannot_download(app, download, auth_headers, make_student):
+    url, _, _ = download
+    response = app.test_client().get(url, headers=auth_headers(make_student(), 'student'))
+    assert response.status_code == 403
@@ -0,0 +1,77 @@
+"""
+Resume segmentation: which lines count as section headings, and what the
+extractors read from the sections
+"""
+
+import pytest
+from utils.resume_parser import _heading_section, segment_resume, extract_skills, parse_resume
+
+@pytest.mark.parametrize('line, section', [
+    ('Skills', 'skills'),
+    ('SKILLS', 'skills'),
+    ('Skills:', 'skills'),
+    ('Technical Skills', 'skills'),
+    ('TECHNICAL SKILLS', 'skills'),
+    ('Skills & Technologies', 'skills'),
+    ('Work Experience', 'experience'),
+    ('Work History:', 'experience'),
+    ('1. Education', 'education'),
+    ('Education Details:', 'education'),
+    ('Academic Qualifications', 'education'),
+    ('## Projects', 'projects'),
+    ('Academic Projects', 'projects'),
+    ('Awards and Achievements', 'achievements'),
+    ('Certifications -', 'achievements'),
+])
+def test_heading_lines(line, section):
+    assert _heading_section(line) == section
+
+@pytest.mark.parametrize('line', [
+    'Skills: Python, SQL',
+    'Projects in ML',
+    'Built ML projects',
+    'ML Projects',
+    'Experience with Docker and Kubernetes',
+    'Led the education outreach team.',
+    'Worked on several projects across the backend and frontend stacks',
+    'Summary',
+])
+def test_content_lines(line):
+    assert _heading_section(line) is None
+
+RESUME = """Asha Rao
+asha@example.com
+Interested in Java and data work
+EDUCATION
+B.Tech Computer Science 2021-2025
+Skills: Python, SQL
+Projects in ML
+Technical Skills
+Docker, React
+Projects:
+Chat app using Flask
+Work Experience
+Backend intern at Acme, built services with Django
+"""
+
+def test_segment_resume():
+    sections = segment_resume(RESUME)
+    assert sections['other'] == ['Asha Rao', 'asha@example.com', 'Interested in Java and data work']
+    # Content lines that mention a keyword stay in the current section
+    assert sections['education'] == ['B.Tech Computer Science 2021-2025', 'Skills: Python, SQL', 'Projects in ML']
+    assert sections['skills'] == ['Docker, React']
+    assert sections['projects'] == ['Chat app using Flask']
+    assert sections['experience'] == ['Backend intern at Acme, built services with Django']
+    assert sections['achievements'] == []
+
+def test_skills_come_from_skill_sections():
+    skills = set(extract_skills(RESUME))
+    assert {'Docker', 'React', 'Flask', 'Django'} <= skills
+    # Mentioned only in the header and the education section
+    assert not skills & {'Java', 'Python', 'Sql'}
+    assert parse_resume(RESUME)['skills'] == extract_skills(RESUME, segment_resume(RESUME))
+
+def test_skills_fall_back_to_full_text_without_skill_sections():
+    text = 'Asha Rao\nEducation\nB.Tech 2025\nPython, SQL and Docker\n'
+    assert {'Python', 'Docker'} <= set(extract_skills(text))
+    assert {'Python', 'Docker'} <= set(extract_skills('Python developer who also knows Docker'))
@@ -0,0 +1,87 @@
+"""
+Memoized resume scores are reused until the resume, the job's skills or the
+scoring model change, and then recomputed for the affected pairs only
+"""
+
+import json
+import pytest
+from models import db, Resume, ResumeScore, JobSkill
+from utils import resume_scoring
+from utils.resume_scoring import get_resume_score, get_resume_scores, GENERAL_SCORE_JOB_ID
+
+@pytest.fixture
+def scored(monkeypatch):
+    """(features, job skills) of every score computed rather than read from resume_scores"""
+    calls = []
+    score = resume_scoring.score_resume_features
+
+    def counting(features, job_skills=None):
+        calls.append((features, sorted(job_skills or [])))
+        return score(features, job_skills)
+
+    monkeypatch.setattr(resume_scoring, 'score_resume_features', counting)
+    # Resume ids repeat across tests on a fresh database
+    resume_scoring._features_cache.clear()
+    return calls
+
+@pytest.fixture
+def resume(make_student):
+    resume = Resume(
+        student_id=make_student().id, filename='cv.pdf', file_path='/nonexistent/cv.pdf',
+        skills=json.dumps(['Python', 'SQL']), education='B.Tech CSE 2025', experience='Intern at Acme'
+    )
+    resume.set_text('Education B.Tech CSE. Skills Python, SQL. Projects: a web app.')
+    db.session.add(resume)
+    db.session.commit()
+    return resume
+
+def test_scores_are_reused_until_something_changes(monkeypatch, make_hr, make_job, resume, scored):
+    job = make_job(make_hr(), skills=['Python', 'Docker'])
+
+    first = get_resume_score(resume, job)
+    assert len(scored) == 1
+    assert get_resume_score(resume, job) == first
+    assert len(scored) == 1
+    assert ResumeScore.query.filter_by(resume_id=resume.id, job_id=job.id).count() == 1
+
+    # Editing the job's skills invalidates its score
+    db.session.add(JobSkill(job_id=job.id, skill_name='SQL'))
+    db.session.commit()
+    db.session.refresh(job)
+    get_resume_score(resume, job)
+    assert len(scored) == 2
+    assert scored[-1][1] == ['Docker', 'Python', 'SQL']
+
+    # So does a new upload (version bump), which also refreshes the cached features
+    resume.skills = json.dumps(['Python', 'SQL', 'Docker'])
+    resume.set_text('Skills Python, SQL, Docker')
+    db.session.commit()
+    get_resume_score(resume, job)
+    assert len(scored) == 3
+    assert 'docker' in scored[-1][0].skill_set
+
+    # And a change to the scoring rules or taxonomy
+    next_version = resume_scoring.scoring_model_version() + '-next'
+    monkeypatch.setattr(resume_scoring, 'scoring_model_version', lambda: next_version)
+    get_resume_score(resume, job)
+    get_resume_score(resume, job)
+    assert len(scored) == 4
+
+    row = ResumeScore.query.filter_by(resume_id=resume.id, job_id=job.id).one()
+    assert row.resume_version == resume.version
+    assert row.model_version == next_version
+
+def test_batch_scoring_recomputes_only_misses(make_hr, make_job, resume, scored):
+    hr = make_hr()
+    jobs = [make_job(hr, skills=['Python']), make_job(hr, skills=['Java']), make_job(hr, skills=['SQL'])]
+
+    get_resume_scores(resume, jobs[:2])
+    assert len(scored) == 2
+
+    results = get_resume_scores(resume, [None, *jobs])
+    assert set(results) == {GENERAL_SCORE_JOB_ID, *(job.id for job in jobs)}
+    # Only the general score and the third job were missing
+    assert len(scored) == 4
+    assert results[jobs[0].id] == get_resume_score(resume, jobs[0])
+    assert len(scored) == 4
+    assert ResumeScore.query.filter_by(resume_id=resume.id).count() == 4
@@ -0,0 +1,46 @@
+"""
+upgrade_schema adds the columns and indexes a pre-upgrade database lacks,
+keeps its rows, and is a no-op the second time
+"""
+
+from models import db, Resume
+from sqlalchemy import inspect, text
+from utils.schema_upgrade import upgrade_schema
+
+# resumes as created before text storage, scoring and dedup columns existed
+OLD_RESUMES = """
+CREATE TABLE resumes (
+    id INTEGER PRIMARY KEY,
+    student_id INTEGER NOT NULL REFERENCES students (id),
+    filename VARCHAR(255) NOT NULL,
+    file_path VARCHAR(500) NOT NULL,
+    score INTEGER,
+    skills TEXT,
+    education TEXT,
+    experience TEXT,
+    uploaded_at DATETIME,
+    is_duplicate BOOLEAN,
+    duplicate_of INTEGER
+)
+"""
+
+def test_upgrade_adds_missing_columns_and_keeps_rows(make_student):
+    student = make_student()
+    with db.engine.begin() as connection:
+        connection.execute(text('DROP TABLE resumes'))
+        connection.execute(text(OLD_RESUMES))
+        connection.execute(text("DROP INDEX IF EXISTS ix_jobs_hr_id"))
+        connection.execute(text(
+            "INSERT INTO resumes (student_id, filename, file_path, score) VALUES (:student, 'cv.pdf', '/cv.pdf', 70)"
+        ), {'student': student.id})
+
+    added = upgrade_schema()
+    assert {'resumes.text_compressed', 'resumes.version', 'resumes.content_hash',
+            'resumes.score_model', 'resumes.fingerprint', 'resumes.dedup_version', 'ix_jobs_hr_id'} <= set(added)
+    assert 'ix_resumes_content_hash' in {index['name'] for index in inspect(db.engine).get_indexes('resumes')}
+
+    db.session.expire_all()
+    resume = Resume.query.one()
+    assert (resume.score, resume.version, resume.get_text()) == (70, 1, '')
+
+    assert upgrade_schema() == []
@@ -0,0 +1,155 @@
+"""
+application_status_counts must always equal a live COUNT of the application tables
+"""
+
+from models import db, Application, Internship, InternshipApplication, ApplicationStatusCount
+from utils.analytics import get_status_counts, rebuild_status_counts, seed_status_counts, get_hr_analytics, get_admin_analytics
+from sqlalchemy import func
+
+def live_counts(owner, model):
+    counts = {}
+    rows = db.session.query(owner, func.coalesce(model.status, 'Applied'), func.count(model.id)).group_by(owner, model.status)
+    for owner_id, status, count in rows:
+        counts.setdefault(owner_id, {})[status] = counts.get(owner_id, {}).get(status, 0) + count
+    return counts
+
+def stored_counts(scope):
+    # Counters that dropped to zero stay as rows; a COUNT has no such groups
+    return {
+        owner_id: {status: count for status, count in statuses.items() if count}
+        for owner_id, statuses in get_status_counts(scope).items()
+        if any(statuses.values())
+    }
+
+def assert_counters_match():
+    assert stored_counts('job') == live_counts(Application.job_id, Application)
+    assert stored_counts('student') == live_counts(Application.student_id, Application)
+    assert stored_counts('internship') == live_counts(InternshipApplication.internship_id, InternshipApplication)
+    assert stored_counts('intern_student') == live_counts(InternshipApplication.student_id, InternshipApplication)
+
+def test_counters_follow_inserts_status_changes_and_deletes(make_hr, make_student, make_job):
+    hr = make_hr()
+    jobs = [make_job(hr), make_job(hr)]
+    students = [make_student() for _ in range(6)]
+    applications = [Application(student_id=s.id, job_id=j.id) for s in students for j in jobs]
+    applications.append(Application(student_id=make_student().id, job_id=jobs[0].id, status='Shortlisted'))
+    db.session.add_all(applications)
+    db.session.commit()
+    assert_counters_match()
+
+    for application, status in zip(applications, ['Shortlisted', 'Interview', 'Selected', 'Rejected', 'Shortlisted']):
+        application.status = status
+    db.session.commit()
+    assert_counters_match()
+
+    # Changed back and forth within one flush: no net change
+    applications[5].status = 'Rejected'
+    applications[5].status = 'Applied'
+    db.session.delete(applications[6])
+    db.session.commit()
+    assert_counters_match()
+
+    # Expired instances must still report the status they had
+    db.session.expire_all()
+    applications[0].status = 'Selected'
+    db.session.commit()
+    assert_counters_match()
+
+    # Cascaded deletes through Job.applications
+    db.session.delete(jobs[1])
+    db.session.commit()
+    assert_counters_match()
+
+def test_counters_roll_back_with_the_change(make_hr, make_student, make_job):
+    hr = make_hr()
+    job = make_job(hr)
+    application = Application(student_id=make_student().id, job_id=job.id)
+    db.session.add(application)
+    db.session.commit()
+
+    application.status = 'Selected'
+    db.session.add(Application(student_id=make_student().id, job_id=job.id))
+    db.session.flush()
+    db.session.rollback()
+    assert_counters_match()
+    assert get_hr_analytics(hr.id)['total_applicants'] == 1
+
+def test_internship_counters(make_hr, make_student):
+    hr = make_hr()
+    internship = Internship(hr_id=hr.id, title='Intern', company='Co', description='d', branch='CSE')
+    db.session.add(internship)
+    db.session.commit()
+    applications = [InternshipApplication(student_id=make_student().id, internship_id=internship.id) for _ in range(3)]
+    db.session.add_all(applications)
+    db.session.commit()
+    applications[0].status = 'Selected'
+    db.session.delete(applications[1])
+    db.session.commit()
+    assert_counters_match()
+
+def test_rebuild_matches_incremental_counters(make_hr, make_student, make_job):
+    hr = make_hr()
+    job = make_job(hr)
+    applications = [Application(student_id=make_student().id, job_id=job.id) for _ in range(4)]
+    db.session.add_all(applications)
+    db.session.commit()
+    applications[0].status = 'Interview'
+    db.session.commit()
+
+    incremental = stored_counts('job')
+    ApplicationStatusCount.query.delete()
+    db.session.commit()
+    rebuild_status_counts()
+    assert stored_counts('job') == incremental
+    assert_counters_match()
+
+def test_first_counter_created_elsewhere_is_incremented(make_hr, make_student, make_job):
+    hr = make_hr()
+    job = make_job(hr)
+    student = make_student()
+    # Another transaction created the job's first 'Applied' counter after this one started
+    with db.engine.begin() as connection:
+        connection.execute(ApplicationStatusCount.__table__.insert().values(scope='job', owner_id=job.id, status='Applied', count=1))
+
+    db.session.add(Application(student_id=student.id, job_id=job.id))
+    db.session.commit()
+    assert get_status_counts('job')[job.id] == {'Applied': 2}
+
+def test_unseeded_counters_fall_back_to_live_counts(make_hr, make_student, make_job):
+    hr = make_hr()
+    job = make_job(hr)
+    applications = [Application(student_id=make_student().id, job_id=job.id) for _ in range(3)]
+    db.session.add_all(applications)
+    db.session.commit()
+    applications[0].status = 'Selected'
+    db.session.commit()
+
+    # A database upgraded from before the rollup: applications but no counters
+    ApplicationStatusCount.query.delete()
+    db.session.commit()
+    assert stored_counts('job') == live_counts(Application.job_id, Application)
+    analytics = get_hr_analytics(hr.id)
+    assert (analytics['total_applicants'], analytics['selected']) == (3, 1)
+    assert get_admin_analytics()['total_applications'] == 3
+
+    assert seed_status_counts() > 0
+    assert seed_status_counts() == 0
+    assert ApplicationStatusCount.query.filter_by(scope='job', owner_id=job.id, status='Applied').one().count == 2
+    assert_counters_match()
+
+def test_hr_analytics_same_from_rollup_and_grouped_query(make_hr, make_student, make_job):
+    hr = make_hr()
+    jobs = [make_job(hr), make_job(hr, is_active=False), make_job(hr)]
+    applications = [Application(student_id=make_student().id, job_id=job.id) for job in jobs[:2] for _ in range(4)]
+    db.session.add_all(applications)
+    db.session.commit()
+    for application, status in zip(applications, ['Shortlisted', 'Shortlisted', 'Interview', 'Rejected', 'Selected']):
+        application.status = status
+    db.session.commit()
+
+    from_rollup = get_hr_analytics(hr.id)
+    ApplicationStatusCount.query.delete()
+    db.session.commit()
+    assert get_hr_analytics(hr.id) == from_rollup
+    assert from_rollup['applicants_per_job'][2] == {'job_title': 'Engineer', 'applicants': 0, 'shortlisted': 0}
+    assert (from_rollup['total_jobs'], from_rollup['active_jobs'], from_rollup['shortlisted']) == (3, 2, 2)
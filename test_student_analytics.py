@@ -0,0 +1,32 @@
+"""
+get_student_analytics returns a plain, JSON-serialisable dict
+"""
+
+import json
+from models import db, Application, Resume
+from utils.analytics import get_student_analytics, RECOMMENDED_LIMIT
+
+def test_student_analytics_is_a_filled_dict(make_hr, make_student, make_job):
+    hr = make_hr()
+    jobs = [make_job(hr) for _ in range(RECOMMENDED_LIMIT + 3)]
+    student = make_student(skills=['Python'])
+    db.session.add(Resume(student_id=student.id, filename='cv.pdf', file_path='/cv.pdf', score=72))
+    db.session.add_all([
+        Application(student_id=student.id, job_id=jobs[0].id, status='Shortlisted'),
+        Application(student_id=student.id, job_id=jobs[1].id)
+    ])
+    db.session.commit()
+
+    analytics = get_student_analytics(student.id)
+    db.session.remove()
+
+    # Usable after the session is gone, and by jsonify/json.dumps
+    assert type(analytics) is dict
+    assert json.loads(json.dumps(analytics)) == analytics
+    assert analytics['profile']['email'] == student.email
+    assert (analytics['resume_score'], analytics['total_applications']) == (72, 2)
+    assert (analytics['applied'], analytics['shortlisted'], analytics['selected']) == (1, 1, 0)
+    assert analytics['recommended_jobs_count'] == RECOMMENDED_LIMIT
+
+def test_missing_student(app):
+    assert get_student_analytics(12345) is None
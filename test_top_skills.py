@@ -0,0 +1,49 @@
+"""
+get_top_applicant_skills (one JOIN/GROUP BY) must agree with the original
+Counter over the applicants' StudentSkill rows
+"""
+
+import random
+from collections import Counter
+from models import db, Job, Application, StudentSkill
+from utils.analytics import get_top_applicant_skills
+
+SKILLS = ['Python', 'python', 'SQL', 'Java', 'React', 'Docker', 'AWS', 'Go', 'Rust', 'C++',
+          'Kubernetes', 'Pandas', 'Django', 'Flask', 'Linux', 'Git']
+
+def counter_reference(hr_id):
+    """The implementation the query replaced, ties ordered by skill name"""
+    job_ids = [job.id for job in Job.query.filter_by(hr_id=hr_id)]
+    if not job_ids:
+        return []
+    student_ids = [application.student_id for application in Application.query.filter(Application.job_id.in_(job_ids))]
+    skills = StudentSkill.query.filter(StudentSkill.student_id.in_(student_ids)).all() if student_ids else []
+    skill_counts = Counter([s.skill_name.lower() for s in skills])
+    return [{'skill': name.title(), 'count': count} for name, count in sorted(skill_counts.items(), key=lambda item: (-item[1], item[0]))]
+
+def test_matches_counter_reference(make_hr, make_student, make_job):
+    rng = random.Random(50)
+    hrs = [make_hr(), make_hr()]
+    jobs = {hr.id: [make_job(hr) for _ in range(3)] for hr in hrs}
+    for _ in range(60):
+        # One spelling of each skill per student: the reference counts rows, the query students
+        skills = {skill.lower(): skill for skill in rng.sample(SKILLS, rng.randint(0, 6))}
+        student = make_student(skills=skills.values())
+        for hr in hrs:
+            # Applying to several of one HR's jobs still counts the applicant once
+            for job in rng.sample(jobs[hr.id], rng.randint(0, 3)):
+                db.session.add(Application(student_id=student.id, job_id=job.id))
+    db.session.commit()
+
+    for hr in hrs:
+        reference = counter_reference(hr.id)
+        assert reference
+        assert get_top_applicant_skills(hr.id, limit=len(SKILLS)) == reference
+        assert get_top_applicant_skills(hr.id) == reference[:10]
+
+def test_hr_without_applicants(make_hr, make_student, make_job):
+    hr = make_hr()
+    make_job(hr)
+    make_student(skills=['Python'])
+    assert get_top_applicant_skills(hr.id) == []
+    assert get_top_applicant_skills(make_hr().id) == []
@@ -0,0 +1,78 @@
+"""
+Streaming resume uploads: content sniffing, blob storage, and early
+rejection of junk or oversize bodies
+"""
+
+import hashlib
+import io
+import os
+import pytest
+from werkzeug.test import EnvironBuilder
+from utils.upload_stream import receive_resume_upload, sniff_resume_type, UploadRejected
+
+ALLOWED = {'pdf', 'docx', 'doc'}
+
+PDF = b'%PDF-1.4\n' + b'0' * 20000
+
+@pytest.fixture
+def blob_dir(app, tmp_path):
+    app.config['RESUME_BLOB_DIR'] = str(tmp_path)
+    return tmp_path
+
+def upload(app, content, filename='cv.pdf', max_bytes=10 * 1024 * 1024, **fields):
+    """Run receive_resume_upload on a multipart body; returns (result or error, body stream)"""
+    data = {'file': (io.BytesIO(content), filename), **fields}
+    environ = EnvironBuilder(method='POST', data=data).get_environ()
+    body = io.BytesIO(environ['wsgi.input'].read())
+    environ['wsgi.input'] = body
+    with app.request_context(environ):
+        from flask import request
+        try:
+            return receive_resume_upload(request, ALLOWED, max_bytes), body
+        except UploadRejected as e:
+            return e, body
+
+def staged_files(blob_dir):
+    tmp = blob_dir / 'tmp'
+    return os.listdir(tmp) if tmp.exists() else []
+
+def test_sniff_resume_type():
+    assert sniff_resume_type(b'\n\n%PDF-1.7 ...') == 'pdf'
+    assert sniff_resume_type(b'PK\x03\x04....[Content_Types].xml') == 'docx'
+    assert sniff_resume_type(b'PK\x03\x04 plain zip') is None
+    assert sniff_resume_type(b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1rest') == 'doc'
+    assert sniff_resume_type(b'MZ\x90\x00') is None
+
+def test_upload_is_stored_by_content_hash(blob_dir, app):
+    result, _ = upload(app, PDF, job_requirements='["Python"]')
+    digest = hashlib.sha256(PDF).hexdigest()
+    assert result['ext'] == 'pdf'
+    assert result['filename'] == 'cv.pdf'
+    assert result['content_hash'] == digest
+    assert result['fields'] == {'job_requirements': '["Python"]'}
+    assert result['file_path'] == str(blob_dir / digest[:2] / digest[2:4] / f'{digest}.pdf')
+    with open(result['file_path'], 'rb') as f:
+        assert f.read() == PDF
+    assert staged_files(blob_dir) == []
+
+def test_extension_follows_the_content(blob_dir, app):
+    result, _ = upload(app, PDF, filename='cv.docx')
+    assert result['ext'] == 'pdf'
+    assert result['file_path'].endswith('.pdf')
+
+def test_junk_is_rejected_after_the_sniff_window(blob_dir, app):
+    junk = b'MZ' + b'\x00' * (2 * 1024 * 1024)
+    error, body = upload(app, junk)
+    assert isinstance(error, UploadRejected) and error.status == 400
+    # Rejected within the first read chunks, not after buffering the body
+    assert body.tell() < 256 * 1024
+    assert staged_files(blob_dir) == []
+
+def test_wrong_extension_is_rejected(blob_dir, app):
+    error, _ = upload(app, PDF, filename='cv.exe')
+    assert isinstance(error, UploadRejected) and error.status == 400
+
+def test_oversize_upload_is_rejected_and_discarded(blob_dir, app):
+    error, body = upload(app, PDF + b'0' * 200000, max_bytes=100000)
+    assert isinstance(error, UploadRejected) and error.status == 413
+    assert staged_files(blob_dir) == []
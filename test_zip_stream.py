@@ -0,0 +1,74 @@
+"""
+Streamed resume archives: valid ZIPs built chunk by chunk, and the
+per-job download built from them
+"""
+
+import io
+import os
+import zipfile
+import pytest
+from models import db, Application, Resume
+from utils.zip_stream import stream_zip, CHUNK_SIZE
+
+def write(path, data):
+    path.write_bytes(data)
+    return str(path)
+
+def test_stream_is_a_valid_stored_archive(tmp_path):
+    big = os.urandom(3 * CHUNK_SIZE + 17)
+    entries = [('a.pdf', write(tmp_path / 'a', big)), ('b.docx', write(tmp_path / 'b', b'small'))]
+    chunks = list(stream_zip(entries))
+    assert len(chunks) > 3
+
+    archive = zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+    assert archive.testzip() is None
+    assert archive.namelist() == ['a.pdf', 'b.docx']
+    assert archive.read('a.pdf') == big
+    assert archive.read('b.docx') == b'small'
+    assert {info.compress_type for info in archive.infolist()} == {zipfile.ZIP_STORED}
+
+def test_stream_starts_before_later_files_are_opened(tmp_path):
+    entries = [('a.pdf', write(tmp_path / 'a', os.urandom(2 * CHUNK_SIZE))), ('b.pdf', str(tmp_path / 'missing'))]
+    chunks = stream_zip(entries)
+    assert next(chunks).startswith(b'PK\x03\x04')
+    with pytest.raises(FileNotFoundError):
+        list(chunks)
+
+@pytest.fixture
+def job_with_resumes(tmp_path, make_hr, make_student, make_job):
+    hr = make_hr()
+    job = make_job(hr, title='Data Engineer')
+    applicants = [
+        ('Asha', 91.6, 'Shortlisted', b'%PDF-asha'),
+        ('Ravi', 45, 'Applied', b'%PDF-ravi'),
+        ('Gone', 80, 'Applied', None)
+    ]
+    for name, match, status, content in applicants:
+        student = make_student(name=name)
+        path = write(tmp_path / f'{name}.pdf', content) if content else str(tmp_path / 'missing.pdf')
+        db.session.add(Resume(student_id=student.id, filename=f'{name}.pdf', file_path=path))
+        db.session.add(Application(student_id=student.id, job_id=job.id, match_percentage=match, status=status))
+    db.session.commit()
+    return hr, job
+
+def test_job_download_orders_by_match_and_skips_missing_files(app, auth_headers, job_with_resumes):
+    hr, job = job_with_resumes
+    response = app.test_client().get(f'/api/hr/jobs/{job.id}/resumes.zip', headers=auth_headers(hr, 'hr'))
+    assert response.status_code == 200
+    assert response.mimetype == 'application/zip'
+    assert 'Data_Engineer_resumes.zip' in response.headers['Content-Disposition']
+
+    archive = zipfile.ZipFile(io.BytesIO(response.get_data()))
+    names = archive.namelist()
+    assert [name.split('_')[:2] for name in names] == [['092pct', 'Asha'], ['045pct', 'Ravi']]
+    assert archive.read(names[0]) == b'%PDF-asha'
+
+def test_job_download_status_filter_and_ownership(app, auth_headers, make_hr, job_with_resumes):
+    hr, job = job_with_resumes
+    client = app.test_client()
+    url = f'/api/hr/jobs/{job.id}/resumes.zip'
+
+    response = client.get(url, query_string={'status': 'Shortlisted'}, headers=auth_headers(hr, 'hr'))
+    assert len(zipfile.ZipFile(io.BytesIO(response.get_data())).namelist()) == 1
+    assert client.get(url, query_string={'status': 'Selected'}, headers=auth_headers(hr, 'hr')).status_code == 404
+    assert client.get(url, headers=auth_headers(make_hr(), 'hr')).status_code == 403
@@ -0,0 +1,135 @@
+"""
+Streaming Uploads - parse multipart resume uploads straight to the blob store
+The body is read in chunks, hashed and sniffed as it arrives, so junk or
+oversize files are rejected after a few KB instead of after a full buffer
+Team Arena: Skill-Link Platform
+"""
+
+from utils.blob_store import BlobWriter
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.sansio.multipart import MultipartDecoder, Field, File, Data, Epilogue, NEED_DATA
+
+CHUNK_SIZE = 64 * 1024
+
+# Bytes of a file seen before its type is decided
+SNIFF_BYTES = 8 * 1024
+
+# Largest plain form field kept in memory (job_requirements etc.)
+MAX_FIELD_BYTES = 64 * 1024
+
+OLE2_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+
+class UploadRejected(Exception):
+    """Upload refused before parsing; carries the HTTP status to answer with"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+def sniff_resume_type(head):
+    """
+    Resume type from the first bytes of a file, not its name
+    Returns: 'pdf', 'docx', 'doc' or None
+    """
+    # Readers accept a PDF header anywhere in the first KB
+    if b'%PDF-' in head[:1024]:
+        return 'pdf'
+    if head.startswith(b'PK\x03\x04') and (b'[Content_Types].xml' in head or b'word/' in head):
+        return 'docx'
+    if head.startswith(OLE2_MAGIC):
+        return 'doc'
+    return None
+
+def _boundary(request):
+    if request.mimetype != 'multipart/form-data':
+        raise UploadRejected('Expected a multipart/form-data upload')
+    boundary = request.mimetype_params.get('boundary')
+    if not boundary:
+        raise UploadRejected('Missing multipart boundary')
+    return boundary.encode('latin-1')
+
+def receive_resume_upload(request, allowed_extensions, max_bytes, file_field='file'):
+    """
+    Read a multipart resume upload from request.stream
+    Must be called before anything touches request.form or request.files
+    Returns: dict with fields, filename, ext (sniffed), content_hash, file_path
+    Raises: UploadRejected (400 bad type, 413 too large)
+    """
+    if request.content_length and request.content_length > max_bytes + MAX_FIELD_BYTES:
+        raise UploadRejected('File too large', 413)
+
+    decoder = MultipartDecoder(_boundary(request), max_form_memory_size=MAX_FIELD_BYTES)
+    fields = {}
+    field_name = field_data = None
+    filename = ext = None
+    writer = None
+    received = 0
+    head = b''
+    stored = None
+
+    try:
+        while True:
+            chunk = request.stream.read(CHUNK_SIZE)
+            decoder.receive_data(chunk or None)
+
+            event = decoder.next_event()
+            while event is not NEED_DATA and not isinstance(event, Epilogue):
+                if isinstance(event, File) and event.name == file_field and writer is None and stored is None:
+                    filename = event.filename or ''
+                    if not filename:
+                        raise UploadRejected('No file selected')
+                    if '.' not in filename or filename.rsplit('.', 1)[1].lower() not in allowed_extensions:
+                        raise UploadRejected('Invalid file type. Allowed: PDF, DOCX, DOC')
+                    writer = BlobWriter()
+                    field_name = None
+                elif isinstance(event, (File, Field)):
+                    # Other parts: keep plain fields, skip extra files
+                    field_name = event.name if isinstance(event, Field) else None
+                    field_data = bytearray()
+                elif isinstance(event, Data) and writer is not None:
+                    received += len(event.data)
+                    if received > max_bytes:
+                        raise UploadRejected('File too large', 413)
+                    if ext is None:
+                        # Hold the first bytes until the type is known
+                        head += event.data
+                        if len(head) >= SNIFF_BYTES or not event.more_data:
+                            ext = sniff_resume_type(head)
+                            if ext not in allowed_extensions:
+                                raise UploadRejected('File content is not a PDF or Word document')
+                            writer.write(head)
+                    else:
+                        writer.write(event.data)
+                    if not event.more_data:
+                        stored = writer.commit(ext)
+                        writer = None
+                elif isinstance(event, Data) and field_name is not None:
+                    field_data += event.data
+                    if not event.more_data:
+                        fields[field_name] = field_data.decode('utf-8', 'replace')
+                        field_name = None
+                event = decoder.next_event()
+
+            if isinstance(event, Epilogue) or not chunk:
+                break
+    except RequestEntityTooLarge:
+        raise UploadRejected('File too large', 413)
+    except ValueError:
+        raise UploadRejected('Malformed upload')
+    finally:
+        # Anything still open here was rejected or cut short
+        if writer is not None:
+            writer.discard()
+
+    if stored is None:
+        raise UploadRejected('No file provided')
+
+    content_hash, file_path = stored
+    return {
+        'fields': fields,
+        'filename': filename,
+        'ext': ext,
+        'content_hash': content_hash,
+        'file_path': file_path
+    }